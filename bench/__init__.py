@@ -0,0 +1 @@
+"""Scale tests: a synthetic corpus generator and watcher benchmarks."""
@@ -0,0 +1,477 @@
+"""Generate a synthetic corpus of Claude, Codex and OpenCode data.
+
+The corpus is a fake home directory laid out the way each CLI writes
+it, plus a ``workload`` directory of records that bench.throughput
+appends while a watcher is attached::
+
+    OUT/
+      manifest.json
+      home/.claude/projects/-bench-project/<session>.jsonl
+      home/.claude/projects/-bench-project/<session>/subagents/*.jsonl
+      home/.codex/sessions/YYYY/MM/DD/rollout-*.jsonl
+      home/.local/share/opencode/opencode.db
+      workload/claude.jsonl  workload/codex.jsonl  workload/opencode.jsonl
+
+Records follow the real formats closely enough to exercise every path
+of the watchers' parsers: compact JSON, large tool_result payloads
+(including escaped ``"tool_use"`` text that the prefilter must not
+match), noise records, Task spawns linked to subagent transcripts, and
+OpenCode parts of every type.  Output is deterministic for a given
+``--seed``; files are streamed, so multi-GB corpora need no more memory
+than a small one.
+
+Usage::
+
+    python -m bench.corpus OUT [--scale small|large] [--claude-mb N] ...
+"""
+import argparse
+import json
+import math
+import os
+import random
+import sqlite3
+import time
+from datetime import datetime, timedelta, timezone
+
+PROJECT_PATH = "/bench/project"
+PROJECT_DIR = PROJECT_PATH.replace("/", "-")
+
+SCALES = {
+    "small": {"claude_mb": 32, "subagents": 500, "codex_mb": 16,
+              "codex_days": 30, "parts": 100_000, "workload_mb": 16,
+              "workload_parts": 20_000},
+    "large": {"claude_mb": 4096, "subagents": 5000, "codex_mb": 1024,
+              "codex_days": 365, "parts": 5_000_000, "workload_mb": 256,
+              "workload_parts": 500_000},
+}
+
+CLAUDE_TOOLS = ["Read", "Edit", "Bash", "Grep", "Glob", "Write", "WebFetch",
+                "TodoWrite"]
+CODEX_TOOLS = ["shell", "exec_command", "read_file", "write_file",
+               "update_plan", "apply_patch"]
+OPENCODE_TOOLS = ["read", "edit", "write", "bash", "glob", "grep", "list",
+                  "webfetch", "todowrite"]
+SUB_TYPES = ["Explore", "general-purpose", "Plan", "Bash"]
+
+_EPOCH = datetime(2026, 1, 1, tzinfo=timezone.utc)
+_WORDS = ("def class return import self value path line index record event "
+          "watcher session agent tool result payload offset buffer").split()
+
+
+def _dumps(obj):
+    # The CLIs write compact JSON; the prefilters depend on it
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+
+def _payloads(rng, count, max_bytes, min_bytes=200):
+    """Tool output strings with log-uniform sizes: source-like text with
+    quotes, backslashes, newlines and the odd embedded record marker."""
+    chunk = []
+    for i in range(4096):
+        words = " ".join(rng.choice(_WORDS) for _ in range(rng.randint(2, 9)))
+        if i % 97 == 0:
+            chunk.append('    {"type":"tool_use","name":"Read"}  # quoted\n')
+        elif i % 13 == 0:
+            chunk.append(f'    msg = "{words}\\n"\n')
+        else:
+            chunk.append(f"    {words}\n")
+    text = "".join(chunk)
+    while len(text) < max_bytes:
+        text += text
+    lo, hi = math.log(min_bytes), math.log(max_bytes)
+    out = []
+    for _ in range(count):
+        size = int(math.exp(rng.uniform(lo, hi)))
+        start = rng.randrange(0, len(text) - size + 1)
+        out.append(text[start:start + size])
+    return out
+
+
+class _Clock:
+    """Monotonic fake timestamps, a few seconds apart."""
+
+    def __init__(self, rng, start=_EPOCH):
+        self.rng = rng
+        self.now = start
+
+    def tick(self, lo=0.2, hi=8.0):
+        self.now += timedelta(seconds=self.rng.uniform(lo, hi))
+        return self.now.isoformat().replace("+00:00", "Z")
+
+
+# -- Claude ----------------------------------------------------------------
+
+class _ClaudeSession:
+    """Streams turns of a Claude Code transcript."""
+
+    def __init__(self, rng, payloads, session_id, clock):
+        self.rng = rng
+        self.payloads = payloads
+        self.session_id = session_id
+        self.clock = clock
+        self.uses = 0
+        self.parent = None
+
+    def _record(self, rec_type, extra):
+        uuid = f"{self.rng.getrandbits(64):016x}"
+        record = {"parentUuid": self.parent, "isSidechain": False,
+                  "cwd": PROJECT_PATH, "sessionId": self.session_id,
+                  "type": rec_type, "uuid": uuid,
+                  "timestamp": self.clock.tick()}
+        record.update(extra)
+        self.parent = uuid
+        return _dumps(record) + "\n"
+
+    def _assistant(self, content):
+        return self._record("assistant", {"message": {
+            "role": "assistant", "model": "claude-bench",
+            "content": content}})
+
+    def _tool_result(self, tool_use_id):
+        return self._record("user", {"message": {"role": "user", "content": [
+            {"type": "tool_result", "tool_use_id": tool_use_id,
+             "content": self.rng.choice(self.payloads)}]}})
+
+    def turn(self, task_ids=()):
+        """Lines of one turn; each id in ``task_ids`` becomes a Task call
+        (its tool_result comes after the other tools of the turn)."""
+        rng = self.rng
+        lines = [self._record("user", {"message": {
+            "role": "user", "content": " ".join(
+                rng.choice(_WORDS) for _ in range(rng.randint(5, 40)))}})]
+        lines.append(self._assistant([{"type": "thinking",
+                                       "thinking": "...", "signature": "x"}]))
+        for task_id in task_ids:
+            sub_type = rng.choice(SUB_TYPES)
+            lines.append(self._assistant([{
+                "type": "tool_use", "id": task_id, "name": "Task",
+                "input": {"subagent_type": sub_type,
+                          "description": f"{sub_type.lower()} {task_id[-4:]}",
+                          "prompt": f"Investigate part {task_id}"}}]))
+        for _ in range(rng.randint(1, 12)):
+            self.uses += 1
+            tool_id = f"toolu_{self.session_id[:8]}_{self.uses:08d}"
+            tool = rng.choice(CLAUDE_TOOLS)
+            lines.append(self._assistant([
+                {"type": "text", "text": "Let me check that."},
+                {"type": "tool_use", "id": tool_id, "name": tool,
+                 "input": {"file_path": f"{PROJECT_PATH}/src/m{self.uses}.py"}},
+            ]))
+            if rng.random() < 0.3:
+                lines.append(self._record("progress", {"data": {
+                    "type": "hook_progress", "hookEvent": "PostToolUse"}}))
+            lines.append(self._tool_result(tool_id))
+        for task_id in task_ids:
+            lines.append(self._tool_result(task_id))
+        lines.append(self._assistant([{"type": "text",
+                                       "text": "Done with this step."}]))
+        lines.append(self._record("system", {
+            "subtype": "turn_duration",
+            "durationMs": rng.randint(1000, 600000)}))
+        return lines
+
+
+def _write_until(path, target_bytes, make_lines, mode="w"):
+    """Write batches from ``make_lines()`` until ``path`` holds at least
+    ``target_bytes``; returns the bytes written."""
+    written = 0
+    with open(path, mode, encoding="utf-8") as f:
+        while written < target_bytes:
+            for line in make_lines():
+                f.write(line)
+                written += len(line.encode("utf-8"))
+    return written
+
+
+def gen_claude(out, rng, payloads, claude_mb, subagents, workload_mb):
+    projects = os.path.join(out, "home", ".claude", "projects", PROJECT_DIR)
+    os.makedirs(projects, exist_ok=True)
+    session_id = f"{rng.getrandbits(128):032x}"
+    session_id = "-".join((session_id[:8], session_id[8:12],
+                           session_id[12:16], session_id[16:20],
+                           session_id[20:]))
+    # A few older sessions, so discovery has something to skip
+    for i in range(3):
+        old_id = f"{i:08d}-0000-4000-8000-000000000000"
+        old = _ClaudeSession(rng, payloads, old_id, _Clock(rng))
+        _write_until(os.path.join(projects, f"{old_id}.jsonl"), 256 * 1024,
+                     old.turn)
+
+    # Subagent transcripts: the first ``linked`` belong to Task calls in
+    # the workload, the rest to Tasks that finished before it
+    sub_dir = os.path.join(projects, session_id, "subagents")
+    os.makedirs(sub_dir, exist_ok=True)
+    linked = min(subagents, max(1, int(workload_mb * 4)))
+    task_ids = [f"toolu_task_{i:06d}" for i in range(subagents)]
+    small = sorted(payloads, key=len)[:32]
+    for i, task_id in enumerate(task_ids):
+        sub = _ClaudeSession(rng, small, session_id, _Clock(rng))
+        first = _dumps({"parentUuid": None, "isSidechain": True,
+                        "parentToolUseID": task_id, "sessionId": session_id,
+                        "type": "user", "uuid": f"sub{i}",
+                        "timestamp": sub.clock.tick(),
+                        "message": {"role": "user",
+                                    "content": f"Investigate part {task_id}"}})
+        with open(os.path.join(sub_dir, f"agent-{i:06d}.jsonl"), "w",
+                  encoding="utf-8") as f:
+            f.write(first + "\n")
+            f.writelines(sub.turn()[2:-1])
+
+    main = _ClaudeSession(rng, payloads, session_id, _Clock(rng))
+    session_path = os.path.join(projects, f"{session_id}.jsonl")
+    size = _write_until(session_path, claude_mb * 1024 * 1024, main.turn)
+
+    workload = os.path.join(out, "workload", "claude.jsonl")
+    pending = list(task_ids[:linked])
+
+    def workload_turn():
+        take = [pending.pop() for _ in range(min(len(pending),
+                                                 rng.randint(0, 2)))]
+        return main.turn(take)
+
+    _write_until(workload, workload_mb * 1024 * 1024, workload_turn)
+    return {"project": PROJECT_PATH, "session": session_path, "size": size,
+            "subagents": subagents, "linked_subagents": linked - len(pending),
+            "workload": workload}
+
+
+# -- Codex -----------------------------------------------------------------
+
+class _CodexRollout:
+    def __init__(self, rng, payloads, clock):
+        self.rng = rng
+        self.payloads = payloads
+        self.clock = clock
+        self.calls = 0
+
+    def _record(self, rec_type, payload):
+        return _dumps({"timestamp": self.clock.tick(), "type": rec_type,
+                       "payload": payload}) + "\n"
+
+    def turn(self):
+        rng = self.rng
+        lines = [self._record("response_item", {
+            "type": "message", "role": "user",
+            "content": [{"type": "input_text", "text": "fix the tests"}]})]
+        for _ in range(rng.randint(1, 10)):
+            self.calls += 1
+            call_id = f"call_{self.calls:08d}"
+            lines.append(self._record("response_item", {
+                "type": "reasoning", "summary": [],
+                "encrypted_content": "x" * rng.randint(100, 2000)}))
+            lines.append(self._record("response_item", {
+                "type": "function_call", "name": rng.choice(CODEX_TOOLS),
+                "arguments": _dumps({"command": ["bash", "-lc", "ls"]}),
+                "call_id": call_id}))
+            lines.append(self._record("response_item", {
+                "type": "function_call_output", "call_id": call_id,
+                "output": rng.choice(self.payloads)}))
+            lines.append(self._record("event_msg", {
+                "type": "token_count", "info": {"total_tokens": self.calls}}))
+        lines.append(self._record("event_msg", {
+            "type": "agent_message", "message": "All tests pass."}))
+        lines.append(self._record("response_item", {
+            "type": "message", "role": "assistant",
+            "content": [{"type": "output_text", "text": "All tests pass."}]}))
+        return lines
+
+
+def gen_codex(out, rng, payloads, codex_mb, codex_days, workload_mb):
+    root = os.path.join(out, "home", ".codex", "sessions")
+    total = codex_mb * 1024 * 1024
+    # Half the history is spread over past days, half is the live rollout
+    per_day = total // 2 // max(1, codex_days)
+    start = _EPOCH - timedelta(days=codex_days)
+    for day in range(codex_days):
+        when = start + timedelta(days=day)
+        day_dir = os.path.join(root, when.strftime("%Y/%m/%d"))
+        os.makedirs(day_dir, exist_ok=True)
+        for n in range(rng.randint(1, 4)):
+            name = (f"rollout-{when.strftime('%Y-%m-%dT%H-%M')}-{n:02d}-"
+                    f"{rng.getrandbits(64):016x}.jsonl")
+            rollout = _CodexRollout(rng, payloads, _Clock(rng, when))
+            _write_until(os.path.join(day_dir, name), per_day // 2,
+                         rollout.turn)
+    day_dir = os.path.join(root, _EPOCH.strftime("%Y/%m/%d"))
+    os.makedirs(day_dir, exist_ok=True)
+    live = os.path.join(day_dir, f"rollout-{_EPOCH.strftime('%Y-%m-%dT%H-%M')}"
+                                 f"-live.jsonl")
+    rollout = _CodexRollout(rng, payloads, _Clock(rng))
+    size = _write_until(live, total - per_day * codex_days, rollout.turn)
+    workload = os.path.join(out, "workload", "codex.jsonl")
+    _write_until(workload, workload_mb * 1024 * 1024 // 2, rollout.turn)
+    return {"rollout": live, "size": size, "days": codex_days,
+            "workload": workload}
+
+
+# -- OpenCode --------------------------------------------------------------
+
+_OPENCODE_SCHEMA = """
+CREATE TABLE session (id TEXT PRIMARY KEY, project_id TEXT, title TEXT,
+                      time_created INTEGER, time_updated INTEGER);
+CREATE TABLE message (id TEXT PRIMARY KEY, session_id TEXT,
+                      time_created INTEGER, data TEXT);
+CREATE TABLE part (id TEXT PRIMARY KEY, message_id TEXT, session_id TEXT,
+                   time_created INTEGER, time_updated INTEGER, data TEXT);
+CREATE INDEX part_session_idx ON part (session_id);
+"""
+
+
+class _OpenCodeSession:
+    def __init__(self, rng, payloads, session_id):
+        self.rng = rng
+        self.payloads = payloads
+        self.session_id = session_id
+        self.parts = 0
+        self.message = None
+
+    def _part(self, data):
+        self.parts += 1
+        data = dict(data, id=f"prt_{self.session_id}_{self.parts:09d}",
+                    sessionID=self.session_id, messageID=self.message)
+        return data
+
+    def turn(self):
+        rng = self.rng
+        self.message = f"msg_{rng.getrandbits(64):016x}"
+        parts = [self._part({"type": "step-start", "snapshot": "abc"})]
+        parts.append(self._part({"type": "text",
+                                 "text": "Looking into it.\n"}))
+        for _ in range(rng.randint(1, 10)):
+            call_id = f"call_{rng.getrandbits(48):012x}"
+            tool = rng.choice(OPENCODE_TOOLS)
+            if rng.random() < 0.03:
+                parts.append(self._part({
+                    "type": "tool", "callID": call_id, "tool": "task",
+                    "state": {"status": "running", "input": {
+                        "subagent_type": rng.choice(SUB_TYPES),
+                        "description": "explore the repo",
+                        "prompt": "Find the parser"}}}))
+            for status in ("pending", "running"):
+                if rng.random() < 0.5:
+                    parts.append(self._part({
+                        "type": "tool", "callID": call_id, "tool": tool,
+                        "state": {"status": status, "input": {}}}))
+            parts.append(self._part({
+                "type": "tool", "callID": call_id, "tool": tool,
+                "state": {"status": rng.choice(("completed", "completed",
+                                                "error")),
+                          "input": {"filePath": "/bench/project/src/x.py"},
+                          "output": rng.choice(self.payloads),
+                          "metadata": {}, "title": tool}}))
+        parts.append(self._part({"type": "step-finish", "reason": "stop",
+                                 "cost": 0.01, "tokens": {"input": 1000}}))
+        return parts
+
+
+def gen_opencode(out, rng, payloads, parts, workload_parts, sessions=20):
+    db_dir = os.path.join(out, "home", ".local", "share", "opencode")
+    os.makedirs(db_dir, exist_ok=True)
+    db_path = os.path.join(db_dir, "opencode.db")
+    if os.path.exists(db_path):
+        os.unlink(db_path)
+    conn = sqlite3.connect(db_path)
+    conn.executescript(_OPENCODE_SCHEMA)
+    conn.execute("PRAGMA journal_mode = WAL")
+    now = int(time.time() * 1000)
+    ids = [f"ses_{i:04d}_{rng.getrandbits(32):08x}" for i in range(sessions)]
+    conn.executemany(
+        "INSERT INTO session VALUES (?, 'bench', ?, ?, ?)",
+        [(sid, f"session {i}", now - 10_000_000 + i, now - sessions + i)
+         for i, sid in enumerate(ids)])
+    live = ids[-1]  # most recently updated
+    gens = {sid: _OpenCodeSession(rng, payloads, sid) for sid in ids}
+
+    def insert(rows):
+        conn.executemany(
+            "INSERT INTO part VALUES (?, ?, ?, ?, ?, ?)",
+            [(d["id"], d["messageID"], d["sessionID"], now, now, _dumps(d))
+             for d in rows])
+
+    count, batch = 0, []
+    while count < parts:
+        # Half the rows belong to the live session
+        sid = live if rng.random() < 0.5 else rng.choice(ids[:-1])
+        turn = gens[sid].turn()
+        batch.extend(turn)
+        count += len(turn)
+        if len(batch) >= 10_000:
+            insert(batch)
+            conn.commit()
+            batch = []
+    if batch:
+        insert(batch)
+    conn.commit()
+    max_rowid = conn.execute("SELECT MAX(rowid) FROM part").fetchone()[0]
+    conn.close()
+
+    workload = os.path.join(out, "workload", "opencode.jsonl")
+    with open(workload, "w", encoding="utf-8") as f:
+        written = 0
+        while written < workload_parts:
+            for data in gens[live].turn():
+                f.write(_dumps(data) + "\n")
+                written += 1
+    return {"db": db_path, "session": live, "parts": count,
+            "max_rowid": max_rowid, "workload": workload,
+            "workload_parts": written}
+
+
+def generate(out, seed=0, claude_mb=32, subagents=500, codex_mb=16,
+             codex_days=30, parts=100_000, workload_mb=16,
+             workload_parts=20_000, max_payload=1024 * 1024):
+    """Write a corpus under ``out`` and return its manifest."""
+    rng = random.Random(seed)
+    os.makedirs(os.path.join(out, "workload"), exist_ok=True)
+    payloads = _payloads(rng, 256, max_payload)
+    part_payloads = _payloads(rng, 256, 16 * 1024, min_bytes=64)
+    manifest = {
+        "seed": seed,
+        "params": {"claude_mb": claude_mb, "subagents": subagents,
+                   "codex_mb": codex_mb, "codex_days": codex_days,
+                   "parts": parts, "workload_mb": workload_mb,
+                   "workload_parts": workload_parts,
+                   "max_payload": max_payload},
+        "home": os.path.join(out, "home"),
+        "claude": gen_claude(out, rng, payloads, claude_mb, subagents,
+                             workload_mb),
+        "codex": gen_codex(out, rng, payloads, codex_mb, codex_days,
+                           workload_mb),
+        "opencode": gen_opencode(out, rng, part_payloads, parts,
+                                 workload_parts),
+    }
+    with open(os.path.join(out, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("out", help="Directory to write the corpus to")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small",
+                        help="Preset sizes (default: small)")
+    parser.add_argument("--seed", type=int, default=0)
+    for key in SCALES["small"]:
+        parser.add_argument(f"--{key.replace('_', '-')}", type=int,
+                            default=None, help=f"Override the preset {key}")
+    parser.add_argument("--max-payload", type=int, default=1024 * 1024,
+                        help="Largest tool_result payload in bytes")
+    args = parser.parse_args()
+
+    sizes = dict(SCALES[args.scale])
+    for key in sizes:
+        value = getattr(args, key)
+        if value is not None:
+            sizes[key] = value
+    start = time.monotonic()
+    manifest = generate(os.path.abspath(args.out), seed=args.seed,
+                        max_payload=args.max_payload, **sizes)
+    print(f"Wrote {args.out} in {time.monotonic() - start:.1f}s: "
+          f"claude {manifest['claude']['size'] >> 20} MB + "
+          f"{sizes['subagents']} subagents, "
+          f"codex {manifest['codex']['size'] >> 20} MB live rollout, "
+          f"opencode {manifest['opencode']['parts']} parts")
+
+
+if __name__ == "__main__":
+    main()
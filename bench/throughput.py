@@ -0,0 +1,285 @@
+"""Measure watcher throughput against a corpus from bench.corpus.
+
+Each watcher runs in a fresh process (so peak RSS is its own) with
+``HOME`` pointed at the corpus.  The run has three phases:
+
+attach
+    The first ``poll()``: discovery, bootstrap scans, opening the DB.
+feed
+    The workload is appended to the live transcript (or inserted into
+    the ``part`` table) in chunks, with a ``poll()`` after each.  Only
+    time spent inside ``poll()`` is counted, giving events/sec and
+    bytes/sec.
+idle
+    ``poll()`` with nothing new, reported as CPU microseconds per call.
+
+``parse`` times the record parser alone (``_decode_line`` +
+``_record_events`` for Claude, ``_parse_record`` for Codex,
+``_parse_part`` for OpenCode) over the same workload, so a regression
+there is visible apart from I/O.  The corpus is put back to its
+generated state before every run, so results are repeatable.
+
+Usage::
+
+    python -m bench.throughput CORPUS [-o results.json] [--only claude]
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import sqlite3
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+WATCHERS = ("claude", "codex", "opencode")
+
+# Workload bytes (or parts) appended between polls
+CHUNK_BYTES = 1024 * 1024
+CHUNK_PARTS = 500
+IDLE_POLLS = 1000
+
+
+def _peak_rss_kb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+class _Timer:
+    """Accumulates wall and CPU time spent in ``poll()``."""
+
+    def __init__(self):
+        self.wall = self.cpu = 0.0
+        self.calls = 0
+
+    def poll(self, watcher):
+        w0, c0 = time.perf_counter(), time.process_time()
+        events = watcher.poll()
+        self.wall += time.perf_counter() - w0
+        self.cpu += time.process_time() - c0
+        self.calls += 1
+        return events
+
+
+def _chunks(path, size):
+    """Line-aligned chunks of about ``size`` bytes."""
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(size)
+            if not chunk:
+                return
+            if not chunk.endswith(b"\n"):
+                chunk += f.readline()
+            yield chunk
+
+
+def _feed_file(watcher, path, workload):
+    timer = _Timer()
+    events = fed = 0
+    with open(path, "ab") as out:
+        for chunk in _chunks(workload, CHUNK_BYTES):
+            out.write(chunk)
+            out.flush()
+            fed += len(chunk)
+            events += len(timer.poll(watcher))
+    # Anything a watcher defers (e.g. subagent links) comes out here
+    while True:
+        got = len(timer.poll(watcher))
+        if not got:
+            break
+        events += got
+    return timer, events, fed
+
+
+def _idle(watcher):
+    timer = _Timer()
+    for _ in range(IDLE_POLLS):
+        timer.poll(watcher)
+    return round(timer.cpu / IDLE_POLLS * 1e6, 2)
+
+
+def _result(attach, timer, events, fed, idle_us, parse):
+    wall = timer.wall or 1e-9
+    return {
+        "attach_s": round(attach.wall, 4),
+        "attach_events": attach.events,
+        "events": events,
+        "bytes": fed,
+        "polls": timer.calls,
+        "poll_wall_s": round(timer.wall, 4),
+        "poll_cpu_s": round(timer.cpu, 4),
+        "events_per_sec": round(events / wall, 1),
+        "bytes_per_sec": round(fed / wall),
+        "idle_poll_cpu_us": idle_us,
+        **parse,
+        "peak_rss_kb": _peak_rss_kb(),
+    }
+
+
+def _attach(watcher):
+    timer = _Timer()
+    timer.events = len(timer.poll(watcher))
+    return timer
+
+
+def _parse_stats(records, parse):
+    """Time ``parse(record)`` over ``records``."""
+    start = time.perf_counter()
+    for record in records:
+        parse(record)
+    elapsed = time.perf_counter() - start
+    n = max(len(records), 1)
+    return {"parse_records": len(records),
+            "parse_us_per_record": round(elapsed / n * 1e6, 3)}
+
+
+def bench_claude(manifest):
+    from office.watchers.claude import ClaudeWatcher
+
+    info = manifest["claude"]
+    os.truncate(info["session"], info["size"])
+    watcher = ClaudeWatcher(project_path=info["project"])
+    try:
+        attach = _attach(watcher)
+        timer, events, fed = _feed_file(watcher, info["session"],
+                                        info["workload"])
+        idle_us = _idle(watcher)
+    finally:
+        watcher.close()
+        os.truncate(info["session"], info["size"])
+
+    parser = ClaudeWatcher.__new__(ClaudeWatcher)
+    parser._init_state()
+
+    def parse(line):
+        record = parser._decode_line(line)
+        if record is not None:
+            parser._record_events(record, "main")
+
+    with open(info["workload"], "rb") as f:
+        lines = f.read().split(b"\n")
+    return _result(attach, timer, events, fed, idle_us,
+                   _parse_stats(lines, parse))
+
+
+def bench_codex(manifest):
+    from office.watchers.codex import CodexWatcher
+
+    info = manifest["codex"]
+    os.truncate(info["rollout"], info["size"])
+    watcher = CodexWatcher()
+    try:
+        attach = _attach(watcher)
+        timer, events, fed = _feed_file(watcher, info["rollout"],
+                                        info["workload"])
+        idle_us = _idle(watcher)
+    finally:
+        watcher.close()
+        os.truncate(info["rollout"], info["size"])
+
+    parser = CodexWatcher.__new__(CodexWatcher)
+    parser._saw_tool_activity = False
+    with open(info["workload"], "rb") as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    return _result(attach, timer, events, fed, idle_us,
+                   _parse_stats(records, parser._parse_record))
+
+
+def bench_opencode(manifest):
+    from office.watchers.opencode import OpenCodeWatcher
+
+    info = manifest["opencode"]
+    writer = sqlite3.connect(info["db"])
+    writer.execute("DELETE FROM part WHERE rowid > ?", (info["max_rowid"],))
+    writer.commit()
+    with open(info["workload"], encoding="utf-8") as f:
+        rows = [(json.loads(line), line.rstrip("\n")) for line in f]
+
+    watcher = OpenCodeWatcher(db_path=info["db"])
+    watcher._poll_interval = 0  # the bench paces the polls itself
+    timer = _Timer()
+    events = fed = 0
+    try:
+        attach = _attach(watcher)
+        now = int(time.time() * 1000)
+        for i in range(0, len(rows), CHUNK_PARTS):
+            batch = rows[i:i + CHUNK_PARTS]
+            writer.executemany(
+                "INSERT INTO part VALUES (?, ?, ?, ?, ?, ?)",
+                [(d["id"], d["messageID"], d["sessionID"], now, now, raw)
+                 for d, raw in batch])
+            writer.commit()
+            fed += sum(len(raw) for _, raw in batch)
+            events += len(timer.poll(watcher))
+        events += len(timer.poll(watcher))  # deferred tool_ends
+        idle_us = _idle(watcher)
+    finally:
+        watcher.close()
+        writer.execute("DELETE FROM part WHERE rowid > ?",
+                       (info["max_rowid"],))
+        writer.commit()
+        writer.close()
+
+    parser = OpenCodeWatcher.__new__(OpenCodeWatcher)
+    parser._active_calls = {}
+    parser._deferred_ends = []
+    return _result(attach, timer, events, fed, idle_us,
+                   _parse_stats([d for d, _ in rows],
+                                lambda d: parser._parse_part(d, "main")))
+
+
+def _run(name, manifest):
+    """Entry point in the worker process."""
+    home = manifest["home"]
+    os.environ["HOME"] = home
+    os.environ["XDG_CACHE_HOME"] = os.path.join(home, ".cache")
+    return globals()[f"bench_{name}"](manifest)
+
+
+def run(corpus, only=WATCHERS):
+    with open(os.path.join(corpus, "manifest.json")) as f:
+        manifest = json.load(f)
+    results = {
+        "corpus": manifest["params"],
+        "seed": manifest["seed"],
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "watchers": {},
+    }
+    ctx = get_context("spawn")
+    for name in only:
+        # A fresh process per watcher keeps peak RSS per watcher
+        with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+            results["watchers"][name] = pool.submit(
+                _run, name, manifest).result()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("corpus", help="Directory written by bench.corpus")
+    parser.add_argument("-o", "--output", default=None,
+                        help="Write the results JSON here (default: stdout)")
+    parser.add_argument("--only", action="append", choices=WATCHERS,
+                        help="Benchmark just this watcher (repeatable)")
+    args = parser.parse_args()
+
+    results = run(args.corpus, args.only or WATCHERS)
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+        for name, stats in results["watchers"].items():
+            print(f"{name:9} {stats['events_per_sec']:>12,.0f} events/s "
+                  f"{stats['bytes_per_sec'] / 1e6:>9.1f} MB/s "
+                  f"idle {stats['idle_poll_cpu_us']:>8.1f} us "
+                  f"rss {stats['peak_rss_kb'] >> 10} MB")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,7 @@
 """Claude Office -- Terminal ASCII agent visualizer for AI coding CLIs."""
 import argparse
 import curses
+import json
 import sys
 
 
@@ -22,22 +23,93 @@ def main():
         help="Specific session UUID to watch"
     )
 
-    # Source selectors (mutually exclusive with --demo)
-    source = parser.add_mutually_exclusive_group()
-    source.add_argument(
+    # Source selectors; several may be combined into one office
+    parser.add_argument(
+        "--claude", action="store_true",
+        help="Watch Claude Code (the default when no other source is given)"
+    )
+    parser.add_argument(
         "--codex", action="store_true",
         help="Watch OpenAI Codex CLI sessions"
     )
-    source.add_argument(
+    parser.add_argument(
         "--kiro", action="store_true",
         help="Watch Kiro CLI sessions"
     )
-    source.add_argument(
+    parser.add_argument(
         "--opencode", action="store_true",
         help="Watch OpenCode sessions"
     )
 
+    parser.add_argument(
+        "--all-sessions", "-a", action="store_true",
+        help="Show every active Claude Code session, one team per session"
+    )
+    parser.add_argument(
+        "--max-sessions", type=int, default=4,
+        help="Most sessions shown at once with --all-sessions (default: 4)"
+    )
+    parser.add_argument(
+        "--replay", metavar="SESSION.jsonl|FILE.evlog", default=None,
+        help="Replay a recorded Claude Code transcript, or an event log "
+             "written by --record, instead of watching"
+    )
+    parser.add_argument(
+        "--speed", type=_speed, default=1.0, metavar="N[x]",
+        help="Replay speed multiplier, e.g. 20x (default: 1x)"
+    )
+    parser.add_argument(
+        "--max-gap", type=float, default=None, metavar="SECONDS",
+        help="During replay, shorten idle gaps longer than this"
+    )
+    parser.add_argument(
+        "--seek", type=_seek, default=None, metavar="SECONDS|ISO",
+        help="Start the replay this many seconds in, or (transcripts "
+             "only) at this ISO time"
+    )
+    parser.add_argument(
+        "--record", metavar="FILE.evlog", default=None,
+        help="Record the events shown to FILE.evlog for later --replay"
+    )
+    parser.add_argument(
+        "--procs", action="store_true",
+        help="Parse each source in its own worker process"
+    )
+    parser.add_argument(
+        "--backpressure", choices=("block", "drop_oldest"), default="block",
+        help="When the event queue fills: stall the watcher thread (block) "
+             "or discard the oldest queued events (drop_oldest)"
+    )
+    parser.add_argument(
+        "--damage", action="store_true",
+        help="Only redraw the screen cells that changed each frame"
+    )
+    parser.add_argument(
+        "--max-fps", type=_positive_int, default=10, metavar="N",
+        help="Frame rate while agents move or type (default: 10); the "
+             "office drops to about 1 FPS when nothing moves"
+    )
+    parser.add_argument(
+        "--headless", type=int, default=None, metavar="TICKS",
+        help="Run TICKS frames without a terminal, as fast as possible, "
+             "and print timing stats as JSON"
+    )
+
     args = parser.parse_args()
+    if (args.seek is not None and args.replay
+            and args.replay.endswith(".evlog") and _seek_is_time(args.seek)):
+        parser.error("--seek on an .evlog takes seconds, not a time")
+
+    if args.headless is not None:
+        from office.headless import SimulatedClock, run_headless
+        clock = SimulatedClock()
+        watcher = _build_watcher(args, clock=clock)
+        stats = run_headless(watcher, ticks=args.headless,
+                             floor_rows=watcher.max_sessions or None,
+                             damage=args.damage, max_fps=args.max_fps,
+                             clock=clock)
+        print(json.dumps(stats, indent=2))
+        return
 
     try:
         curses.wrapper(lambda stdscr: run(stdscr, args))
@@ -45,28 +117,130 @@ def main():
         pass
 
 
+def _speed(value):
+    from office.watchers.replay import parse_speed
+    try:
+        return parse_speed(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid speed: {value!r}")
+
+
+def _positive_int(value):
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"not a positive integer: {value!r}")
+    return number
+
+
+def _seek(value):
+    from office.watchers.replay import parse_seek
+    try:
+        parse_seek(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid seek target: {value!r}")
+    return value
+
+
+def _seek_is_time(value):
+    from office.watchers.replay import parse_seek
+    return parse_seek(value)[0] == "time"
+
+
 def run(stdscr, args):
     from office.app import App
 
-    watcher = None
+    watcher = _build_watcher(args)
+    app = App(stdscr, watcher=watcher,
+              floor_rows=watcher.max_sessions or None, damage=args.damage,
+              max_fps=args.max_fps)
+    app.run()
+
+
+def _build_watcher(args, clock=None):
+    """The watcher App polls, as selected on the command line.
+
+    With a ``clock`` (a headless run) the sources that pace themselves
+    follow it, and everything is polled on the caller's thread.
+    """
+    from office.watchers.threaded import ThreadedWatcher
+
+    headless = clock is not None
+    timing = {"clock": clock} if headless else {}
+    # Event logs are already parsed: nothing to offload to --procs
+    playback = bool(args.replay) and args.replay.endswith(".evlog")
     if args.demo:
         from office.watchers.demo import DemoWatcher
-        watcher = DemoWatcher()
-    elif args.codex:
+        sources = [("demo", DemoWatcher, dict(timing))]
+    elif playback:
+        from office.watchers.evlog import EvlogWatcher
+        sources = [("replay", EvlogWatcher,
+                    {"path": args.replay, "speed": args.speed,
+                     "max_gap": args.max_gap, "seek": args.seek,
+                     **timing})]
+    elif args.replay:
+        from office.watchers.replay import ReplayWatcher
+        sources = [("replay", ReplayWatcher,
+                    {"path": args.replay, "speed": args.speed,
+                     "max_gap": args.max_gap, "seek": args.seek,
+                     **timing})]
+    else:
+        sources = _build_sources(args)
+
+    if args.procs and not (args.demo or playback or headless):
+        # Parsing happens in worker processes; the UI only unpacks records
+        from office.watchers.process import ProcessWatcher
+        sources = [(tag, ProcessWatcher(factory, kwargs))
+                   for tag, factory, kwargs in sources]
+    else:
+        sources = [(tag, factory(**kwargs))
+                   for tag, factory, kwargs in sources]
+
+    if len(sources) == 1 and headless:
+        watcher = sources[0][1]
+    elif len(sources) == 1:
+        # Poll off the render thread so slow I/O never stalls a frame
+        watcher = ThreadedWatcher(sources[0][1],
+                                  backpressure=args.backpressure)
+    else:
+        from office.watchers.composite import CompositeWatcher
+        watcher = CompositeWatcher(sources, backpressure=args.backpressure,
+                                   threaded=not headless)
+
+    if args.record:
+        # Record exactly what App is fed, after threading and merging
+        from office.watchers.evlog import RecordingWatcher
+        watcher = RecordingWatcher(watcher, args.record, **timing)
+    return watcher
+
+
+def _build_sources(args):
+    """``(tag, watcher class, kwargs)`` for every selected source, Claude
+    by default."""
+    sources = []
+    if args.claude or args.all_sessions or not (
+            args.codex or args.kiro or args.opencode):
+        if args.all_sessions:
+            from office.watchers.claude_floor import ClaudeFloorWatcher
+            sources.append(("claude", ClaudeFloorWatcher,
+                            {"max_sessions": max(1, args.max_sessions)}))
+        else:
+            from office.watchers.claude import ClaudeWatcher
+            sources.append(("claude", ClaudeWatcher,
+                            {"project_path": args.project,
+                             "session_id": args.session}))
+    if args.codex:
         from office.watchers.codex import CodexWatcher
-        watcher = CodexWatcher()
-    elif args.kiro:
+        sources.append(("codex", CodexWatcher, {}))
+    if args.kiro:
         from office.watchers.kiro import KiroWatcher
-        watcher = KiroWatcher()
-    elif args.opencode:
+        sources.append(("kiro", KiroWatcher, {}))
+    if args.opencode:
         from office.watchers.opencode import OpenCodeWatcher
-        watcher = OpenCodeWatcher()
-    else:
-        from office.watchers.claude import ClaudeWatcher
-        watcher = ClaudeWatcher(args.project, args.session)
-
-    app = App(stdscr, watcher=watcher)
-    app.run()
+        sources.append(("opencode", OpenCodeWatcher, {}))
+    return sources
 
 
 if __name__ == "__main__":
@@ -1,15 +1,19 @@
 import curses
+import sys
 import time
 import random
 from office.colors import init_colors
-from office.scene import Scene, DESKS, LOUNGE_AREA
-from office.renderer import Renderer
-from office.character import Character
+from office.scene import Scene
+from office.renderer import Renderer, DamageRenderer
+from office.character import Character, build_sprite_table
 from office.agent_state import AgentState
+from office.profiler import FrameProfiler
+from office.eventloop import Waiter
 
 
 FPS = 10
-FRAME_MS = 1000 // FPS
+# Frame interval when nothing moves: just enough for the clock to tick
+IDLE_FRAME_S = 1.0
 
 # Default tool to assign subagents so they walk to a desk and work,
 # even when their JSONL events are missed (first-encounter file skip).
@@ -28,13 +32,28 @@ def _default_tool_for_type(agent_type):
     return _TYPE_DEFAULT_TOOLS.get(agent_type, "Read")
 
 
+def _session_of(agent_id):
+    """Session key of a namespaced agent id (``"<session>:<agent>"``)."""
+    session, sep, _ = agent_id.rpartition(":")
+    return session if sep else None
+
+
+def _is_main(agent_id):
+    return agent_id == "main" or agent_id.endswith(":main")
+
+
 class App:
     def __init__(self, stdscr, watcher=None, project_path=None, demo=False,
-                 session_id=None):
+                 session_id=None, floor_rows=None, damage=False, max_fps=FPS):
         self.stdscr = stdscr
+        self.max_fps = max_fps
         self.characters = {}
         self.desk_assignments = {}  # agent_id -> desk
         self.sub_counter = 0
+        # Floor mode: one row of desks per session, agents namespaced as
+        # "<session>:main", "<session>:sub-N"
+        self.floor_rows = floor_rows
+        self.session_rows = {}  # session key -> desk row
 
         # Build watcher from explicit param or legacy args
         if watcher is not None:
@@ -47,20 +66,31 @@ class App:
             self.watcher = ClaudeWatcher(project_path, session_id)
 
         source_name = getattr(self.watcher, "SOURCE_NAME", "CLAUDE CODE")
-        self.scene = Scene(source_name=source_name)
-        self.renderer = Renderer(stdscr)
+        self.scene = Scene(source_name=source_name,
+                           desk_rows=floor_rows or 1)
+        self.profiler = FrameProfiler(target_fps=max_fps)
+        # damage: only write the cells that changed since the last frame
+        renderer_cls = DamageRenderer if damage else Renderer
+        self.renderer = renderer_cls(stdscr, profiler=self.profiler)
+
+        if floor_rows:
+            return  # teams arrive with session_start events
 
         # Create main agent
         desk = self._assign_desk("main")
         if desk:
             self.scene.set_desk_agent(desk["id"], "main")
-        main_char = Character("main", "main", "main", desk)
-        main_char.x = random.uniform(LOUNGE_AREA["x_min"],
-                                     LOUNGE_AREA["x_max"])
-        main_char.y = random.uniform(LOUNGE_AREA["y_min"],
-                                     LOUNGE_AREA["y_max"])
+        main_char = self._new_character("main", "main", "main", desk)
+        area = self.scene.lounge_area
+        main_char.x = random.uniform(area["x_min"], area["x_max"])
+        main_char.y = random.uniform(area["y_min"], area["y_max"])
         self.characters["main"] = main_char
 
+    def _new_character(self, agent_id, name, agent_type, desk):
+        return Character(agent_id, name, agent_type, desk,
+                         lounge_area=self.scene.lounge_area,
+                         coffee_spot=self.scene.coffee_spot)
+
     def _assign_desk(self, agent_id):
         if agent_id in self.desk_assignments:
             return self.desk_assignments[agent_id]
@@ -69,7 +99,12 @@ class App:
         for aid, desk in self.desk_assignments.items():
             if aid in self.characters and self.characters[aid].is_alive:
                 used_desks.add(desk["id"])
-        for desk in DESKS:
+        desks = self.scene.desks
+        session = _session_of(agent_id)
+        if self.floor_rows and session is not None:
+            row = self.session_rows.get(session)
+            desks = self.scene.desks_in_row(row) if row is not None else []
+        for desk in desks:
             if desk["id"] not in used_desks:
                 self.desk_assignments[agent_id] = desk
                 return desk
@@ -86,67 +121,137 @@ class App:
         curses.curs_set(0)
         self.stdscr.nodelay(True)
         init_colors()
+        build_sprite_table()
 
+        try:
+            self._loop()
+        finally:
+            self.watcher.close()
+
+    def _loop(self):
+        waiter = Waiter(sys.stdin.fileno(), self.watcher.fileno())
+        try:
+            self._run_frames(waiter)
+        finally:
+            waiter.close()
+
+    def _run_frames(self, waiter):
         last_time = time.monotonic()
+        next_frame = last_time
+        # A watcher without a wakeup fd is polled once per frame period,
+        # so its events still show up within a frame while idle
+        poll_s = None if waiter.watches_events else 1.0 / self.max_fps
 
         while True:
+            timeout = next_frame - time.monotonic()
+            if poll_s is not None:
+                timeout = min(timeout, poll_s)
+            waiter.wait(timeout)
+
+            # Input (curses may have buffered several keys)
+            pressed = False
+            while True:
+                key = self.stdscr.getch()
+                if key == -1:
+                    break
+                pressed = True
+                if key == ord('q') or key == ord('Q'):
+                    return
+                if key == curses.KEY_RESIZE:
+                    self.stdscr.clear()
+                    self.renderer.invalidate()
+                if key == ord('p') or key == ord('P'):
+                    self.profiler.toggle()
+
+            t0 = time.perf_counter()
+            events = self.watcher.poll()
+            poll_time = time.perf_counter() - t0
+
+            # Draw early for events and keys, otherwise only when due
             now = time.monotonic()
+            if not pressed and not events and now < next_frame:
+                continue
             dt = now - last_time
             last_time = now
 
-            # Input
-            key = self.stdscr.getch()
-            if key == ord('q') or key == ord('Q'):
-                break
-            if key == curses.KEY_RESIZE:
-                self.stdscr.clear()
+            self.profiler.begin_frame()
+            self.profiler.add("poll", poll_time)
+            self.update(dt, events)
+            self.render()
+            next_frame = now + self._frame_interval()
 
-            # Poll for events
+    def _frame_interval(self):
+        """Seconds until the next frame: a full-rate frame while anyone
+        is moving or animating, else the next clock tick or the next
+        time an idle character will change, whichever comes first."""
+        min_s = 1.0 / self.max_fps
+        wait = IDLE_FRAME_S - time.time() % IDLE_FRAME_S
+        for char in self.characters.values():
+            wait = min(wait, char.time_to_change())
+            if wait <= min_s:
+                return min_s
+        return max(wait, min_s)
+
+    def update(self, dt, events=None):
+        """Advance the office by ``dt`` seconds: apply new watcher events
+        (polled here unless given) and move the characters."""
+        prof = self.profiler
+        if events is None:
             events = self.watcher.poll()
-            for event in events:
-                self._handle_event(event)
-
-            # Tick scene (whiteboard expiry)
-            self.scene.tick_whiteboard()
-
-            # Tick characters
-            dead = []
-            for agent_id, char in self.characters.items():
-                char.tick(dt)
-                if not char.is_alive:
-                    dead.append(agent_id)
-            if dead:
-                self._reclaim_desks(dead)
-                for agent_id in dead:
-                    del self.characters[agent_id]
-
-            # Render
-            self.renderer.draw(self.scene, self.characters)
-
-            # Frame timing
-            elapsed = time.monotonic() - now
-            sleep_ms = max(1, FRAME_MS - int(elapsed * 1000))
-            curses.napms(sleep_ms)
+            prof.lap("poll")
+        for event in events:
+            self._handle_event(event)
+        prof.lap("events")
+
+        # Tick scene (whiteboard expiry)
+        self.scene.tick_whiteboard(dt)
+        prof.lap("whiteboard")
+
+        # Tick characters; walks advance by one frame at most
+        max_step = 1.0 / self.max_fps
+        dead = []
+        for agent_id, char in self.characters.items():
+            char.tick(dt, max_step)
+            if not char.is_alive:
+                dead.append(agent_id)
+        if dead:
+            self._reclaim_desks(dead)
+            for agent_id in dead:
+                del self.characters[agent_id]
+        prof.lap("ticks")
+
+    def render(self):
+        self.renderer.draw(self.scene, self.characters)
 
     def _handle_event(self, event):
         ev_type = event["event"]
         agent_id = event.get("agent_id", "main")
 
-        if ev_type == "tool_start":
+        if ev_type == "session_start":
+            self._start_session(event["session"],
+                                event.get("label") or event["session"])
+
+        elif ev_type == "session_end":
+            self._end_session(event["session"])
+
+        elif ev_type == "tool_start":
             tool = event.get("tool", "unknown")
             self.scene.update_whiteboard(tool)
             if agent_id not in self.characters:
                 # Auto-detected subagent from JSONL -- give clean name
-                if agent_id != "main":
+                if not _is_main(agent_id):
                     self.sub_counter += 1
                     name = f"agent-{self.sub_counter}"
+                    self._spawn_agent(agent_id, name, "general-purpose")
                 else:
-                    name = "main"
-                self._spawn_agent(agent_id, name, "general-purpose")
+                    self._spawn_agent(agent_id, "main", "main")
             char = self.characters[agent_id]
             # AskUserQuestion = agent needs help / waiting for user
             if tool == "AskUserQuestion":
                 char.on_waiting(tool)
+            elif event.get("bootstrap"):
+                # State recovered on attach: already at work, no walk-in
+                char.sit_at_desk(tool)
             else:
                 char.on_tool_start(tool)
 
@@ -161,29 +266,64 @@ class App:
 
         elif ev_type == "turn_end":
             if agent_id in self.characters:
-                if agent_id == "main":
+                if _is_main(agent_id):
                     self.characters[agent_id].on_turn_end()
                 else:
                     # Subagent done -- exit animation
                     self.characters[agent_id].on_exit()
 
         elif ev_type == "spawn_subagent":
+            # Watchers that follow subagent transcripts name the subagent,
+            # so its own events (and its end) reach this character
+            tracked_id = event.get("subagent_id")
+            if tracked_id in self.characters:
+                return
             self.sub_counter += 1
             sub_type = event.get("subagent_type", "agent")
-            sub_id = f"sub-{self.sub_counter}"
+            sub_id = tracked_id or f"sub-{self.sub_counter}"
+            session = _session_of(agent_id)
+            if session is not None and not tracked_id:
+                sub_id = f"{session}:{sub_id}"
             # Use short type-based name like "explore-1", "plan-2"
             short_type = sub_type.lower().split("-")[0][:7]
             name = f"{short_type}-{self.sub_counter}"
             self._spawn_agent(sub_id, name, sub_type)
-            # Give the subagent an initial tool to work on.
-            # Subagent JSONL files are often skipped (first-encounter skip),
-            # so without this the character would just idle in the lounge.
+            if tracked_id and sub_id in self.characters:
+                self.characters[sub_id].idle_timeout = 120.0
+            # Give the subagent an initial tool to work on, so it heads
+            # for a desk before its own transcript (if any) catches up
             tool = event.get("tool")
             if not tool:
                 tool = _default_tool_for_type(sub_type)
             if tool and sub_id in self.characters:
                 self.scene.update_whiteboard(tool)
-                self.characters[sub_id].on_tool_start(tool)
+                if event.get("bootstrap"):
+                    self.characters[sub_id].sit_at_desk(tool)
+                else:
+                    self.characters[sub_id].on_tool_start(tool)
+
+    def _start_session(self, session, label):
+        """Give a newly promoted session a desk row and a main agent."""
+        if session in self.session_rows:
+            return
+        used = set(self.session_rows.values())
+        row = next((r for r in range(self.scene.desk_rows) if r not in used),
+                   None)
+        if row is None:
+            return
+        self.session_rows[session] = row
+        self.scene.set_row_label(row, label)
+        self._spawn_agent(f"{session}:main", label, "main")
+
+    def _end_session(self, session):
+        """Send a demoted session's team home and free its row."""
+        prefix = f"{session}:"
+        for agent_id, char in self.characters.items():
+            if agent_id.startswith(prefix):
+                char.on_exit()
+        row = self.session_rows.pop(session, None)
+        if row is not None:
+            self.scene.clear_row_label(row)
 
     def _spawn_agent(self, agent_id, name, agent_type):
         if agent_id in self.characters:
@@ -191,10 +331,10 @@ class App:
         desk = self._assign_desk(agent_id)
         if desk:
             self.scene.set_desk_agent(desk["id"], name)
-        char = Character(agent_id, name, agent_type, desk)
+        char = self._new_character(agent_id, name, agent_type, desk)
         # Spawn near the entrance door (bottom center)
         char.x = random.uniform(36, 44)
-        char.y = 19
+        char.y = self.scene.entrance_y
         char.state = AgentState.SPAWNING
         char.spawn_timer = 1.0
         self.characters[agent_id] = char
@@ -84,12 +84,76 @@ AGENT_COLORS = {
     "docs-helper": COLOR_SUB_MAGENTA,
 }
 
+# How each state animates: sprites cycled at ``rate`` per second.
+# THINKING walks to the coffee spot (first two) and then sips (last two).
+_POSES = {
+    AgentState.SPAWNING: (4, ("spawning", "exiting")),
+    AgentState.EXITING: (6, ("exiting", "spawning")),
+    AgentState.IDLE: (0, ("idle_down",)),
+    AgentState.WANDERING: (4, ("walk_1", "walk_2")),
+    AgentState.WALKING: (4, ("walk_1", "walk_2")),
+    AgentState.SITTING: (0, ("sitting",)),
+    AgentState.WORKING: (3, ("typing_1", "typing_2")),
+    AgentState.THINKING: (4, ("walk_1", "walk_2", "coffee_1", "coffee_2")),
+    AgentState.WAITING: (2, ("waiting_1", "waiting_2")),
+}
+_COFFEE_RATE = 1.5
+
+# States whose colour pulses, in toggles per second
+_BLINK = {AgentState.WAITING: 3, AgentState.SPAWNING: 5}
+
+# (agent_type, state, frame) -> (sprite lines, sprite attr, name attr),
+# where frame is pose * 2 + blink.  Filled by build_sprite_table() once
+# the colours are set up.
+SPRITE_TABLE = {}
+
+
+def _sprite_attr(color_pair, agent_type, state, blink):
+    color = curses.color_pair(color_pair)
+    if state == AgentState.WAITING:
+        if blink:
+            return curses.color_pair(COLOR_WAITING) | curses.A_BOLD
+        return color | curses.A_BOLD
+    if state == AgentState.SPAWNING:
+        return color | (curses.A_BOLD if blink else curses.A_DIM)
+    if state == AgentState.EXITING:
+        return color | curses.A_DIM
+    if agent_type == "main":
+        return color | curses.A_BOLD
+    return color
+
+
+def _add_agent_type(agent_type):
+    color_pair = AGENT_COLORS.get(agent_type, COLOR_SUB_GREEN)
+    name_attr = curses.color_pair(COLOR_AGENT_NAME) | curses.A_DIM
+    for state, (_, names) in _POSES.items():
+        for pose, name in enumerate(names):
+            lines = tuple(SPRITES[name])
+            for blink in (0, 1):
+                attr = _sprite_attr(color_pair, agent_type, state, blink)
+                SPRITE_TABLE[agent_type, state, pose * 2 + blink] = (
+                    lines, attr, name_attr)
+
+
+def build_sprite_table():
+    """Resolve every sprite frame to its lines and curses attribute.
+
+    Call after init_colors(); agent types not in AGENT_COLORS are added
+    the first time one is drawn.
+    """
+    SPRITE_TABLE.clear()
+    for agent_type in AGENT_COLORS:
+        _add_agent_type(agent_type)
+
+
 # Walk speed in columns per second
 WALK_SPEED = 16.0
 
 
 class Character:
-    def __init__(self, agent_id, name, agent_type="main", desk=None):
+    def __init__(self, agent_id, name, agent_type="main", desk=None,
+                 lounge_area=None, coffee_spot=None):
+        from office.scene import LOUNGE_AREA, COFFEE_SPOT
         self.agent_id = agent_id
         self.name = name
         self.agent_type = agent_type
@@ -101,6 +165,10 @@ class Character:
         self.target_x = None
         self.target_y = None
         self.desk = desk
+        # Where this character idles and takes breaks (shifted down when
+        # the scene has extra desk rows)
+        self.lounge_area = lounge_area or LOUNGE_AREA
+        self.coffee_spot = coffee_spot or COFFEE_SPOT
         self.sprite_frame = 0
         self.sprite_timer = 0.0
         self.speech_bubble = None
@@ -114,6 +182,9 @@ class Character:
         self.wait_timer = 0.0
         self._thinking_arrived = False
         self.idle_timer = 0.0  # tracks how long a subagent has been idle
+        # Subagents leave after idling this long; tracked ones are told
+        # when they finish, so they get more slack between tools
+        self.idle_timeout = 20.0
         self.is_alive = True
 
     def _is_at_desk(self):
@@ -161,6 +232,21 @@ class Character:
         self.speech_bubble = SpeechBubble.for_tool(tool_name)
         self._walk_to_desk()
 
+    def sit_at_desk(self, tool_name):
+        """Start out already seated and working (attaching mid-task)."""
+        if not self.desk:
+            self.on_tool_start(tool_name)
+            return
+        self.x = self.target_x = float(self.desk["chair_x"])
+        self.y = self.target_y = float(self.desk["chair_y"])
+        self.state = AgentState.WORKING
+        self.current_tool = tool_name
+        self.pending_tool = None
+        self.speech_bubble = SpeechBubble.for_tool(tool_name)
+        self.desk_timer = 0.0
+        self.idle_timer = 0.0
+        self.sprite_timer = 0.0
+
     def on_tool_end(self):
         # Let speech bubble expire naturally so user can see what tool was used
         if self.state == AgentState.WORKING:
@@ -185,9 +271,9 @@ class Character:
             self.current_tool = None
 
     def _go_get_coffee(self):
-        from office.scene import COFFEE_SPOT
-        self.target_x = float(COFFEE_SPOT["x"]) + random.uniform(-2, 4)
-        self.target_y = float(COFFEE_SPOT["y"]) + random.uniform(0, 2)
+        spot = self.coffee_spot
+        self.target_x = float(spot["x"]) + random.uniform(-2, 4)
+        self.target_y = float(spot["y"]) + random.uniform(0, 2)
         self.state = AgentState.THINKING
         self.think_timer = random.uniform(3.0, 6.0)
         self.sprite_timer = 0.0
@@ -210,13 +296,16 @@ class Character:
         self.exit_timer = 1.5
         self.speech_bubble = None
 
-    def tick(self, dt):
+    def tick(self, dt, max_step=None):
         if not self.is_alive:
             return
+        # Timers take the whole dt; a walk covers at most ``max_step`` of
+        # it, so a late frame doesn't jump a character across the room
+        step = dt if max_step is None else min(dt, max_step)
 
         # Tick speech bubble
         if self.speech_bubble:
-            if not self.speech_bubble.tick():
+            if not self.speech_bubble.tick(dt):
                 self.speech_bubble = None
 
         if self.state == AgentState.SPAWNING:
@@ -242,22 +331,24 @@ class Character:
         elif self.state == AgentState.IDLE:
             self.wander_timer -= dt
             self.idle_timer += dt
-            if self.agent_type != "main" and self.idle_timer > 20.0:
+            if (self.agent_type != "main"
+                    and self.idle_timer > self.idle_timeout):
                 self.on_exit()
             elif self.wander_timer <= 0:
                 self._start_wander()
 
         elif self.state == AgentState.WANDERING:
-            self._move_toward_target(dt)
+            self._move_toward_target(step)
             self.idle_timer += dt
-            if self.agent_type != "main" and self.idle_timer > 20.0:
+            if (self.agent_type != "main"
+                    and self.idle_timer > self.idle_timeout):
                 self.on_exit()
             elif self._at_target():
                 self.state = AgentState.IDLE
                 self.wander_timer = random.uniform(2.0, 6.0)
 
         elif self.state == AgentState.WALKING:
-            self._move_toward_target(dt)
+            self._move_toward_target(step)
             if self._at_target():
                 if self.current_tool:
                     self.state = AgentState.WORKING
@@ -291,7 +382,7 @@ class Character:
 
         elif self.state == AgentState.THINKING:
             if not self._thinking_arrived:
-                self._move_toward_target(dt)
+                self._move_toward_target(step)
                 if self._at_target():
                     self._thinking_arrived = True
                     self.sprite_timer = 0.0
@@ -308,71 +399,61 @@ class Character:
                 self.speech_bubble = None
                 self._return_to_lounge()
 
+    def time_to_change(self):
+        """Seconds until this character will look different: 0 while it
+        moves or animates, otherwise when a standing (IDLE) character
+        starts wandering or leaves, a SITTING one starts working or
+        thinking, or its bubble expires."""
+        if not self.is_alive:
+            return math.inf
+        state = self.state
+        if state == AgentState.IDLE:
+            wait = self.wander_timer
+            if self.agent_type != "main":
+                wait = min(wait, self.idle_timeout - self.idle_timer)
+        elif state == AgentState.SITTING:
+            wait = 0.5 - self.sprite_timer
+        else:
+            return 0.0
+        if self.speech_bubble and not self.speech_bubble.persistent:
+            wait = min(wait, self.speech_bubble.remaining)
+        return max(wait, 0.0)
+
+    def _frame(self):
+        """Index of the current pose and blink phase (see SPRITE_TABLE)."""
+        state = self.state
+        rate, names = _POSES[state]
+        pose = 0
+        if state == AgentState.THINKING and self._thinking_arrived:
+            pose = 2 + int(self.sprite_timer * _COFFEE_RATE) % 2
+        elif rate:
+            pose = int(self.sprite_timer * rate) % 2
+        blink = 0
+        if state in _BLINK:
+            blink = int(self.sprite_timer * _BLINK[state]) % 2
+        return pose * 2 + blink
+
+    def _table_entry(self):
+        key = (self.agent_type, self.state, self._frame())
+        entry = SPRITE_TABLE.get(key)
+        if entry is None:
+            _add_agent_type(self.agent_type)
+            entry = SPRITE_TABLE[key]
+        return entry
+
     def get_current_sprite(self):
-        if self.state == AgentState.SPAWNING:
-            # Pulsing spawn animation
-            frame = int(self.sprite_timer * 4) % 2
-            return SPRITES["spawning"] if frame == 0 else SPRITES["exiting"]
-        if self.state == AgentState.EXITING:
-            # Fading exit animation
-            frame = int(self.sprite_timer * 6) % 2
-            return SPRITES["exiting"] if frame == 0 else SPRITES["spawning"]
-        if self.state == AgentState.IDLE:
-            return SPRITES["idle_down"]
-        if self.state == AgentState.THINKING:
-            if not self._thinking_arrived:
-                frame = int(self.sprite_timer * 4) % 2
-                return SPRITES["walk_1"] if frame == 0 else SPRITES["walk_2"]
-            else:
-                frame = int(self.sprite_timer * 1.5) % 2
-                return SPRITES["coffee_1"] if frame == 0 else SPRITES["coffee_2"]
-        if self.state in (AgentState.WANDERING, AgentState.WALKING):
-            frame = int(self.sprite_timer * 4) % 2
-            return SPRITES["walk_1"] if frame == 0 else SPRITES["walk_2"]
-        if self.state == AgentState.SITTING:
-            return SPRITES["sitting"]
-        if self.state == AgentState.WORKING:
-            frame = int(self.sprite_timer * 3) % 2
-            return SPRITES["typing_1"] if frame == 0 else SPRITES["typing_2"]
-        if self.state == AgentState.WAITING:
-            frame = int(self.sprite_timer * 2) % 2
-            return SPRITES["waiting_1"] if frame == 0 else SPRITES["waiting_2"]
-        return SPRITES["idle_down"]
+        return self._table_entry()[0]
 
-    def render(self, win):
-        sprite = self.get_current_sprite()
+    def render(self, win, max_h, max_w):
+        lines, color, name_attr = self._table_entry()
         ix = int(self.x)
         iy = int(self.y)
-        max_h, max_w = win.getmaxyx()
 
-        # Color selection based on state
-        if self.state == AgentState.WAITING:
-            blink = int(self.sprite_timer * 3) % 2
-            if blink:
-                color = curses.color_pair(COLOR_WAITING) | curses.A_BOLD
-            else:
-                color = curses.color_pair(self.color_pair) | curses.A_BOLD
-        elif self.state == AgentState.SPAWNING:
-            # Pulsing effect for spawning
-            blink = int(self.sprite_timer * 5) % 2
-            color = curses.color_pair(self.color_pair)
-            if blink:
-                color |= curses.A_BOLD
-            else:
-                color |= curses.A_DIM
-        elif self.state == AgentState.EXITING:
-            color = curses.color_pair(self.color_pair) | curses.A_DIM
-        else:
-            color = curses.color_pair(self.color_pair)
-            if self.agent_type == "main":
-                color |= curses.A_BOLD
-
-        for row_offset, line in enumerate(sprite):
-            sy = iy + row_offset
-            sx = ix - 1
-            if 0 <= sy < max_h and 0 <= sx < max_w - 3:
+        sx = ix - 1
+        if 0 <= sx < max_w - 3:
+            for sy in range(max(iy, 0), min(iy + 3, max_h)):
                 try:
-                    win.addstr(sy, sx, line, color)
+                    win.addstr(sy, sx, lines[sy - iy], color)
                 except curses.error:
                     pass
 
@@ -381,35 +462,32 @@ class Character:
         name_x = ix - len(self.name) // 2
         if 0 <= name_y < max_h and 0 <= name_x < max_w - len(self.name):
             try:
-                name_attr = curses.color_pair(COLOR_AGENT_NAME) | curses.A_DIM
                 win.addstr(name_y, name_x, self.name, name_attr)
             except curses.error:
                 pass
 
-    def render_bubble(self, win):
+    def render_bubble(self, win, max_h, max_w):
         if not self.speech_bubble:
             return
         if self.state == AgentState.WAITING:
             self.speech_bubble.render(win, int(self.x), int(self.y),
+                                      max_h, max_w,
                                       color_pair=COLOR_WAITING_BUBBLE)
         else:
-            self.speech_bubble.render(win, int(self.x), int(self.y))
+            self.speech_bubble.render(win, int(self.x), int(self.y),
+                                      max_h, max_w)
 
     def _return_to_lounge(self):
-        from office.scene import LOUNGE_AREA
-        self.target_x = random.uniform(LOUNGE_AREA["x_min"],
-                                       LOUNGE_AREA["x_max"])
-        self.target_y = random.uniform(LOUNGE_AREA["y_min"],
-                                       LOUNGE_AREA["y_max"])
+        area = self.lounge_area
+        self.target_x = random.uniform(area["x_min"], area["x_max"])
+        self.target_y = random.uniform(area["y_min"], area["y_max"])
         self.state = AgentState.WANDERING
         self.sprite_timer = 0.0
 
     def _start_wander(self):
-        from office.scene import LOUNGE_AREA
-        self.target_x = random.uniform(LOUNGE_AREA["x_min"],
-                                       LOUNGE_AREA["x_max"])
-        self.target_y = random.uniform(LOUNGE_AREA["y_min"],
-                                       LOUNGE_AREA["y_max"])
+        area = self.lounge_area
+        self.target_x = random.uniform(area["x_min"], area["x_max"])
+        self.target_y = random.uniform(area["y_min"], area["y_max"])
         self.state = AgentState.WANDERING
         self.sprite_timer = 0.0
 
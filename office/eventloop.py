@@ -0,0 +1,77 @@
+"""Sleep until the render loop has something to do.
+
+``Waiter.wait(timeout)`` blocks in ``select()`` on stdin (a keypress),
+the watcher's ``fileno()`` (new events, see office.watchers.threaded)
+and a self-pipe that SIGWINCH writes to (the terminal was resized), with
+the time left until the next animation frame as the timeout.  Input and
+events are noticed as soon as they arrive, and with nothing due the
+process sleeps until the next frame.
+
+ncurses only reports a resize from inside ``getch()``, which is not
+called while we sleep, so the Python SIGWINCH handler takes over from
+ncurses' own: on wake-up the Waiter calls ``resizeterm()`` itself, which
+queues the ``KEY_RESIZE`` App already handles.
+"""
+import curses
+import os
+import selectors
+import signal
+
+
+class Waiter:
+    def __init__(self, stdin_fd, watcher_fd=None):
+        self.stdin_fd = stdin_fd
+        self.watches_events = watcher_fd is not None
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(stdin_fd, selectors.EVENT_READ)
+        if watcher_fd is not None:
+            self._selector.register(watcher_fd, selectors.EVENT_READ)
+        self._signal_r = None
+        self._old_handler = self._old_wakeup_fd = None
+        if hasattr(signal, "SIGWINCH"):
+            self._catch_resize()
+
+    def _catch_resize(self):
+        r, w = os.pipe()
+        os.set_blocking(r, False)
+        os.set_blocking(w, False)
+        try:
+            self._old_wakeup_fd = signal.set_wakeup_fd(w)
+            self._old_handler = signal.signal(signal.SIGWINCH,
+                                              lambda signum, frame: None)
+        except ValueError:
+            # Not the main thread: leave resizes to ncurses
+            os.close(r)
+            os.close(w)
+            return
+        self._signal_r, self._signal_w = r, w
+        self._selector.register(r, selectors.EVENT_READ)
+
+    def wait(self, timeout):
+        """Block for up to ``timeout`` seconds or until a key, an event
+        or a resize is ready."""
+        for key, _ in self._selector.select(max(timeout, 0.0)):
+            if key.fd == self._signal_r:
+                self._on_signal()
+
+    def _on_signal(self):
+        try:
+            while os.read(self._signal_r, 512):
+                pass
+        except OSError:
+            pass
+        try:
+            cols, lines = os.get_terminal_size(self.stdin_fd)
+        except OSError:
+            return
+        if curses.is_term_resized(lines, cols):
+            curses.resizeterm(lines, cols)
+
+    def close(self):
+        self._selector.close()
+        if self._signal_r is not None:
+            signal.signal(signal.SIGWINCH, self._old_handler)
+            signal.set_wakeup_fd(self._old_wakeup_fd)
+            os.close(self._signal_r)
+            os.close(self._signal_w)
+            self._signal_r = None
@@ -0,0 +1,98 @@
+"""An in-memory grid of ``(char, attr)`` cells with a curses-like API.
+
+``FrameBuffer`` implements the window calls Scene, Character,
+SpeechBubble and the profiler HUD draw with (``getmaxyx``, ``addstr``,
+``addch``, ``erase``, ``overwrite``), following curses' rules: text
+wraps at the right edge, and starting off-screen or running past the
+bottom-right cell raises ``curses.error``.
+
+When ``touched`` is a list, every write appends the ``(y, x0, x1)``
+span of cells it covered, so a caller can find out exactly what a set
+of draw calls dirtied.
+"""
+import curses
+
+
+class FrameBuffer:
+    """A ``height`` x ``width`` grid of cells, blank to start with."""
+
+    def __init__(self, height=24, width=80):
+        self.touched = None
+        self.resize(height, width)
+
+    def resize(self, height, width):
+        self.height = height
+        self.width = width
+        self.erase()
+
+    def getmaxyx(self):
+        return self.height, self.width
+
+    def erase(self):
+        self.chars = [[" "] * self.width for _ in range(self.height)]
+        self.attrs = [[0] * self.width for _ in range(self.height)]
+
+    clear = erase
+
+    def copy(self):
+        other = FrameBuffer.__new__(FrameBuffer)
+        other.touched = None
+        other.height, other.width = self.height, self.width
+        other.chars = [row[:] for row in self.chars]
+        other.attrs = [row[:] for row in self.attrs]
+        return other
+
+    def addstr(self, y, x, text, attr=0):
+        h, w = self.height, self.width
+        if not (0 <= y < h and 0 <= x < w):
+            raise curses.error("addstr() returned ERR")
+        pos, end = 0, len(text)
+        while pos < end:
+            if y >= h:
+                raise curses.error("addstr() returned ERR")
+            take = min(w - x, end - pos)
+            self.chars[y][x:x + take] = text[pos:pos + take]
+            self.attrs[y][x:x + take] = [attr] * take
+            if self.touched is not None:
+                self.touched.append((y, x, x + take))
+            pos += take
+            x += take
+            if x == w:
+                x = 0
+                y += 1
+        if y >= h:
+            # The cursor cannot move past the last cell
+            raise curses.error("addstr() returned ERR")
+
+    def addch(self, y, x, ch, attr=0):
+        if isinstance(ch, int):
+            ch = chr(ch)
+        self.addstr(y, x, ch, attr)
+
+    def overwrite(self, dest, sminrow=0, smincol=0, dminrow=0, dmincol=0,
+                  dmaxrow=None, dmaxcol=None):
+        """Copy a rectangle, blanks included, into ``dest``."""
+        if dmaxrow is None:
+            dmaxrow = min(self.height, dest.height) - 1
+            dmaxcol = min(self.width, dest.width) - 1
+        if (dmaxrow >= dest.height or dmaxcol >= dest.width
+                or sminrow + dmaxrow - dminrow >= self.height
+                or smincol + dmaxcol - dmincol >= self.width):
+            raise curses.error("copywin() returned ERR")
+        width = dmaxcol - dmincol + 1
+        for i in range(dmaxrow - dminrow + 1):
+            sy, dy = sminrow + i, dminrow + i
+            dest.chars[dy][dmincol:dmincol + width] = \
+                self.chars[sy][smincol:smincol + width]
+            dest.attrs[dy][dmincol:dmincol + width] = \
+                self.attrs[sy][smincol:smincol + width]
+
+    def restore(self, source, spans):
+        """Copy the cells of ``spans`` back from ``source`` (same size)."""
+        for y, x0, x1 in spans:
+            self.chars[y][x0:x1] = source.chars[y][x0:x1]
+            self.attrs[y][x0:x1] = source.attrs[y][x0:x1]
+
+    def text(self):
+        """The contents as one string per row."""
+        return ["".join(row) for row in self.chars]
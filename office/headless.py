@@ -0,0 +1,134 @@
+"""Run App without a terminal, for benchmarks and CI.
+
+``HeadlessScreen`` is a FrameBuffer (see office.framebuffer) with the
+rest of what App asks of ``stdscr``: ``refresh``, ``getch`` and
+``nodelay``.
+
+``run_headless`` drives App with a fixed timestep as fast as it will go
+and reports ticks per second, the cost of updating and rendering, and
+peak memory.  Nothing in the run follows the wall clock: the watcher is
+polled from ``App.update`` on this thread, watchers that pace themselves
+read a ``SimulatedClock`` advanced by the timestep, and ``random`` is
+seeded, so the same input always produces the same frames.
+
+``curses.color_pair`` needs ``initscr()``, so it is swapped for the
+equivalent of ncurses' ``COLOR_PAIR`` macro while the run lasts, and
+``curses.newpad`` for FrameBuffer.
+"""
+import curses
+import random
+import resource
+import sys
+import time
+from contextlib import contextmanager
+
+from office.framebuffer import FrameBuffer
+
+# ncurses packs the color pair number into bits 8-15 of an attribute
+_PAIR_SHIFT = 8
+
+
+class HeadlessScreen(FrameBuffer):
+    """A FrameBuffer standing in for ``stdscr``."""
+
+    def __init__(self, height=24, width=80):
+        super().__init__(height, width)
+        self.refreshes = 0
+
+    def refresh(self):
+        self.refreshes += 1
+
+    def getch(self):
+        return -1
+
+    def nodelay(self, flag):
+        pass
+
+
+class SimulatedClock:
+    """A ``time.monotonic`` stand-in that only moves when advanced."""
+
+    def __init__(self, start=0.0):
+        self.now = start
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@contextmanager
+def headless_curses():
+    """Make the module-level curses calls App relies on work without a
+    terminal."""
+    saved = curses.color_pair, curses.curs_set, curses.newpad
+    curses.color_pair = lambda n: n << _PAIR_SHIFT
+    curses.curs_set = lambda visibility: 0
+    curses.newpad = FrameBuffer
+    try:
+        yield
+    finally:
+        curses.color_pair, curses.curs_set, curses.newpad = saved
+
+
+def _peak_rss_kb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def run_headless(watcher, ticks=1000, dt=None, floor_rows=None,
+                 damage=False, max_fps=None, clock=None, seed=0):
+    """Advance App ``ticks`` times by ``dt`` seconds each (one frame at
+    ``max_fps``, the App's FPS by default) with no sleeping; returns
+    timing stats.
+
+    ``watcher`` should be unthreaded and read its time from ``clock``, a
+    SimulatedClock that is advanced by ``dt`` before each tick.  The
+    watcher is closed afterwards.
+    """
+    from office.app import App, FPS
+    from office.character import build_sprite_table
+
+    max_fps = max_fps or FPS
+    if dt is None:
+        dt = 1.0 / max_fps
+    update_s = render_s = render_max = 0.0
+    random.seed(seed)
+    with headless_curses():
+        build_sprite_table()
+        screen = HeadlessScreen()
+        app = App(screen, watcher=watcher, floor_rows=floor_rows,
+                  damage=damage, max_fps=max_fps)
+        screen.resize(app.scene.height + 2, app.scene.width + 2)
+        try:
+            start = time.perf_counter()
+            for _ in range(ticks):
+                if clock is not None:
+                    clock.advance(dt)
+                t0 = time.perf_counter()
+                app.update(dt)
+                t1 = time.perf_counter()
+                app.render()
+                t2 = time.perf_counter()
+                update_s += t1 - t0
+                render_s += t2 - t1
+                render_max = max(render_max, t2 - t1)
+            elapsed = time.perf_counter() - start
+        finally:
+            watcher.close()
+
+    n = max(ticks, 1)
+    return {
+        "ticks": ticks,
+        "dt": dt,
+        "seconds": round(elapsed, 6),
+        "ticks_per_sec": round(ticks / elapsed, 1) if elapsed else None,
+        "update_ms": round(update_s / n * 1000, 4),
+        "render_ms": round(render_s / n * 1000, 4),
+        "render_max_ms": round(render_max * 1000, 4),
+        "characters": len(app.characters),
+        "screen": f"{screen.width}x{screen.height}",
+        "peak_rss_kb": _peak_rss_kb(),
+    }
@@ -0,0 +1,136 @@
+"""Per-stage frame timing, shown as an overlay with the ``p`` key.
+
+The render loop calls ``begin_frame()`` at the top of each frame and
+``lap(stage)`` after each stage; a lap is the time since the previous
+one, so stages need no start/stop pairs and a disabled profiler costs a
+flag check per call.  Samples are kept for the last ``window`` frames
+and summarised (p50, p99, max) about once a second, so drawing the HUD
+doesn't add a sort per stage to every frame.
+"""
+import curses
+import time
+from collections import deque
+
+from office.colors import COLOR_HEADER
+
+# Stages in the order the loop runs them, with their HUD labels
+STAGES = (
+    ("poll", "watcher poll"),
+    ("events", "handle events"),
+    ("whiteboard", "tick_whiteboard"),
+    ("ticks", "character ticks"),
+    ("background", "static layer"),
+    ("furniture", "whiteboard+clock"),
+    ("characters", "draw characters"),
+    ("bubbles", "draw bubbles"),
+    ("status", "draw status bar"),
+    ("flush", "damage flush"),
+    ("refresh", "curses refresh"),
+)
+
+_HUD_WIDTH = 44
+
+
+def _percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+class FrameProfiler:
+    def __init__(self, target_fps, window=100, summary_interval=1.0):
+        self.target_fps = target_fps
+        self.window = window
+        self.summary_interval = summary_interval
+        self.enabled = False
+        self._samples = {}
+        self._frames = deque(maxlen=window)  # frame start times
+        self._work = deque(maxlen=window)    # busy time per frame
+        self._mark = None
+        self._frame_start = None
+        self._summary = []
+        self._summary_time = 0.0
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self._samples = {name: deque(maxlen=self.window)
+                         for name, _ in STAGES}
+        self._frames.clear()
+        self._work.clear()
+        self._summary = []
+        self._summary_time = 0.0
+        self._mark = None
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        if self._frame_start is not None and self._mark is not None:
+            self._work.append(self._mark - self._frame_start)
+        self._frames.append(now)
+        self._frame_start = self._mark = now
+
+    def lap(self, stage):
+        """Charge the time since the previous lap to ``stage``."""
+        if not self.enabled or self._mark is None:
+            return
+        now = time.perf_counter()
+        self._samples[stage].append(now - self._mark)
+        self._mark = now
+
+    def add(self, stage, seconds):
+        """Charge ``seconds`` measured outside the lap clock to ``stage``."""
+        if self.enabled and self._mark is not None:
+            self._samples[stage].append(seconds)
+
+    def skip(self):
+        """Restart the lap clock without charging any stage."""
+        if self.enabled and self._mark is not None:
+            self._mark = time.perf_counter()
+
+    def fps(self):
+        frames = self._frames
+        if len(frames) < 2:
+            return 0.0
+        return (len(frames) - 1) / (frames[-1] - frames[0])
+
+    def summary(self):
+        """``[(label, p50, p99, max)]`` in milliseconds, refreshed at most
+        once per ``summary_interval``."""
+        now = time.monotonic()
+        if now - self._summary_time < self.summary_interval:
+            return self._summary
+        self._summary_time = now
+        rows = []
+        for name, label in STAGES:
+            rows.append((label, *self._stats(self._samples[name])))
+        rows.append(("frame (busy)", *self._stats(self._work)))
+        self._summary = rows
+        return rows
+
+    @staticmethod
+    def _stats(samples):
+        if not samples:
+            return (0.0, 0.0, 0.0)
+        ordered = sorted(samples)
+        return (_percentile(ordered, 0.5) * 1000,
+                _percentile(ordered, 0.99) * 1000, ordered[-1] * 1000)
+
+    def draw(self, win, max_h, max_w):
+        """Overlay the timing table in the top-right corner."""
+        if not self.enabled:
+            return
+        rows = self.summary()
+        lines = [f" {'stage':<16}{'p50':>8}{'p99':>8}{'max':>8} ms "]
+        for label, p50, p99, peak in rows:
+            lines.append(f" {label:<16}{p50:>8.2f}{p99:>8.2f}{peak:>8.2f}    ")
+        lines.append(f" fps {self.fps():5.1f} / {self.target_fps:<3}"
+                     f"  (p: hide)")
+        x = max(0, max_w - _HUD_WIDTH - 2)
+        attr = curses.color_pair(COLOR_HEADER)
+        for i, line in enumerate(lines):
+            y = 3 + i
+            if y >= max_h - 1:
+                break
+            try:
+                win.addstr(y, x, line.ljust(_HUD_WIDTH)[:max_w - x], attr)
+            except curses.error:
+                pass
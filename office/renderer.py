@@ -1,43 +1,62 @@
 import curses
 import time
 from office.agent_state import AgentState
+from office.framebuffer import FrameBuffer
+
+
+def _no_lap(stage):
+    pass
 
 
 class Renderer:
-    def __init__(self, stdscr):
+    def __init__(self, stdscr, profiler=None):
         self.stdscr = stdscr
+        self.profiler = profiler
+        # Off-screen copy of the static scene and what it was drawn for
+        self._static = None
+        self._static_key = None
 
     def draw(self, scene, characters):
-        self.stdscr.erase()
+        lap = self.profiler.lap if self.profiler is not None else _no_lap
         max_h, max_w = self.stdscr.getmaxyx()
 
-        if max_h < 24 or max_w < 80:
-            self._draw_resize_message(max_h, max_w)
+        need_h, need_w = scene.height + 2, scene.width + 2
+        if max_h < need_h or max_w < need_w:
+            self.stdscr.erase()
+            self._draw_resize_message(max_h, max_w, need_h, need_w)
             self.stdscr.refresh()
             return
 
-        # 1. Background (walls, borders)
-        scene.draw_background(self.stdscr, max_h, max_w)
+        # 1. Walls, title and furniture, copied from the cached layer
+        # (this replaces erase(): blank cells are copied too)
+        self._draw_static(scene, max_h, max_w)
+        lap("background")
 
-        # 2. Title with clock
-        clock_str = time.strftime("%H:%M:%S")
-        scene.draw_title(self.stdscr, max_w, clock_str)
+        self._draw_dynamic(self.stdscr, scene, characters, max_h, max_w,
+                           lap)
+        self.stdscr.refresh()
+        lap("refresh")
 
-        # 3. Furniture
-        scene.draw_furniture(self.stdscr, max_h, max_w)
+    def _draw_dynamic(self, win, scene, characters, max_h, max_w, lap):
+        """Draw everything that isn't in the static layer onto ``win``."""
+        # 2. Clock and whiteboard
+        scene.draw_dynamic(win, max_w, time.strftime("%H:%M:%S"))
+        lap("furniture")
 
-        # 4. Characters sorted by Y for depth
+        # 3. Characters sorted by Y for depth
         sorted_chars = sorted(characters.values(), key=lambda c: c.y)
         for char in sorted_chars:
             if char.is_alive:
-                char.render(self.stdscr)
+                char.render(win, max_h, max_w)
+        lap("characters")
 
-        # 5. Speech bubbles (on top)
+        # 4. Speech bubbles (on top)
         for char in sorted_chars:
             if char.is_alive:
-                char.render_bubble(self.stdscr)
+                char.render_bubble(win, max_h, max_w)
+        lap("bubbles")
 
-        # 6. Status bar
+        # 5. Status bar
         alive_chars = [c for c in characters.values() if c.is_alive]
         main_count = sum(1 for c in alive_chars if c.agent_type == "main")
         sub_count = sum(1 for c in alive_chars if c.agent_type != "main")
@@ -46,16 +65,145 @@ class Renderer:
         tools = [c.current_tool for c in alive_chars if c.current_tool]
         tools_str = ", ".join(tools[:4]) if tools else "--"
 
-        scene.draw_status_bar(self.stdscr, max_h, max_w,
+        scene.draw_status_bar(win, max_h, max_w,
                               main_count, sub_count, active_count, tools_str)
+        lap("status")
 
-        self.stdscr.refresh()
+        # 6. Profiler HUD (its own cost is not charged to any stage)
+        if self.profiler is not None:
+            self.profiler.draw(win, max_h, max_w)
+            self.profiler.skip()
+
+    def invalidate(self):
+        """Forget what is on screen (after it was cleared)."""
+
+    def _draw_static(self, scene, max_h, max_w):
+        """Copy the static layer to the screen, redrawing it into a pad
+        first if the terminal size or the desk/team labels changed."""
+        key = (max_h, max_w, scene.static_version)
+        if key != self._static_key:
+            pad = curses.newpad(max_h, max_w)
+            scene.draw_static(pad, max_h, max_w)
+            self._static, self._static_key = pad, key
+        self._static.overwrite(self.stdscr, 0, 0, 0, 0, max_h - 1, max_w - 1)
 
-    def _draw_resize_message(self, max_h, max_w):
-        msg = "Please resize terminal to at least 80x24"
+    def _draw_resize_message(self, max_h, max_w, need_h=24, need_w=80):
+        msg = f"Please resize terminal to at least {need_w}x{need_h}"
         y = max_h // 2
         x = max(0, (max_w - len(msg)) // 2)
         try:
             self.stdscr.addstr(y, x, msg[:max_w], curses.A_BOLD)
         except curses.error:
             pass
+
+
+class DamageRenderer(Renderer):
+    """Renderer that only writes the cells that changed.
+
+    The frame is composed in an off-screen FrameBuffer that records the
+    span of every write.  Each frame, the spans written last frame (where
+    characters, bubbles, the clock and so on were) are reset from the
+    static layer, everything dynamic is drawn again, and only cells in
+    the old or new spans that differ from a shadow copy of the screen
+    are sent to curses.  The Python cost of a frame then follows how
+    much moved rather than the size of the terminal.
+    """
+
+    def __init__(self, stdscr, profiler=None):
+        super().__init__(stdscr, profiler)
+        self._canvas = None   # the frame being composed
+        self._shadow = None   # what curses has been given
+        self._spans = []      # spans drawn on the canvas last frame
+
+    def invalidate(self):
+        self._shadow = None
+
+    def draw(self, scene, characters):
+        lap = self.profiler.lap if self.profiler is not None else _no_lap
+        max_h, max_w = self.stdscr.getmaxyx()
+
+        need_h, need_w = scene.height + 2, scene.width + 2
+        if max_h < need_h or max_w < need_w:
+            self._shadow = None
+            self.stdscr.erase()
+            self._draw_resize_message(max_h, max_w, need_h, need_w)
+            self.stdscr.refresh()
+            return
+
+        key = (max_h, max_w, scene.static_version)
+        if key != self._static_key:
+            self._static = FrameBuffer(max_h, max_w)
+            scene.draw_static(self._static, max_h, max_w)
+            self._static_key = key
+            self._shadow = None  # repaint everything
+        canvas = self._canvas
+        stale = self._spans
+        if self._shadow is None or canvas is None:
+            canvas = self._canvas = self._static.copy()
+            stale = None
+        else:
+            canvas.restore(self._static, stale)
+        canvas.touched = spans = []
+        lap("background")
+
+        self._draw_dynamic(canvas, scene, characters, max_h, max_w, lap)
+        canvas.touched = None
+
+        if stale is None:
+            self._paint(canvas)
+        else:
+            self._flush(canvas, stale + spans)
+        self._spans = spans
+        lap("flush")
+
+        self.stdscr.refresh()
+        lap("refresh")
+
+    def _paint(self, canvas):
+        """Send the whole canvas to curses."""
+        self.stdscr.erase()
+        self._shadow = canvas.copy()
+        for y in range(canvas.height):
+            self._write_runs(y, 0, canvas.width, canvas, None)
+
+    def _flush(self, canvas, spans):
+        """Send the cells of ``spans`` that differ from the shadow."""
+        rows = {}
+        for y, x0, x1 in spans:
+            rows.setdefault(y, []).append((x0, x1))
+        for y, ranges in rows.items():
+            ranges.sort()
+            start, end = ranges[0]
+            for x0, x1 in ranges[1:]:
+                if x0 > end:
+                    self._write_runs(y, start, end, canvas, self._shadow)
+                    start = x0
+                end = max(end, x1)
+            self._write_runs(y, start, end, canvas, self._shadow)
+
+    def _write_runs(self, y, x0, x1, canvas, shadow):
+        """addstr the changed cells of row ``y`` in [x0, x1), one call
+        per run of adjacent changed cells with the same attribute."""
+        chars, attrs = canvas.chars[y], canvas.attrs[y]
+        if shadow is not None:
+            old_chars, old_attrs = shadow.chars[y], shadow.attrs[y]
+        x = x0
+        while x < x1:
+            if shadow is not None and (chars[x] == old_chars[x]
+                                       and attrs[x] == old_attrs[x]):
+                x += 1
+                continue
+            attr = attrs[x]
+            run = x + 1
+            while run < x1 and attrs[run] == attr and (
+                    shadow is None or chars[run] != old_chars[run]
+                    or attrs[run] != old_attrs[run]):
+                run += 1
+            try:
+                self.stdscr.addstr(y, x, "".join(chars[x:run]), attr)
+            except curses.error:
+                pass  # the bottom-right cell
+            if shadow is not None:
+                old_chars[x:run] = chars[x:run]
+                old_attrs[x:run] = attrs[x:run]
+            x = run
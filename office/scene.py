@@ -5,14 +5,27 @@ from office.colors import (
     COLOR_COFFEE, COLOR_PLANT, COLOR_ENTRANCE, COLOR_DESK_LABEL,
 )
 
+# Cubicle columns; each row of desks is 4 cubicles evenly spaced across
+CUBICLE_XS = [5, 21, 37, 53]
+CUBICLE_W = 15
+
+# Lines taken by one row of cubicles (walls, monitors, desk, chair, label)
+ROW_HEIGHT = 6
+
+
+def make_desks(row=0):
+    """Desk definitions for one row: position and chair position below."""
+    y = 3 + row * ROW_HEIGHT
+    return [
+        {"id": f"desk_{row * 4 + i}", "row": row, "x": cx, "y": y,
+         "chair_x": cx + 7, "chair_y": y + 3}
+        for i, cx in enumerate(CUBICLE_XS)
+    ]
+
+
 # Desk definitions: each desk has a position and a chair position below it
 # 4 cubicles evenly spaced across the top
-DESKS = [
-    {"id": "desk_0", "x": 5,  "y": 3, "chair_x": 12, "chair_y": 6},
-    {"id": "desk_1", "x": 21, "y": 3, "chair_x": 28, "chair_y": 6},
-    {"id": "desk_2", "x": 37, "y": 3, "chair_x": 44, "chair_y": 6},
-    {"id": "desk_3", "x": 53, "y": 3, "chair_x": 60, "chair_y": 6},
-]
+DESKS = make_desks(0)
 
 # Lounge area for idle characters
 LOUNGE_AREA = {"x_min": 18, "x_max": 50, "y_min": 11, "y_max": 16}
@@ -25,35 +38,59 @@ COFFEE_SPOT = {"x": 7, "y": 14}
 
 
 class Scene:
-    def __init__(self, source_name="CLAUDE CODE"):
+    def __init__(self, source_name="CLAUDE CODE", desk_rows=1):
         self.width = 78
-        self.height = 22
+        self.desk_rows = desk_rows
+        # Everything below the cubicles moves down for each extra row
+        self.floor_y = ROW_HEIGHT * (desk_rows - 1)
+        self.height = 22 + self.floor_y
         self.source_name = source_name
-        self.whiteboard_tools = []  # (tool_name, expire_time)
+        self.whiteboard_tools = []  # (tool_name, seconds left)
         self.desk_agents = {}  # desk_id -> agent_name (for labels)
+        self.row_labels = {}  # row -> team name shown on the cubicle wall
+        # Bumped whenever something drawn by draw_static changes
+        self.static_version = 0
+        self.desks = [d for row in range(desk_rows) for d in make_desks(row)]
+        oy = self.floor_y
+        self.lounge_area = dict(LOUNGE_AREA, y_min=LOUNGE_AREA["y_min"] + oy,
+                                y_max=LOUNGE_AREA["y_max"] + oy)
+        self.coffee_spot = dict(COFFEE_SPOT, y=COFFEE_SPOT["y"] + oy)
+        self.walkway_y = WALKWAY_Y + oy
+        self.entrance_y = 19 + oy
+
+    def desks_in_row(self, row):
+        return [d for d in self.desks if d["row"] == row]
+
+    def set_row_label(self, row, label):
+        if self.row_labels.get(row) != label:
+            self.row_labels[row] = label
+            self.static_version += 1
+
+    def clear_row_label(self, row):
+        if self.row_labels.pop(row, None) is not None:
+            self.static_version += 1
 
     def set_desk_agent(self, desk_id, agent_name):
-        self.desk_agents[desk_id] = agent_name
+        if self.desk_agents.get(desk_id) != agent_name:
+            self.desk_agents[desk_id] = agent_name
+            self.static_version += 1
 
     def clear_desk_agent(self, desk_id):
-        self.desk_agents.pop(desk_id, None)
+        if self.desk_agents.pop(desk_id, None) is not None:
+            self.static_version += 1
 
     def update_whiteboard(self, tool_name):
-        import time
-        expire = time.monotonic() + 15.0
         for i, (name, _) in enumerate(self.whiteboard_tools):
             if name == tool_name:
-                self.whiteboard_tools[i] = (tool_name, expire)
+                self.whiteboard_tools[i] = (tool_name, 15.0)
                 return
-        self.whiteboard_tools.append((tool_name, expire))
+        self.whiteboard_tools.append((tool_name, 15.0))
         if len(self.whiteboard_tools) > 5:
             self.whiteboard_tools = self.whiteboard_tools[-5:]
 
-    def tick_whiteboard(self):
-        import time
-        now = time.monotonic()
-        self.whiteboard_tools = [(n, t) for n, t in self.whiteboard_tools
-                                 if t > now]
+    def tick_whiteboard(self, dt):
+        self.whiteboard_tools = [(n, t - dt) for n, t in self.whiteboard_tools
+                                 if t > dt]
 
     def draw_background(self, win, max_h, max_w):
         # Double-line outer border
@@ -80,113 +117,149 @@ class Scene:
             self._safe_addstr(win, 2, self.width + 1, "\u2563", COLOR_WALL)
 
     def draw_title(self, win, max_w, clock_str):
+        self._draw_title_text(win)
+        self.draw_clock(win, max_w, clock_str)
+
+    def _draw_title_text(self, win):
         title = f" {self.source_name} OFFICE "
-        # Center the title in the title bar
-        pad = self.width - len(title) - len(clock_str) - 2
         self._safe_addstr(win, 1, 2, title, COLOR_TITLE, curses.A_BOLD)
+
+    def draw_clock(self, win, max_w, clock_str):
         clock_x = self.width - len(clock_str)
         if clock_x > 0:
             self._safe_addstr(win, 1, clock_x, clock_str, COLOR_WALL,
                               curses.A_DIM)
 
     def draw_furniture(self, win, max_h, max_w):
+        self._draw_static_furniture(win)
+        self._draw_whiteboard(win)
+
+    def draw_static(self, win, max_h, max_w):
+        """Everything that only changes with ``static_version``: walls,
+        title, and all furniture except the whiteboard."""
+        self.draw_background(win, max_h, max_w)
+        self._draw_title_text(win)
+        self._draw_static_furniture(win)
+
+    def draw_dynamic(self, win, max_w, clock_str):
+        """The parts of the scene left out of draw_static."""
+        self.draw_clock(win, max_w, clock_str)
+        self._draw_whiteboard(win)
+
+    def _draw_static_furniture(self, win):
         self._draw_cubicles(win)
         self._draw_walkway(win)
         self._draw_cafe(win)
         self._draw_plants(win)
         self._draw_sofas(win)
-        self._draw_whiteboard(win)
         self._draw_lounge_label(win)
         self._draw_entrance(win)
 
     def _draw_cubicles(self, win):
-        cubicle_xs = [5, 21, 37, 53]
-        cw = 15  # cubicle width
+        for row in range(self.desk_rows):
+            self._draw_cubicle_row(win, row)
+
+    def _draw_cubicle_row(self, win, row):
+        cubicle_xs = CUBICLE_XS
+        cw = CUBICLE_W  # cubicle width
+        top = 3 + row * ROW_HEIGHT
+        desks = self.desks_in_row(row)
 
         # Top wall
         for i, cx in enumerate(cubicle_xs):
             if i == 0:
-                self._safe_addstr(win, 3, cx, "┌" + "─" * (cw - 2), COLOR_DESK)
+                self._safe_addstr(win, top, cx, "┌" + "─" * (cw - 2), COLOR_DESK)
             else:
-                self._safe_addstr(win, 3, cx, "┬" + "─" * (cw - 2), COLOR_DESK)
-        self._safe_addstr(win, 3, cubicle_xs[-1] + cw - 1, "┐", COLOR_DESK)
-
-        # Monitors row (y=4)
+                self._safe_addstr(win, top, cx, "┬" + "─" * (cw - 2), COLOR_DESK)
+        self._safe_addstr(win, top, cubicle_xs[-1] + cw - 1, "┐", COLOR_DESK)
+        team = self.row_labels.get(row)
+        if team:
+            self._safe_addstr(win, top, cubicle_xs[0] + 2, f" {team[:24]} ",
+                              COLOR_DESK_LABEL, curses.A_BOLD)
+
+        # Monitors row
         for cx in cubicle_xs:
-            self._safe_addstr(win, 4, cx, "│", COLOR_DESK)
-            self._safe_addstr(win, 4, cx + 4, "░▓▓▓▓▓░", COLOR_DESK)
-            self._safe_addstr(win, 4, cx + cw - 1, "│", COLOR_DESK)
+            self._safe_addstr(win, top + 1, cx, "│", COLOR_DESK)
+            self._safe_addstr(win, top + 1, cx + 4, "░▓▓▓▓▓░", COLOR_DESK)
+            self._safe_addstr(win, top + 1, cx + cw - 1, "│", COLOR_DESK)
 
-        # Desk surface row (y=5)
+        # Desk surface row
         for cx in cubicle_xs:
-            self._safe_addstr(win, 5, cx, "│", COLOR_DESK)
-            self._safe_addstr(win, 5, cx + 3, "═════════", COLOR_DESK)
-            self._safe_addstr(win, 5, cx + cw - 1, "│", COLOR_DESK)
+            self._safe_addstr(win, top + 2, cx, "│", COLOR_DESK)
+            self._safe_addstr(win, top + 2, cx + 3, "═════════", COLOR_DESK)
+            self._safe_addstr(win, top + 2, cx + cw - 1, "│", COLOR_DESK)
 
-        # Chair row (y=6) with agent labels
+        # Chair row with agent labels
         for i, cx in enumerate(cubicle_xs):
-            self._safe_addstr(win, 6, cx, "│", COLOR_DESK)
-            self._safe_addstr(win, 6, cx + cw - 1, "│", COLOR_DESK)
+            self._safe_addstr(win, top + 3, cx, "│", COLOR_DESK)
+            self._safe_addstr(win, top + 3, cx + cw - 1, "│", COLOR_DESK)
             # Chair
-            self._safe_addstr(win, 6, DESKS[i]["chair_x"], "◇", COLOR_DESK)
+            self._safe_addstr(win, top + 3, desks[i]["chair_x"], "◇",
+                              COLOR_DESK)
 
-        # Bottom wall (y=7)
+        # Bottom wall
         for i, cx in enumerate(cubicle_xs):
             if i == 0:
-                self._safe_addstr(win, 7, cx, "└" + "─" * (cw - 2), COLOR_DESK)
+                self._safe_addstr(win, top + 4, cx, "└" + "─" * (cw - 2), COLOR_DESK)
             else:
-                self._safe_addstr(win, 7, cx, "┴" + "─" * (cw - 2), COLOR_DESK)
-        self._safe_addstr(win, 7, cubicle_xs[-1] + cw - 1, "┘", COLOR_DESK)
+                self._safe_addstr(win, top + 4, cx, "┴" + "─" * (cw - 2), COLOR_DESK)
+        self._safe_addstr(win, top + 4, cubicle_xs[-1] + cw - 1, "┘", COLOR_DESK)
 
-        # Desk number labels (y=8)
+        # Desk number labels
         for i, cx in enumerate(cubicle_xs):
-            label = self.desk_agents.get(DESKS[i]["id"], f"desk-{i}")
+            desk = desks[i]
+            label = self.desk_agents.get(desk["id"],
+                                         f"desk-{desk['id'][5:]}")
             label = label[:10].center(cw - 2)
-            self._safe_addstr(win, 8, cx + 1, label, COLOR_DESK_LABEL,
+            self._safe_addstr(win, top + 5, cx + 1, label, COLOR_DESK_LABEL,
                               curses.A_DIM)
 
     def _draw_walkway(self, win):
         # Decorative dotted walkway
         pattern = "· · · · · · · · · · · · · · · · · · · "
-        self._safe_addstr(win, WALKWAY_Y, 2, pattern[:self.width - 4],
+        self._safe_addstr(win, self.walkway_y, 2, pattern[:self.width - 4],
                           COLOR_SEPARATOR, curses.A_DIM)
 
     def _draw_cafe(self, win):
-        self._safe_addstr(win, 11, 2, "┌───────────┐", COLOR_COFFEE)
-        self._safe_addstr(win, 12, 2, "│  ♨  CAFÉ  │", COLOR_COFFEE)
-        self._safe_addstr(win, 13, 2, "│ ╭───────╮ │", COLOR_COFFEE)
-        self._safe_addstr(win, 14, 2, "│ │ ♨ tea │ │", COLOR_COFFEE)
-        self._safe_addstr(win, 15, 2, "│ ╰───────╯ │", COLOR_COFFEE)
-        self._safe_addstr(win, 16, 2, "│  ·  ·  ·  │", COLOR_COFFEE)
-        self._safe_addstr(win, 17, 2, "└───────────┘", COLOR_COFFEE)
+        oy = self.floor_y
+        self._safe_addstr(win, 11 + oy, 2, "┌───────────┐", COLOR_COFFEE)
+        self._safe_addstr(win, 12 + oy, 2, "│  ♨  CAFÉ  │", COLOR_COFFEE)
+        self._safe_addstr(win, 13 + oy, 2, "│ ╭───────╮ │", COLOR_COFFEE)
+        self._safe_addstr(win, 14 + oy, 2, "│ │ ♨ tea │ │", COLOR_COFFEE)
+        self._safe_addstr(win, 15 + oy, 2, "│ ╰───────╯ │", COLOR_COFFEE)
+        self._safe_addstr(win, 16 + oy, 2, "│  ·  ·  ·  │", COLOR_COFFEE)
+        self._safe_addstr(win, 17 + oy, 2, "└───────────┘", COLOR_COFFEE)
 
     def _draw_plants(self, win):
+        oy = self.floor_y
         # Plants near the café and between areas
-        self._safe_addstr(win, 10, 3, "}{", COLOR_PLANT)
-        self._safe_addstr(win, 10, 13, "}{", COLOR_PLANT)
-        self._safe_addstr(win, 19, 15, "}{", COLOR_PLANT)
-        self._safe_addstr(win, 19, 42, "}{", COLOR_PLANT)
+        self._safe_addstr(win, 10 + oy, 3, "}{", COLOR_PLANT)
+        self._safe_addstr(win, 10 + oy, 13, "}{", COLOR_PLANT)
+        self._safe_addstr(win, 19 + oy, 15, "}{", COLOR_PLANT)
+        self._safe_addstr(win, 19 + oy, 42, "}{", COLOR_PLANT)
 
     def _draw_sofas(self, win):
+        oy = self.floor_y
         # Sofa 1
-        self._safe_addstr(win, 16, 19, "╭━━━━━━╮", COLOR_FURNITURE)
-        self._safe_addstr(win, 17, 19, "┃ ░░░░ ┃", COLOR_FURNITURE)
-        self._safe_addstr(win, 18, 19, "╰━━━━━━╯", COLOR_FURNITURE)
+        self._safe_addstr(win, 16 + oy, 19, "╭━━━━━━╮", COLOR_FURNITURE)
+        self._safe_addstr(win, 17 + oy, 19, "┃ ░░░░ ┃", COLOR_FURNITURE)
+        self._safe_addstr(win, 18 + oy, 19, "╰━━━━━━╯", COLOR_FURNITURE)
 
         # Coffee table
-        self._safe_addstr(win, 17, 28, "◻", COLOR_FURNITURE)
+        self._safe_addstr(win, 17 + oy, 28, "◻", COLOR_FURNITURE)
 
         # Sofa 2
-        self._safe_addstr(win, 16, 33, "╭━━━━━━╮", COLOR_FURNITURE)
-        self._safe_addstr(win, 17, 33, "┃ ░░░░ ┃", COLOR_FURNITURE)
-        self._safe_addstr(win, 18, 33, "╰━━━━━━╯", COLOR_FURNITURE)
+        self._safe_addstr(win, 16 + oy, 33, "╭━━━━━━╮", COLOR_FURNITURE)
+        self._safe_addstr(win, 17 + oy, 33, "┃ ░░░░ ┃", COLOR_FURNITURE)
+        self._safe_addstr(win, 18 + oy, 33, "╰━━━━━━╯", COLOR_FURNITURE)
 
     def _draw_whiteboard(self, win):
+        oy = self.floor_y
         wb_x = self.width - 18
-        self._safe_addstr(win, 10, wb_x, "╔══════════════════╗", COLOR_WHITEBOARD)
-        self._safe_addstr(win, 11, wb_x, "║   WHITEBOARD     ║", COLOR_WHITEBOARD,
+        self._safe_addstr(win, 10 + oy, wb_x, "╔══════════════════╗", COLOR_WHITEBOARD)
+        self._safe_addstr(win, 11 + oy, wb_x, "║   WHITEBOARD     ║", COLOR_WHITEBOARD,
                           curses.A_BOLD)
-        self._safe_addstr(win, 12, wb_x, "║──────────────────║", COLOR_WHITEBOARD)
+        self._safe_addstr(win, 12 + oy, wb_x, "║──────────────────║", COLOR_WHITEBOARD)
         # Tool entries (up to 5)
         for i in range(5):
             if i < len(self.whiteboard_tools):
@@ -194,18 +267,20 @@ class Scene:
                 tool_str = f"║  ▸ {name:<13} ║"
             else:
                 tool_str = "║                  ║"
-            self._safe_addstr(win, 13 + i, wb_x, tool_str, COLOR_WHITEBOARD)
-        self._safe_addstr(win, 18, wb_x, "╚══════════════════╝", COLOR_WHITEBOARD)
+            self._safe_addstr(win, 13 + i + oy, wb_x, tool_str, COLOR_WHITEBOARD)
+        self._safe_addstr(win, 18 + oy, wb_x, "╚══════════════════╝", COLOR_WHITEBOARD)
 
     def _draw_lounge_label(self, win):
-        self._safe_addstr(win, 13, 28, "L O U N G E", COLOR_FURNITURE,
+        oy = self.floor_y
+        self._safe_addstr(win, 13 + oy, 28, "L O U N G E", COLOR_FURNITURE,
                           curses.A_DIM)
 
     def _draw_entrance(self, win):
+        oy = self.floor_y
         # Entrance/door at bottom center
         door_x = 35
-        self._safe_addstr(win, 20, door_x, "╔════════╗", COLOR_ENTRANCE)
-        self._safe_addstr(win, 21, door_x, "║ DOOR ▸ ║", COLOR_ENTRANCE)
+        self._safe_addstr(win, 20 + oy, door_x, "╔════════╗", COLOR_ENTRANCE)
+        self._safe_addstr(win, 21 + oy, door_x, "║ DOOR ▸ ║", COLOR_ENTRANCE)
 
     def draw_status_bar(self, win, max_h, max_w, agent_count, sub_count,
                         active_count, tools_str):
@@ -29,16 +29,31 @@ PERMISSION_TOOLS = {"Edit", "Write", "Bash", "NotebookEdit"}
 
 
 class SpeechBubble:
-    def __init__(self, text, duration_frames=40, persistent=False):
+    def __init__(self, text, duration=4.0, persistent=False):
         self.text = text
-        self.remaining = duration_frames
-        self.width = len(text) + 4
+        self.remaining = duration  # seconds, whatever the frame rate
         self.persistent = persistent
 
-    def render(self, win, x, y, color_pair=None):
+    @property
+    def text(self):
+        return self._text
+
+    @text.setter
+    def text(self, text):
+        # The box is drawn every frame but only changes with the text
+        self._text = text
+        self.width = len(text) + 4
+        top = "\u250c" + "\u2500" * (self.width - 2) + "\u2510"
+        mid = "\u2502 " + text.ljust(self.width - 4) + " \u2502"
+        pointer_pos = self.width // 2
+        bot_parts = list("\u2514" + "\u2500" * (self.width - 2) + "\u2518")
+        if 0 < pointer_pos < len(bot_parts) - 1:
+            bot_parts[pointer_pos] = "\u252c"
+        self._lines = (top, mid, "".join(bot_parts))
+
+    def render(self, win, x, y, max_h, max_w, color_pair=None):
         if color_pair is None:
             color_pair = COLOR_SPEECH
-        max_h, max_w = win.getmaxyx()
         bx = x - self.width // 2
         by = y - 3
 
@@ -52,35 +67,24 @@ class SpeechBubble:
         if by < 0 or bx < 0:
             return
 
-        top = "\u250c" + "\u2500" * (self.width - 2) + "\u2510"
-        mid = "\u2502 " + self.text.ljust(self.width - 4) + " \u2502"
-        pointer_pos = self.width // 2
-        bot_parts = list("\u2514" + "\u2500" * (self.width - 2) + "\u2518")
-        if 0 < pointer_pos < len(bot_parts) - 1:
-            bot_parts[pointer_pos] = "\u252c"
-        bot = "".join(bot_parts)
-
         try:
             color = curses.color_pair(color_pair)
-            if by < max_h:
-                win.addstr(by, bx, top, color)
-            if by + 1 < max_h:
-                win.addstr(by + 1, bx, mid, color)
-            if by + 2 < max_h:
-                win.addstr(by + 2, bx, bot, color)
+            for i, line in enumerate(self._lines):
+                if by + i < max_h:
+                    win.addstr(by + i, bx, line, color)
         except curses.error:
             pass
 
-    def tick(self):
+    def tick(self, dt):
         if self.persistent:
             return True
-        self.remaining -= 1
+        self.remaining -= dt
         return self.remaining > 0
 
     @staticmethod
     def for_tool(tool_name):
         text = TOOL_ICONS.get(tool_name, tool_name[:12])
-        return SpeechBubble(text, duration_frames=50)
+        return SpeechBubble(text, duration=5.0)
 
     @staticmethod
     def for_waiting(tool_name):
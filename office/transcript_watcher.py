@@ -2,13 +2,14 @@ import os
 import json
 import glob
 import time
+from office.watchers.tail import TailPool
 
 
 class TranscriptWatcher:
     def __init__(self, project_path=None, session_id=None):
         self.project_dir = self._resolve_project_dir(project_path)
         self.session_id = session_id
-        self.file_positions = {}
+        self._tails = TailPool()
         self.known_agents = set()
         self._last_scan = 0
         self._scan_interval = 2.0
@@ -103,34 +104,19 @@ class TranscriptWatcher:
         return events
 
     def _read_new_lines(self, filepath, agent_id):
+        # On first encounter the tail starts at EOF (don't replay history)
         events = []
-        pos = self.file_positions.get(filepath, 0)
-
-        # On first encounter, skip to end (don't replay history)
-        if filepath not in self.file_positions:
+        for line in self._tails.read_lines(filepath):
+            line = line.strip()
+            if not line:
+                continue
             try:
-                self.file_positions[filepath] = os.path.getsize(filepath)
-            except OSError:
-                self.file_positions[filepath] = 0
-            return events
-
-        try:
-            with open(filepath, "r") as f:
-                f.seek(pos)
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    try:
-                        record = json.loads(line)
-                        event = self._parse_record(record, agent_id)
-                        if event:
-                            events.append(event)
-                    except json.JSONDecodeError:
-                        pass
-                self.file_positions[filepath] = f.tell()
-        except (FileNotFoundError, OSError):
-            pass
+                record = json.loads(line)
+            except ValueError:
+                continue
+            event = self._parse_record(record, agent_id)
+            if event:
+                events.append(event)
         return events
 
     def _parse_record(self, record, agent_id):
@@ -187,3 +173,6 @@ class TranscriptWatcher:
             session = os.path.basename(main_file)[:8]
             return f"Session: {session}... (+{sub_count} sub)"
         return "Scanning..."
+
+    def close(self):
+        self._tails.close()
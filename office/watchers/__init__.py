@@ -1,5 +1,18 @@
 """Watcher plugins for different AI coding CLI tools."""
 
+# Every event type a watcher may emit.  The position in this table is the
+# type's wire code in compact encodings (see office.watchers.process), so
+# only append to it.
+EVENT_TYPES = (
+    "tool_start",
+    "tool_end",
+    "spawn_subagent",
+    "turn_end",
+    "waiting",
+    "session_start",
+    "session_end",
+)
+
 
 class BaseWatcher:
     """Base class for transcript/session watchers.
@@ -13,11 +26,25 @@ class BaseWatcher:
         {"event": "tool_end",        "agent_id": "main"}
         {"event": "spawn_subagent",  "agent_id": "main", "subagent_type": "Explore"}
         {"event": "turn_end",        "agent_id": "main"}
+        {"event": "session_start",   "session": "3f2a9c1e", "label": "myrepo"}
+        {"event": "session_end",     "session": "3f2a9c1e"}
+
+    Events carrying ``"bootstrap": True`` describe state that was already
+    in progress when the watcher attached; App seats those agents at
+    their desks instead of animating them in.
+
+    Watchers that follow several sessions announce each one with
+    ``session_start``/``session_end`` and namespace agent ids as
+    ``"<session>:<agent>"``; App gives every session its own desk row.
     """
 
     # Human-readable source name shown in the title bar.
     SOURCE_NAME: str = "UNKNOWN"
 
+    # Desk rows needed by a multi-session watcher; 0 for watchers that
+    # follow a single session with plain agent ids.
+    max_sessions: int = 0
+
     def poll(self) -> list[dict]:
         """Return new events since the last call."""
         raise NotImplementedError
@@ -25,3 +52,11 @@ class BaseWatcher:
     def get_status(self) -> str:
         """Return a short status string for the status bar."""
         raise NotImplementedError
+
+    def fileno(self) -> int | None:
+        """A file descriptor that turns readable when ``poll()`` may have
+        something new, or None if the watcher must be polled on a timer."""
+        return None
+
+    def close(self) -> None:
+        """Release any file descriptors or connections held open."""
@@ -1,23 +1,258 @@
 import os
+import re
 import json
 import glob
+import hashlib
 import time
+from collections import OrderedDict
 from office.watchers import BaseWatcher
+from office.watchers.tail import TailPool, reverse_lines
+from office.watchers.offset_index import OffsetIndex, indexed_size
+from office.watchers.project_index import ProjectIndex
+from office.watchers.jsonskim import (
+    find_key, find_keys, iter_array, reports_truncation, skip_value,
+    string_at,
+)
+from office.watchers.inotify import (
+    Inotify, IN_CREATE, IN_MODIFY, IN_MOVED_TO, IN_MOVED_FROM, IN_DELETE,
+    IN_ISDIR, IN_ONLYDIR, IN_Q_OVERFLOW,
+)
+
+# Project dir: new/renamed/removed sessions, appends, new session dirs
+_PROJECT_MASK = (IN_CREATE | IN_MOVED_TO | IN_MOVED_FROM | IN_DELETE
+                 | IN_MODIFY | IN_ONLYDIR)
+# Session dir: only interested in the "subagents" dir appearing
+_SESSION_MASK = IN_CREATE | IN_MOVED_TO | IN_ONLYDIR
+# Subagents dir: new subagent transcripts and their appends
+_SUBAGENT_MASK = IN_CREATE | IN_MOVED_TO | IN_MODIFY | IN_ONLYDIR
+
+# Every record _parse_record reacts to contains one of these byte strings.
+# Escaped occurrences inside tool output (\\"tool_use\\") don't match.
+_RECORD_MARKERS = (b'"tool_result"', b'"tool_use"', b'"assistant"',
+                   b'"turn_duration"')
+# Claude Code writes compact JSON, so a tool_use block starts like this
+_TOOL_USE_BLOCK = b'{"type":"tool_use"'
+# Lines at least this long are skimmed instead of fully decoded
+_SKIM_MIN_BYTES = 4096
+# How far back from EOF the attach-time scan may look
+_BOOTSTRAP_MAX_BYTES = 64 * 1024 * 1024
+# Recently seen tool_use ids, for dropping records written twice
+_SEEN_TOOL_USES = 4096
+# Task calls remembered while their subagent runs
+_MAX_TASKS = 256
+# Inside a JSON string: an escape that may be whitespace, or (group 1) a
+# character or escape that certainly isn't
+_TEXT_CHAR = re.compile(rb'\\(?:[nrtf]|u[0-9a-fA-F]{4})|([!#-\[\]-~]|\\.)')
+# A subagent transcript's first record (the Task prompt) must fit in this
+_ORIGIN_MAX_BYTES = 1024 * 1024
+# Session transcripts whose offset index is kept up to date as they grow
+_MAX_INDEXES = 8
+
+
+@reports_truncation
+def _skim_record(line):
+    """Decode only the parts of a record that _parse_record looks at.
+
+    Returns a stripped-down record of the same shape (``type``,
+    ``subtype``, and content blocks with ``type``, ``id``/``tool_use_id``,
+    ``name``, ``text`` and the Task ``subagent_type``/``description``
+    inputs), or None if the
+    record can't produce an event.  Keys are looked up one step at a time
+    so a huge tool_result payload after a block's ``type`` is never
+    scanned.
+    """
+    rec_type = string_at(line, find_key(line, 0, b"type"))
+    if rec_type == "system":
+        if b'"turn_duration"' not in line:
+            return None
+        return {"type": rec_type,
+                "subtype": string_at(line, find_key(line, 0, b"subtype"))}
+    if rec_type == "user":
+        if b'"tool_result"' not in line:
+            return None
+    elif rec_type != "assistant":
+        return None
+
+    record = {"type": rec_type}
+    if rec_type == "assistant":
+        block_pos = line.find(_TOOL_USE_BLOCK)
+        if block_pos >= 0:
+            # The first tool_use wins; jump straight to it rather than
+            # skipping the text/thinking blocks in front of it
+            record["message"] = {"content": [_skim_tool_use(line, block_pos)]}
+            return record
+
+    msg_pos = find_key(line, 0, b"message")
+    if msg_pos < 0 or line[msg_pos] != ord("{"):
+        return record
+    content_pos = find_key(line, msg_pos, b"content")
+    if content_pos < 0:
+        return record
+    if line[content_pos] != ord("["):
+        # Plain string content: only its truthiness matters
+        record["message"] = {"content": _text_flag(line, content_pos)}
+        return record
+
+    blocks = []
+    for block_pos in iter_array(line, content_pos):
+        if line[block_pos] != ord("{"):
+            continue
+        block_type = string_at(line, find_key(line, block_pos, b"type"))
+        if block_type == "tool_use":
+            blocks.append(_skim_tool_use(line, block_pos))
+            break  # _parse_record acts on the first tool_use
+        block = {"type": block_type}
+        blocks.append(block)
+        if block_type == "tool_result":
+            block["tool_use_id"] = string_at(
+                line, find_key(line, block_pos, b"tool_use_id"))
+            break
+        if block_type == "text":
+            block["text"] = _text_flag(line,
+                                       find_key(line, block_pos, b"text"))
+    record["message"] = {"content": blocks}
+    return record
+
+
+def _skim_tool_use(line, block_pos):
+    keys = find_keys(line, block_pos, (b"id", b"name", b"input"))
+    block = {"type": "tool_use",
+             "id": string_at(line, keys.get(b"id", -1))}
+    name = string_at(line, keys.get(b"name", -1))
+    if name is not None:
+        block["name"] = name
+    input_pos = keys.get(b"input", -1)
+    if name == "Task" and input_pos >= 0:
+        block["input"] = {}
+        inp = find_keys(line, input_pos,
+                        (b"subagent_type", b"description", b"prompt"))
+        for key, pos in inp.items():
+            value = string_at(line, pos)
+            if value is not None:
+                block["input"][key.decode()] = value
+    return block
+
+
+def _first_block(record, block_type):
+    content = record.get("message", {}).get("content")
+    if not isinstance(content, list):
+        return None
+    for block in content:
+        if isinstance(block, dict) and block.get("type") == block_type:
+            return block
+    return None
+
+
+def _prompt_key(prompt):
+    """Short digest of a Task prompt, to match it to a subagent file."""
+    if not isinstance(prompt, str) or not prompt:
+        return None
+    return hashlib.sha1(prompt.encode("utf-8")).hexdigest()[:16]
+
+
+def _subagent_origin(path):
+    """``(parent tool_use id, prompt key)`` from a subagent transcript's
+    first record, or None while that record is incomplete."""
+    try:
+        with open(path, "rb") as f:
+            line = f.readline(_ORIGIN_MAX_BYTES)
+    except OSError:
+        return None
+    if not line.endswith(b"\n"):
+        return None
+    try:
+        record = json.loads(line)
+    except ValueError:
+        return (None, None)
+    parent = record.get("parentToolUseID") or record.get("parent_tool_use_id")
+    content = record.get("message", {}).get("content")
+    if isinstance(content, list):
+        content = "".join(b.get("text", "") for b in content
+                          if isinstance(b, dict) and b.get("type") == "text")
+    return (parent, _prompt_key(content))
+
+
+def _record_type(line):
+    try:
+        return string_at(line, find_key(line, 0, b"type"))
+    except (ValueError, IndexError):
+        return None
+
+
+def _text_flag(line, pos):
+    """Stand-in for a text value where only blank vs non-blank matters."""
+    if pos < 0 or line[pos] != ord('"'):
+        return ""
+    end = skip_value(line, pos)
+    if end - pos > 64:
+        for m in _TEXT_CHAR.finditer(line, pos + 1, end - 1):
+            if m.group(1):
+                return "..."
+        # Nothing but whitespace, escapes that may be and non-ASCII
+        # bytes: decode to settle it the way str.strip() would
+    return string_at(line, pos) or ""
 
 
 class ClaudeWatcher(BaseWatcher):
-    """Watch Claude Code JSONL transcripts."""
+    """Watch Claude Code JSONL transcripts.
+
+    On Linux the project directory is watched with inotify, so new
+    sessions, appends and subagent files are reported as they happen and
+    ``poll()`` only reads files that actually changed.  Elsewhere (or if
+    inotify setup fails) we fall back to rescanning every 2 seconds.
+
+    Subagent transcripts (``<session>/subagents/*.jsonl``) are linked to
+    the Task tool_use that spawned them -- by the parent tool_use id the
+    file records, else by matching the Task prompt, else (for files
+    created while we watch) in spawn order -- and then tailed as that
+    subagent.  The spawn event carries the subagent's agent id, and the
+    Task's tool_result ends it.  tool_use ids already reported are
+    remembered in a bounded LRU so records written twice (or seen by both
+    the bootstrap scan and the tail) don't produce duplicate events.
+    """
 
     SOURCE_NAME = "CLAUDE CODE"
 
     def __init__(self, project_path=None, session_id=None):
+        self._init_state()
         self.project_dir = self._resolve_project_dir(project_path)
         self.session_id = session_id
-        self.file_positions = {}
+        self._setup_notify()
+
+    def _init_state(self):
+        """Reading and parsing state.  Subclasses that find their
+        transcripts some other way (a floor of sessions, a replay file)
+        call this instead of ``__init__``, so they never miss a field."""
+        self._tails = TailPool()
+        # Session transcript -> OffsetIndex, None if it can't be extended
+        self._indexes = OrderedDict()
         self.known_agents = set()
         self._last_scan = 0
         self._scan_interval = 2.0
         self._tracked_files = []
+        self.subagent_files = set()
+        self._dirty = set()  # tracked files with unread appends
+        self._rescan = True
+        self._notify = None
+        self._watched_session = None
+        self._init_subagents()
+
+    def _init_subagents(self):
+        self._seen_tool_uses = OrderedDict()  # tool_use id -> None, LRU
+        self._tasks = OrderedDict()     # running Task id -> subagent id
+        self._unlinked = OrderedDict()  # Task id -> prompt key, no file yet
+        self._task_files = {}           # Task id -> subagent transcript
+        self._new_files = set()         # subagent files created while watched
+        self._pending_files = set()     # subagent files not linked yet
+
+    def _setup_notify(self):
+        notify = Inotify.create()
+        if notify is None:
+            return
+        if notify.add_watch(self.project_dir, _PROJECT_MASK) is None:
+            notify.close()
+            return
+        self._notify = notify
 
     def _resolve_project_dir(self, project_path):
         if project_path is None:
@@ -40,19 +275,11 @@ class ClaudeWatcher(BaseWatcher):
                 if entry_norm == norm:
                     return os.path.join(projects_root, entry)
 
-            # Last resort: find the most recently modified project dir
-            best_dir = None
-            best_mtime = 0
-            for entry in os.listdir(projects_root):
-                entry_path = os.path.join(projects_root, entry)
-                if not os.path.isdir(entry_path):
-                    continue
-                jsonls = glob.glob(os.path.join(entry_path, "*.jsonl"))
-                if jsonls:
-                    mtime = max(os.path.getmtime(f) for f in jsonls)
-                    if mtime > best_mtime:
-                        best_mtime = mtime
-                        best_dir = entry_path
+            # Fall back to the cached project index: a dir whose sessions
+            # ran in this path, else the most recently active project
+            index = ProjectIndex(projects_root)
+            index.refresh()
+            best_dir = index.find_by_cwd(project_path) or index.most_recent()
             if best_dir:
                 return best_dir
 
@@ -76,59 +303,371 @@ class ClaudeWatcher(BaseWatcher):
         self._last_scan = now
 
         self._tracked_files = []
-
         if self.session_id:
             session_file = os.path.join(self.project_dir,
                                         f"{self.session_id}.jsonl")
-            if os.path.exists(session_file):
-                self._tracked_files.append(("main", session_file))
-                # Note: subagent JSONL files are NOT tracked here.
-                # Subagents are created via spawn_subagent events from the
-                # main session, and given default tools in App._handle_event.
-                # Tracking their files would create duplicate characters.
+            if not os.path.exists(session_file):
+                session_file = None
         else:
             session_file = self._find_latest_session()
-            if session_file:
-                self._tracked_files.append(("main", session_file))
+        if not session_file:
+            return
+        self._tracked_files.append(("main", session_file))
+        self._tracked_files.extend(
+            (self._tasks[task_id], path)
+            for task_id, path in self._task_files.items()
+            if path.startswith(session_file[:-len(".jsonl")] + os.sep))
+        if self._notify is None:
+            self._scan_subagents(session_file[:-len(".jsonl")])
+
+    def _scan_subagents(self, session_base):
+        known = self.subagent_files
+        found = set(self._find_subagent_files(session_base))
+        if self._watched_session == session_base:
+            # Anything that appeared since the last scan is new
+            self._new_files.update(found - known)
+            self._pending_files.update(found - known)
+        else:
+            self._watched_session = session_base
+            self._pending_files = set(found)
+        self.subagent_files = found
+
+    def _watch_session(self, session_file):
+        """Move the session/subagents watches to the tracked session."""
+        session_base = session_file[:-len(".jsonl")]
+        if session_base == self._watched_session:
+            return
+        if self._watched_session:
+            self._notify.rm_watch(self._watched_session)
+            self._notify.rm_watch(
+                os.path.join(self._watched_session, "subagents"))
+        self._watched_session = session_base
+        self.subagent_files = set()
+        self._pending_files = set()
+        self._add_session_watches()
+
+    def _add_session_watches(self):
+        # Either dir may not exist yet; creation is reported by the parent
+        self._notify.add_watch(self._watched_session, _SESSION_MASK)
+        subagents_dir = os.path.join(self._watched_session, "subagents")
+        if self._notify.is_watched(subagents_dir):
+            return
+        if self._notify.add_watch(subagents_dir, _SUBAGENT_MASK) is not None:
+            found = self._find_subagent_files(self._watched_session)
+            self.subagent_files.update(found)
+            self._pending_files.update(found)
+
+    def _set_main(self, session_file, created=False):
+        if self._tracked_files and self._tracked_files[0][1] == session_file:
+            return
+        for _, path in self._tracked_files[1:]:
+            self._tails.discard(path)
+        self._tracked_files = [("main", session_file)]
+        if created:
+            # Brand new session: read it from the start
+            self._tails.track(session_file, from_end=False)
+        self._watch_session(session_file)
+
+    def _drain_notify(self):
+        for path, mask in self._notify.read_events():
+            if mask & IN_Q_OVERFLOW:
+                self._rescan = True
+                continue
+            parent, name = os.path.split(path)
+            if parent == self.project_dir:
+                if mask & IN_ISDIR:
+                    if path == self._watched_session:
+                        self._add_session_watches()
+                    continue
+                if not name.endswith(".jsonl"):
+                    continue
+                if mask & (IN_DELETE | IN_MOVED_FROM):
+                    if any(fp == path for _, fp in self._tracked_files):
+                        self._rescan = True
+                    continue
+                self._on_session_activity(path, bool(mask & IN_CREATE))
+            elif parent == self._watched_session:
+                if name == "subagents" and mask & IN_ISDIR:
+                    self._add_session_watches()
+            elif (name.endswith(".jsonl") and self._watched_session
+                  and parent == os.path.join(self._watched_session,
+                                             "subagents")):
+                self.subagent_files.add(path)
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    self._new_files.add(path)
+                if any(fp == path for _, fp in self._tracked_files):
+                    self._dirty.add(path)
+                else:
+                    self._pending_files.add(path)
+
+    def _on_session_activity(self, path, created):
+        if self.session_id:
+            if os.path.basename(path) != f"{self.session_id}.jsonl":
+                return
+        # Mirrors the polling rule: the most recently written session wins
+        self._set_main(path, created=created)
+        self._dirty.add(path)
 
     def poll(self):
-        self._scan_files()
+        if self._notify is None:
+            self._scan_files()
+            paths = None
+        else:
+            self._drain_notify()
+            if self._rescan:
+                self._rescan = False
+                self._last_scan = 0
+                self._scan_files()
+                if self._tracked_files:
+                    self._watch_session(self._tracked_files[0][1])
+                self._dirty.update(fp for _, fp in self._tracked_files)
+            if not self._dirty and not self._pending_files:
+                return []
+            paths = self._dirty
+            self._dirty = set()
+
         events = []
-        for agent_id, filepath in self._tracked_files:
-            events.extend(self._read_new_lines(filepath, agent_id))
+        for entry in list(self._tracked_files):
+            agent_id, filepath = entry
+            if entry not in self._tracked_files:
+                continue  # subagent finished earlier in this poll
+            if paths is None or filepath in paths:
+                events.extend(self._read_new_lines(filepath, agent_id))
+        if self._pending_files:
+            for agent_id, filepath in self._link_subagents():
+                events.extend(self._read_new_lines(filepath, agent_id))
         return events
 
+    # -- subagents ----------------------------------------------------------
+
+    def _first_sight(self, tool_use_id):
+        """False if this tool_use id was already reported."""
+        if not tool_use_id:
+            return True
+        seen = self._seen_tool_uses
+        if tool_use_id in seen:
+            seen.move_to_end(tool_use_id)
+            return False
+        seen[tool_use_id] = None
+        if len(seen) > _SEEN_TOOL_USES:
+            seen.popitem(last=False)
+        return True
+
+    def _register_task(self, block, event):
+        """Remember a Task call and name the subagent it spawns."""
+        task_id = block.get("id")
+        if not task_id:
+            return
+        session, sep, _ = event["agent_id"].rpartition(":")
+        sub_id = f"{session}{sep}task-{task_id[-6:]}"
+        event["subagent_id"] = sub_id
+        self._tasks[task_id] = sub_id
+        self._unlinked[task_id] = _prompt_key(
+            block.get("input", {}).get("prompt"))
+        while len(self._tasks) > _MAX_TASKS:
+            old, _ = self._tasks.popitem(last=False)
+            self._unlinked.pop(old, None)
+            self._task_files.pop(old, None)
+
+    def _finish_task(self, task_id):
+        """The Task's tool_result arrived: its subagent is done."""
+        sub_id = self._tasks.pop(task_id, None)
+        if sub_id is None:
+            return []
+        self._unlinked.pop(task_id, None)
+        path = self._task_files.pop(task_id, None)
+        if path is not None:
+            self._tracked_files = [(a, fp) for a, fp in self._tracked_files
+                                   if fp != path]
+            self._tails.discard(path)
+        return [{"event": "turn_end", "agent_id": sub_id}]
+
+    def _link_subagents(self):
+        """Pair pending subagent files with unlinked Task calls; returns
+        ``(agent_id, path)`` for files that became tracked."""
+        linked = []
+        for path in sorted(self._pending_files):
+            if not self._unlinked:
+                break
+            origin = _subagent_origin(path)
+            if origin is None:
+                continue  # first record not written yet
+            parent, key = origin
+            task_id = None
+            if parent in self._unlinked:
+                task_id = parent
+            elif key is not None:
+                task_id = next((t for t, k in self._unlinked.items()
+                                if k == key), None)
+            if task_id is None and path in self._new_files:
+                # Spawned while we watched: oldest unclaimed Task
+                task_id = next(iter(self._unlinked))
+            self._pending_files.discard(path)
+            if task_id is None:
+                continue  # a subagent from before we attached
+            del self._unlinked[task_id]
+            self._task_files[task_id] = path
+            sub_id = self._tasks[task_id]
+            if path in self._new_files:
+                self._tails.track(path, from_end=False)
+            self._tracked_files.append((sub_id, path))
+            linked.append((sub_id, path))
+        return linked
+
     def _read_new_lines(self, filepath, agent_id):
         events = []
-        pos = self.file_positions.get(filepath, 0)
-
-        # On first encounter, skip to end (don't replay history)
-        if filepath not in self.file_positions:
+        if filepath not in self._tails:
+            # First encounter: don't replay history, but pick up whatever
+            # is in flight and resume right after the scanned lines
+            events, offset = self._bootstrap(filepath, agent_id)
+            self._tails.track(filepath, offset=offset)
+        lines = self._tails.read_lines(filepath)
+        if lines and filepath not in self.subagent_files:
+            self._index_lines(filepath, lines)
+        for line in lines:
             try:
-                self.file_positions[filepath] = os.path.getsize(filepath)
-            except OSError:
-                self.file_positions[filepath] = 0
-            return events
-
-        try:
-            with open(filepath, "r") as f:
-                f.seek(pos)
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    try:
-                        record = json.loads(line)
-                        event = self._parse_record(record, agent_id)
-                        if event:
-                            events.append(event)
-                    except json.JSONDecodeError:
-                        pass
-                self.file_positions[filepath] = f.tell()
-        except (FileNotFoundError, OSError):
-            pass
+                record = self._decode_line(line)
+            except ValueError:
+                continue
+            if record is None:
+                continue
+            events.extend(self._record_events(record, agent_id))
+        return events
+
+    def _index_lines(self, filepath, lines):
+        """Add freshly read lines to the transcript's offset index, so a
+        later replay can seek without indexing them again.
+
+        Only an index that already reaches where the tail started is
+        extended; catching up on history is left to replay's ``--seek``,
+        so attaching never reads the transcript from the top.
+        """
+        end = self._tails.track(filepath).line_end
+        if filepath in self._indexes:
+            self._indexes.move_to_end(filepath)
+        else:
+            start = end - sum(len(line) + 1 for line in lines)
+            self._indexes[filepath] = (OffsetIndex(filepath)
+                                       if indexed_size(filepath) == start
+                                       else None)
+            if len(self._indexes) > _MAX_INDEXES:
+                _, old = self._indexes.popitem(last=False)
+                if old is not None:
+                    old.flush()
+        index = self._indexes[filepath]
+        if index is not None and not index.extend(lines, end):
+            # Truncated or replaced: stop following it
+            index.flush()
+            self._indexes[filepath] = None
+
+    def _record_events(self, record, agent_id):
+        """Events for one decoded record, with Task and dedup bookkeeping."""
+        event = self._parse_record(record, agent_id)
+        rec_type = record.get("type")
+        if rec_type == "assistant":
+            block = _first_block(record, "tool_use")
+            if block is not None:
+                if not self._first_sight(block.get("id")):
+                    return []
+                if event and event["event"] == "spawn_subagent":
+                    self._register_task(block, event)
+        events = [event] if event else []
+        if rec_type == "user":
+            result = _first_block(record, "tool_result")
+            if result is not None:
+                events.extend(self._finish_task(result.get("tool_use_id")))
         return events
 
+    def _bootstrap(self, filepath, agent_id):
+        """Rebuild the in-flight state of a transcript we attach to.
+
+        Scans backwards from EOF to the start of the current turn (the
+        last turn_duration record or user prompt), collecting tool_use
+        blocks that have no tool_result yet.  Returns events flagged
+        ``bootstrap`` (so App can seat agents directly) and the offset
+        the tail should resume from.
+        """
+        lines = reverse_lines(filepath, _BOOTSTRAP_MAX_BYTES)
+        resume, _ = next(lines, (None, None))
+        if resume is None:
+            return [], None
+
+        finished = set()   # tool_use ids that already have a result
+        open_uses = []     # unfinished tool_use blocks, newest first
+        newest = None      # kind of the most recent relevant record
+        for _offset, line in lines:
+            try:
+                record = self._decode_line(line)
+            except ValueError:
+                continue
+            if record is None:
+                if _record_type(line) == "user":
+                    newest = newest or "prompt"
+                    break
+                continue
+            rec_type = record.get("type")
+            if rec_type == "system":
+                newest = newest or "turn_end"
+                break
+            content = record.get("message", {}).get("content", [])
+            if not isinstance(content, list):
+                content = []
+            blocks = [b for b in content if isinstance(b, dict)]
+            if rec_type == "user":
+                results = [b for b in blocks if b.get("type") == "tool_result"]
+                if not results:
+                    newest = newest or "prompt"
+                    break
+                finished.update(b.get("tool_use_id") for b in results)
+                newest = newest or "result"
+            elif rec_type == "assistant":
+                uses = [b for b in blocks if b.get("type") == "tool_use"]
+                for block in reversed(uses):
+                    if block.get("id") not in finished:
+                        open_uses.append(block)
+                if uses:
+                    newest = newest or "tool"
+                elif self._parse_record(record, agent_id):
+                    newest = newest or "text"
+
+        if newest in (None, "turn_end"):
+            return [], resume
+
+        events = []
+        for block in reversed(open_uses):
+            self._first_sight(block.get("id"))
+            if block.get("name") == "Task":
+                inp = block.get("input", {})
+                event = {
+                    "event": "spawn_subagent",
+                    "agent_id": agent_id,
+                    "subagent_type": inp.get("subagent_type", "agent"),
+                    "description": inp.get("description", "subtask"),
+                    "bootstrap": True,
+                }
+                self._register_task(block, event)
+                events.append(event)
+        current = next((b.get("name", "unknown") for b in open_uses
+                        if b.get("name") != "Task"), None)
+        if current is None:
+            current = "Task" if open_uses else "Thinking"
+        events.append({
+            "event": "tool_start",
+            "agent_id": agent_id,
+            "tool": current,
+            "bootstrap": True,
+        })
+        return events, resume
+
+    def _decode_line(self, line):
+        """Decode a raw transcript line, or None if it can't matter."""
+        line = line.strip()
+        if len(line) >= _SKIM_MIN_BYTES:
+            return _skim_record(line)
+        if not line or not any(m in line for m in _RECORD_MARKERS):
+            return None
+        return json.loads(line)
+
     def _parse_record(self, record, agent_id):
         rec_type = record.get("type")
 
@@ -188,14 +727,19 @@ class ClaudeWatcher(BaseWatcher):
     def get_status(self):
         if not self._tracked_files:
             return "No active session found"
-        main_file = None
-        sub_count = 0
-        for agent_id, fp in self._tracked_files:
-            if agent_id == "main":
-                main_file = fp
-            else:
-                sub_count += 1
-        if main_file:
-            session = os.path.basename(main_file)[:8]
-            return f"Session: {session}... (+{sub_count} sub)"
-        return "Scanning..."
+        main_file = self._tracked_files[0][1]
+        session = os.path.basename(main_file)[:8]
+        return f"Session: {session}... (+{len(self._tasks)} sub)"
+
+    def fileno(self):
+        return self._notify.fileno() if self._notify is not None else None
+
+    def close(self):
+        self._tails.close()
+        for index in self._indexes.values():
+            if index is not None:
+                index.flush()
+        self._indexes.clear()
+        if self._notify is not None:
+            self._notify.close()
+            self._notify = None
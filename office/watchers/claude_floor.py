@@ -0,0 +1,259 @@
+"""Watch every active Claude Code session across all projects.
+
+One scanner covers ``~/.claude/projects``: it keeps a map of recently
+written transcripts and promotes the most recently active ones (up to
+``max_sessions``) to tracked sessions, each shown as its own team.
+Sessions idle for ``idle_timeout`` are demoted again.
+
+With inotify every project directory is watched, so a write to any
+transcript is reported by the kernel and nothing is stat'ed per poll.
+Without it, project directories are stat'ed each scan and only those
+whose mtime changed (a session was created or removed) are re-listed
+and have their transcripts stat'ed.  Appends don't touch a directory's
+mtime, so a slower sweep also stats the transcripts of projects with a
+recently written session.  Either way the per-poll work grows with the
+number of active sessions and projects, not the size of the history; a
+project that has been quiet for longer than ``idle_timeout`` is only
+noticed again when a session is created in it.
+"""
+import os
+import time
+
+from office.watchers.claude import ClaudeWatcher
+from office.watchers.project_index import read_cwd
+from office.watchers.inotify import (
+    Inotify, IN_CREATE, IN_MODIFY, IN_MOVED_TO, IN_MOVED_FROM, IN_DELETE,
+    IN_ISDIR, IN_ONLYDIR, IN_Q_OVERFLOW,
+)
+
+# Projects root: new project directories
+_ROOT_MASK = IN_CREATE | IN_MOVED_TO | IN_ONLYDIR
+# Project dirs: sessions created, removed or appended to
+_PROJECT_MASK = (IN_CREATE | IN_MOVED_TO | IN_MOVED_FROM | IN_DELETE
+                 | IN_MODIFY | IN_ONLYDIR)
+
+# A tracked session is only displaced by a newer one after this much
+# idle time, so a busy floor doesn't reshuffle its teams every poll
+_DISPLACE_IDLE = 60.0
+# Fallback scanning: dir mtimes every _SCAN_INTERVAL, the transcripts of
+# recently active projects per sweep
+_SCAN_INTERVAL = 2.0
+_SWEEP_INTERVAL = 30.0
+
+
+class ClaudeFloorWatcher(ClaudeWatcher):
+    """Follow up to ``max_sessions`` Claude Code sessions at once.
+
+    Emits ``session_start`` (with a ``session`` key and a project
+    ``label``) when a session is promoted and ``session_end`` when it is
+    demoted; every other event's ``agent_id`` is namespaced as
+    ``"<session>:main"``.  Transcript parsing is inherited from
+    ClaudeWatcher.
+    """
+
+    max_sessions = 4
+
+    def __init__(self, max_sessions=None, idle_timeout=600.0,
+                 projects_root=None):
+        self.projects_root = projects_root or os.path.expanduser(
+            "~/.claude/projects")
+        if max_sessions is not None:
+            self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        # Task calls still end their subagents; subagent transcripts
+        # themselves are only followed in single-session mode
+        self._init_state()
+        self.sessions = {}     # path -> session key, promoted sessions
+        self._activity = {}    # path -> last write (wall clock), recent only
+        self._created = set()  # new transcripts: read from the top
+        self._dir_mtimes = {}  # project dir -> mtime at last listing
+        self._dir_files = {}   # project dir -> [transcript paths]
+        self._labels = {}      # project dir -> display label
+        self._last_sweep = 0
+        self._notify = Inotify.create()
+        if (self._notify is not None
+                and self._notify.add_watch(self.projects_root,
+                                           _ROOT_MASK) is None):
+            self._notify.close()
+            self._notify = None
+
+    # -- discovery --------------------------------------------------------
+
+    def _project_dirs(self):
+        try:
+            return [e.path for e in os.scandir(self.projects_root)
+                    if e.is_dir()]
+        except OSError:
+            return []
+
+    def _list_dir(self, project_dir):
+        """Transcripts in ``project_dir``, re-listed only when it changed."""
+        try:
+            mtime = os.stat(project_dir).st_mtime
+        except OSError:
+            self._dir_mtimes.pop(project_dir, None)
+            self._dir_files.pop(project_dir, None)
+            return [], False
+        if self._dir_mtimes.get(project_dir) == mtime:
+            return self._dir_files[project_dir], False
+        try:
+            files = [e.path for e in os.scandir(project_dir)
+                     if e.name.endswith(".jsonl")]
+        except OSError:
+            files = []
+        self._dir_mtimes[project_dir] = mtime
+        self._dir_files[project_dir] = files
+        return files, True
+
+    def _scan(self, sweep):
+        """Record recently written transcripts in ``_activity``.
+
+        Only listings that changed are stat'ed, plus, with ``sweep``, the
+        projects that have a recently written transcript.
+        """
+        cutoff = time.time() - self.idle_timeout
+        active = ({os.path.dirname(p) for p in self._activity} if sweep
+                  else ())
+        for project_dir in self._project_dirs():
+            if self._notify is not None:
+                self._notify.add_watch(project_dir, _PROJECT_MASK)
+            files, changed = self._list_dir(project_dir)
+            if not (changed or project_dir in active):
+                continue
+            for path in files:
+                try:
+                    mtime = os.stat(path).st_mtime
+                except OSError:
+                    continue
+                if mtime > cutoff:
+                    self._activity[path] = max(mtime,
+                                               self._activity.get(path, 0))
+
+    def _drain_notify(self):
+        now = time.time()
+        for path, mask in self._notify.read_events():
+            if mask & IN_Q_OVERFLOW:
+                self._rescan = True
+                continue
+            parent, name = os.path.split(path)
+            if parent == self.projects_root:
+                if mask & IN_ISDIR:
+                    # New project: watch it and pick up sessions already
+                    # written before the watch existed
+                    self._notify.add_watch(path, _PROJECT_MASK)
+                    self._rescan = True
+                continue
+            if mask & IN_ISDIR or not name.endswith(".jsonl"):
+                continue
+            if mask & (IN_DELETE | IN_MOVED_FROM):
+                self._activity.pop(path, None)
+                continue
+            if mask & IN_CREATE:
+                self._created.add(path)
+            self._activity[path] = now
+            if path in self.sessions:
+                self._dirty.add(path)
+
+    # -- promotion --------------------------------------------------------
+
+    def _label(self, path):
+        project_dir = os.path.dirname(path)
+        label = self._labels.get(project_dir)
+        if label is None:
+            cwd = read_cwd(path)
+            label = (os.path.basename(cwd.rstrip("/")) if cwd
+                     else os.path.basename(project_dir).rsplit("-", 1)[-1])
+            self._labels[project_dir] = label
+        return label
+
+    def _session_key(self, path):
+        base = os.path.basename(path)[:-len(".jsonl")]
+        used = set(self.sessions.values())
+        key = base[:8]
+        n = 2
+        while key in used:
+            key = f"{base[:8]}-{n}"
+            n += 1
+        return key
+
+    def _promote(self, path):
+        key = self._session_key(path)
+        self.sessions[path] = key
+        if path in self._created:
+            self._tails.track(path, from_end=False)
+        events = [{"event": "session_start", "session": key,
+                   "label": self._label(path)}]
+        events.extend(self._read_new_lines(path, f"{key}:main"))
+        return events
+
+    def _demote(self, path):
+        key = self.sessions.pop(path)
+        self._tails.discard(path)
+        self._created.discard(path)
+        self._dirty.discard(path)
+        return {"event": "session_end", "session": key}
+
+    def _rebalance(self, now):
+        events = []
+        cutoff = now - self.idle_timeout
+        for path, last in list(self._activity.items()):
+            if last < cutoff:
+                del self._activity[path]
+                self._created.discard(path)
+        for path in list(self.sessions):
+            if path not in self._activity:
+                events.append(self._demote(path))
+
+        waiting = sorted(((t, p) for p, t in self._activity.items()
+                          if p not in self.sessions), reverse=True)
+        for last, path in waiting:
+            if len(self.sessions) >= self.max_sessions:
+                victim = min(self.sessions, key=self._activity.__getitem__)
+                idle_since = self._activity[victim]
+                if idle_since >= last or now - idle_since < _DISPLACE_IDLE:
+                    break
+                events.append(self._demote(victim))
+            events.extend(self._promote(path))
+        return events
+
+    # -- polling ----------------------------------------------------------
+
+    def poll(self):
+        mono = time.monotonic()
+        if self._notify is not None:
+            self._drain_notify()
+            if self._rescan:
+                self._rescan = False
+                self._scan(sweep=True)
+        elif mono - self._last_scan >= _SCAN_INTERVAL:
+            self._last_scan = mono
+            sweep = mono - self._last_sweep >= _SWEEP_INTERVAL
+            if sweep:
+                self._last_sweep = mono
+            self._scan(sweep)
+
+        now = time.time()
+        events = self._rebalance(now)
+
+        if self._notify is not None:
+            paths = self._dirty
+            self._dirty = set()
+        else:
+            paths = self.sessions
+        for path in list(paths):
+            key = self.sessions.get(path)
+            if key is None:
+                continue
+            new = self._read_new_lines(path, f"{key}:main")
+            if new and self._notify is None:
+                self._activity[path] = now
+            events.extend(new)
+        return events
+
+    def get_status(self):
+        if not self.sessions:
+            return "No active sessions"
+        return f"Sessions: {len(self.sessions)} active"
+
+    def fileno(self):
+        return self._notify.fileno() if self._notify is not None else None
@@ -3,6 +3,11 @@ import json
 import glob
 import time
 from office.watchers import BaseWatcher
+from office.watchers.tail import TailPool
+
+# Number of newest day partitions searched for the active rollout; two
+# covers a session that started before midnight.
+_SCAN_PARTITIONS = 2
 
 
 class CodexWatcher(BaseWatcher):
@@ -12,19 +17,76 @@ class CodexWatcher(BaseWatcher):
 
     def __init__(self):
         self.sessions_root = os.path.expanduser("~/.codex/sessions")
-        self.file_position = 0
         self.current_file = None
+        self._tails = TailPool(max_open=1)
         self._last_scan = 0
         self._scan_interval = 2.0
         self._saw_tool_activity = False
+        self._dir_cache = {}  # dir -> (mtime, names newest first)
+
+    def _listdir(self, path):
+        """List ``path``, re-reading it only when its mtime changed."""
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            self._dir_cache.pop(path, None)
+            return []
+        cached = self._dir_cache.get(path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        try:
+            names = sorted(os.listdir(path), reverse=True)
+        except OSError:
+            names = []
+        self._dir_cache[path] = (mtime, names)
+        return names
+
+    def _newest_partitions(self):
+        """Yield day directories (YYYY/MM/DD), newest first."""
+        for year in self._listdir(self.sessions_root):
+            if not year.isdigit():
+                continue
+            year_dir = os.path.join(self.sessions_root, year)
+            for month in self._listdir(year_dir):
+                if not month.isdigit():
+                    continue
+                month_dir = os.path.join(year_dir, month)
+                for day in self._listdir(month_dir):
+                    if day.isdigit():
+                        yield os.path.join(month_dir, day)
 
     def _find_latest_rollout(self):
-        """Find the most recently modified rollout-*.jsonl file."""
-        pattern = os.path.join(self.sessions_root, "**", "rollout-*.jsonl")
-        files = glob.glob(pattern, recursive=True)
-        if not files:
-            return None
-        return max(files, key=os.path.getmtime)
+        """Find the most recently modified rollout-*.jsonl file.
+
+        Codex partitions sessions by date, so only the newest day
+        directories (plus the file we're already following) can hold the
+        active session.  Directory listings are cached by mtime, making a
+        scan cost the same however much history has piled up.
+        """
+        candidates = []
+        for i, day_dir in enumerate(self._newest_partitions()):
+            if i == _SCAN_PARTITIONS:
+                break
+            candidates.extend(
+                os.path.join(day_dir, name) for name in self._listdir(day_dir)
+                if name.startswith("rollout-") and name.endswith(".jsonl"))
+        if not candidates and not self.current_file:
+            # Unrecognised layout: fall back to a full recursive search
+            pattern = os.path.join(self.sessions_root, "**",
+                                   "rollout-*.jsonl")
+            candidates = glob.glob(pattern, recursive=True)
+        if self.current_file:
+            candidates.append(self.current_file)
+
+        best, best_mtime = None, -1
+        for path in candidates:
+            try:
+                mtime = os.path.getmtime(path)
+            except OSError:
+                continue
+            if mtime > best_mtime:
+                best, best_mtime = path, mtime
+        return best
 
     def poll(self):
         now = time.monotonic()
@@ -32,35 +94,29 @@ class CodexWatcher(BaseWatcher):
             self._last_scan = now
             latest = self._find_latest_rollout()
             if latest and latest != self.current_file:
+                if self.current_file:
+                    self._tails.discard(self.current_file)
                 self.current_file = latest
                 # Skip to end on first encounter
-                try:
-                    self.file_position = os.path.getsize(latest)
-                except OSError:
-                    self.file_position = 0
+                self._tails.track(latest, from_end=True)
+                self._tails.read_lines(latest)
                 return []
 
         if not self.current_file:
             return []
 
         events = []
-        try:
-            with open(self.current_file, "r") as f:
-                f.seek(self.file_position)
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    try:
-                        record = json.loads(line)
-                        event = self._parse_record(record)
-                        if event:
-                            events.append(event)
-                    except json.JSONDecodeError:
-                        pass
-                self.file_position = f.tell()
-        except (FileNotFoundError, OSError):
-            pass
+        for line in self._tails.read_lines(self.current_file):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            event = self._parse_record(record)
+            if event:
+                events.append(event)
         return events
 
     def _parse_record(self, record):
@@ -111,3 +167,6 @@ class CodexWatcher(BaseWatcher):
             basename = os.path.basename(self.current_file)
             return f"Codex: {basename[:20]}"
         return "Codex: no session found"
+
+    def close(self):
+        self._tails.close()
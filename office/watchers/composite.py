@@ -0,0 +1,104 @@
+"""Run several watchers at once and merge their events.
+
+Each source polls on its own ``ThreadedWatcher`` thread at its own pace,
+so a locked SQLite database never holds back a JSONL source.  Events are
+tagged with their source: agent ids become ``"<tag>:<agent>"`` and every
+single-session source is announced as a session of its own, so App lays
+each source out as a separate team.  Multi-session sources (e.g.
+``--all-sessions``) keep their own sessions, namespaced under the tag.
+
+Per frame the queued events of all sources are merged into one stream
+ordered by the time each source produced them.  With ``threaded=False``
+(headless runs) the sources are instead polled in turn from ``poll()``,
+so a run depends on nothing but the frames it is driven with.
+"""
+import heapq
+
+from office.watchers import BaseWatcher
+from office.watchers.threaded import ThreadedWatcher, Wakeup
+
+
+def _namespace(tag, event):
+    event = dict(event)
+    event["agent_id"] = f"{tag}:{event.get('agent_id', 'main')}"
+    for key in ("session", "subagent_id"):
+        if key in event:
+            event[key] = f"{tag}:{event[key]}"
+    return event
+
+
+class _Inline:
+    """The ThreadedWatcher interface CompositeWatcher uses, polling
+    ``inner`` on the caller's thread."""
+
+    def __init__(self, inner):
+        self.inner = inner
+        self.SOURCE_NAME = inner.SOURCE_NAME
+        self.max_sessions = inner.max_sessions
+
+    def drain(self):
+        # One poll per frame: equal stamps keep the sources in order
+        return [(0.0, event) for event in self.inner.poll()]
+
+    def get_status(self):
+        return self.inner.get_status()
+
+    def join(self, timeout=None):
+        return True
+
+    def close(self):
+        self.inner.close()
+
+
+class CompositeWatcher(BaseWatcher):
+    """Merge the events of ``sources``, a list of ``(tag, watcher)``."""
+
+    def __init__(self, sources, backpressure="block", threaded=True):
+        if threaded:
+            # One self-pipe for all sources, so App waits on a single fd
+            self.wakeup = Wakeup()
+            self.sources = [
+                (tag, ThreadedWatcher(w, backpressure=backpressure,
+                                      wakeup=self.wakeup))
+                for tag, w in sources]
+        else:
+            self.wakeup = None
+            self.sources = [(tag, _Inline(w)) for tag, w in sources]
+        self.SOURCE_NAME = " + ".join(w.SOURCE_NAME
+                                      for _, w in self.sources)
+        self.max_sessions = sum(max(1, w.max_sessions)
+                                for _, w in self.sources)
+        # Single-session sources become one session each, named by tag
+        self._pending = [
+            {"event": "session_start", "session": tag, "label": tag}
+            for tag, w in self.sources if not w.max_sessions
+        ]
+
+    def poll(self):
+        if self.wakeup is not None:
+            self.wakeup.clear()
+        events, self._pending = self._pending, []
+        streams = []
+        for tag, watcher in self.sources:
+            items = watcher.drain()
+            if items:
+                streams.append([(ts, _namespace(tag, event))
+                                for ts, event in items])
+        for _, event in heapq.merge(*streams, key=lambda item: item[0]):
+            events.append(event)
+        return events
+
+    def fileno(self):
+        return self.wakeup.fileno() if self.wakeup is not None else None
+
+    def get_status(self):
+        return " | ".join(f"{tag}: {w.get_status()}"
+                          for tag, w in self.sources)
+
+    def close(self):
+        for _, watcher in self.sources:
+            watcher.close()
+        # A source still stuck in a poll could set the pipe later
+        if self.wakeup is not None and all(
+                watcher.join(timeout=0) for _, watcher in self.sources):
+            self.wakeup.close()
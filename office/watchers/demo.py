@@ -12,15 +12,16 @@ class DemoWatcher(BaseWatcher):
 
     SOURCE_NAME = "DEMO"
 
-    def __init__(self):
-        self.next_event = time.monotonic() + 1.5
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self.next_event = clock() + 1.5
         self.sub_count = 0
         self.max_subs = 3
         self.active_tools = {}  # agent_id -> tool
         self.sub_alive = set()
 
     def poll(self):
-        now = time.monotonic()
+        now = self.clock()
         if now < self.next_event:
             return []
 
@@ -51,7 +52,7 @@ class DemoWatcher(BaseWatcher):
 
         elif r < 0.48 and self.sub_alive:
             # A subagent uses a tool
-            sub_id = random.choice(list(self.sub_alive))
+            sub_id = random.choice(sorted(self.sub_alive))
             tool = random.choice([t for t in DEMO_TOOLS if t != "Task"])
             events.append({
                 "event": "tool_start",
@@ -71,7 +72,7 @@ class DemoWatcher(BaseWatcher):
 
         elif r < 0.72 and self.sub_alive and len(self.sub_alive) > 1:
             # A subagent finishes
-            sub_id = random.choice(list(self.sub_alive))
+            sub_id = random.choice(sorted(self.sub_alive))
             events.append({
                 "event": "turn_end",
                 "agent_id": sub_id,
@@ -83,7 +84,7 @@ class DemoWatcher(BaseWatcher):
             # Agent needs help (waiting for user)
             agent_id = "main"
             if self.sub_alive and random.random() < 0.3:
-                agent_id = random.choice(list(self.sub_alive))
+                agent_id = random.choice(sorted(self.sub_alive))
             events.append({
                 "event": "waiting",
                 "agent_id": agent_id,
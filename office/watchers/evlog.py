@@ -0,0 +1,223 @@
+"""Record and play back the normalized event stream.
+
+``RecordingWatcher`` wraps the watcher that feeds App and appends every
+event its ``poll()`` returns to an ``.evlog`` file, stamped with the
+monotonic time since recording started.  ``EvlogWatcher`` plays such a
+file back with the original pacing (optionally sped up), so a rendering
+or performance problem can be reproduced without the transcripts or
+databases it came from, and benchmarks get a deterministic input.
+
+File format (little-endian)::
+
+    header:  b"EVLOG" u8 version, u16 max_sessions, u8 len, source name
+    record:  u32 length, then length bytes of:
+             f64 seconds, u8 event type (EVENT_TYPES index), u8 n fields,
+             n * (u8 len, key, u8 tag, value)
+
+Values are tagged ``s`` (u32 len + UTF-8), ``i`` (i64), ``f`` (f64) or
+``b`` (u8).  A truncated final record (recorder killed mid-write) is
+ignored on playback.
+"""
+import struct
+import time
+
+from office.watchers import BaseWatcher, EVENT_TYPES
+from office.watchers.replay import ReplayWatcher, parse_seek
+
+MAGIC = b"EVLOG"
+VERSION = 1
+
+_HEADER = struct.Struct("<5sBHB")
+_LENGTH = struct.Struct("<I")
+_RECORD = struct.Struct("<dBB")
+_U8 = struct.Struct("<B")
+_U32 = struct.Struct("<I")
+_I64 = struct.Struct("<q")
+_F64 = struct.Struct("<d")
+
+_TYPE_CODES = {name: i for i, name in enumerate(EVENT_TYPES)}
+
+
+def _key(key):
+    raw = key.encode("utf-8")
+    return _U8.pack(len(raw)) + raw
+
+
+def encode_record(event, ts):
+    """Bytes for one event (length prefix included), or None if the
+    event type is unknown."""
+    code = _TYPE_CODES.get(event.get("event"))
+    if code is None:
+        return None
+    fields = []
+    for key, value in event.items():
+        if key == "event":
+            continue
+        if isinstance(value, bool):
+            fields.append(_key(key) + b"b" + _U8.pack(value))
+        elif isinstance(value, int):
+            fields.append(_key(key) + b"i" + _I64.pack(value))
+        elif isinstance(value, float):
+            fields.append(_key(key) + b"f" + _F64.pack(value))
+        else:
+            raw = str(value).encode("utf-8")
+            fields.append(_key(key) + b"s" + _U32.pack(len(raw)) + raw)
+    payload = _RECORD.pack(ts, code, len(fields)) + b"".join(fields)
+    return _LENGTH.pack(len(payload)) + payload
+
+
+def decode_record(payload):
+    """``(seconds, event)`` from a record's payload."""
+    ts, code, count = _RECORD.unpack_from(payload)
+    pos = _RECORD.size
+    event = {"event": EVENT_TYPES[code]}
+    for _ in range(count):
+        klen = payload[pos]
+        key = payload[pos + 1:pos + 1 + klen].decode("utf-8")
+        pos += 1 + klen
+        tag = payload[pos:pos + 1]
+        pos += 1
+        if tag == b"s":
+            (slen,) = _U32.unpack_from(payload, pos)
+            pos += 4
+            event[key] = payload[pos:pos + slen].decode("utf-8")
+            pos += slen
+        elif tag == b"i":
+            (event[key],) = _I64.unpack_from(payload, pos)
+            pos += 8
+        elif tag == b"f":
+            (event[key],) = _F64.unpack_from(payload, pos)
+            pos += 8
+        elif tag == b"b":
+            event[key] = bool(payload[pos])
+            pos += 1
+        else:
+            raise ValueError(f"bad field tag {tag!r}")
+    return ts, event
+
+
+class RecordingWatcher(BaseWatcher):
+    """Pass ``inner``'s events through, appending them to ``path``."""
+
+    def __init__(self, inner, path, clock=time.monotonic):
+        self.inner = inner
+        self.path = path
+        self.clock = clock
+        self.SOURCE_NAME = getattr(inner, "SOURCE_NAME",
+                                   BaseWatcher.SOURCE_NAME)
+        self.max_sessions = getattr(inner, "max_sessions", 0)
+        self.recorded = 0
+        self._start = clock()
+        self._file = open(path, "wb")
+        name = self.SOURCE_NAME.encode("utf-8")[:255]
+        self._file.write(_HEADER.pack(MAGIC, VERSION, self.max_sessions,
+                                      len(name)) + name)
+
+    def poll(self):
+        events = self.inner.poll()
+        if events:
+            ts = self.clock() - self._start
+            for event in events:
+                record = encode_record(event, ts)
+                if record is not None:
+                    self._file.write(record)
+                    self.recorded += 1
+            # A crash or kill loses at most the batch being written
+            self._file.flush()
+        return events
+
+    def fileno(self):
+        return self.inner.fileno()
+
+    def get_status(self):
+        return f"{self.inner.get_status()} [rec {self.recorded}]"
+
+    def close(self):
+        try:
+            self._file.close()
+        finally:
+            self.inner.close()
+
+
+def read_header(f):
+    """``(source name, max_sessions)`` from an open evlog file."""
+    head = f.read(_HEADER.size)
+    if len(head) < _HEADER.size:
+        raise ValueError("not an evlog file")
+    magic, version, max_sessions, name_len = _HEADER.unpack(head)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("not an evlog file")
+    return f.read(name_len).decode("utf-8", "replace"), max_sessions
+
+
+class EvlogWatcher(ReplayWatcher):
+    """Play back an ``.evlog`` with its recorded pacing.
+
+    ``speed``, ``max_gap`` and ``seek`` work as for transcript replay,
+    except that recordings carry no wall-clock times: seeking to an ISO
+    time raises ValueError.  The title and desk rows are those of the
+    recorded source.
+    """
+
+    def __init__(self, path, speed=1.0, max_gap=None, seek=None,
+                 clock=time.monotonic):
+        self.path = path
+        self.speed = speed
+        self.max_gap = max_gap
+        self.clock = clock
+        self._error = None
+        try:
+            with open(path, "rb") as f:
+                source, self.max_sessions = read_header(f)
+        except (OSError, ValueError) as exc:
+            source, self._error = "EVLOG", str(exc)
+        self.SOURCE_NAME = f"{source} (PLAYBACK)"
+        self._init_state()
+        self._target = None
+        if seek is not None:
+            kind, value = parse_seek(seek)
+            if kind != "offset":
+                raise ValueError("an evlog can only seek by seconds")
+            self._target = value
+        self._records = self._iter_records()
+        self._next = None
+        self._clock = None
+        self._last = None
+        self._skew = 0.0
+        self._done = False
+
+    def _iter_records(self, start=0):
+        """Yield ``(seconds, events)``, one batch per recorded poll."""
+        if self._error:
+            return
+        with open(self.path, "rb") as f:
+            read_header(f)
+            batch_ts, batch = None, []
+            while True:
+                head = f.read(_LENGTH.size)
+                if len(head) < _LENGTH.size:
+                    break
+                (length,) = _LENGTH.unpack(head)
+                payload = f.read(length)
+                if len(payload) < length:
+                    break
+                try:
+                    ts, event = decode_record(payload)
+                except (ValueError, IndexError, struct.error):
+                    break
+                if batch and ts != batch_ts:
+                    yield batch_ts, batch
+                    batch = []
+                batch_ts = ts
+                batch.append(event)
+            if batch:
+                yield batch_ts, batch
+
+    def get_status(self):
+        if self._error:
+            return f"Cannot play {self.path}: {self._error}"
+        if self._done:
+            return "Playback finished"
+        if self._last is None:
+            return f"Playback {self.speed:g}x"
+        return f"Playback {self.speed:g}x @ {self._last + self._skew:.1f}s"
@@ -0,0 +1,138 @@
+"""Minimal ctypes binding to Linux inotify.
+
+Lets watchers learn about new and growing transcript files as they happen
+instead of re-globbing and re-stat'ing whole directories on a timer.
+``Inotify.create()`` returns None where inotify is unavailable (non-Linux,
+no libc symbol, watch limit exhausted) so callers can fall back to polling.
+"""
+import ctypes
+import ctypes.util
+import errno
+import os
+import struct
+import sys
+
+IN_MODIFY = 0x00000002
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+
+# struct inotify_event { int wd; uint32 mask, cookie, len; char name[]; }
+_EVENT = struct.Struct("iIII")
+_READ_SIZE = 64 * 1024
+
+_libc = None
+
+
+def _load_libc():
+    global _libc
+    if _libc is None:
+        name = ctypes.util.find_library("c") or "libc.so.6"
+        libc = ctypes.CDLL(name, use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p,
+                                           ctypes.c_uint32]
+        libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        _libc = libc
+    return _libc
+
+
+class Inotify:
+    """A non-blocking inotify instance with path bookkeeping.
+
+    ``read_events()`` returns ``(path, mask)`` tuples where ``path`` is
+    the full path of the affected entry (the watched directory joined with
+    the event name).  An ``IN_Q_OVERFLOW`` event is reported with a path
+    of None; callers should treat it as "rescan everything".
+    """
+
+    def __init__(self, fd, libc):
+        self._fd = fd
+        self._libc = libc
+        self._paths = {}  # wd -> watched path
+        self._wds = {}    # watched path -> wd
+
+    @classmethod
+    def create(cls):
+        if not sys.platform.startswith("linux"):
+            return None
+        try:
+            libc = _load_libc()
+            fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        except (OSError, AttributeError):
+            return None
+        if fd < 0:
+            return None
+        return cls(fd, libc)
+
+    def fileno(self):
+        return self._fd
+
+    def add_watch(self, path, mask):
+        """Watch ``path``; returns the watch descriptor or None."""
+        if path in self._wds:
+            return self._wds[path]
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), mask)
+        if wd < 0:
+            return None
+        self._paths[wd] = path
+        self._wds[path] = wd
+        return wd
+
+    def rm_watch(self, path):
+        wd = self._wds.pop(path, None)
+        if wd is None:
+            return
+        self._paths.pop(wd, None)
+        self._libc.inotify_rm_watch(self._fd, wd)
+
+    def is_watched(self, path):
+        return path in self._wds
+
+    def read_events(self):
+        events = []
+        while True:
+            try:
+                buf = os.read(self._fd, _READ_SIZE)
+            except BlockingIOError:
+                break
+            except OSError as e:
+                if e.errno == errno.EINTR:
+                    continue
+                break
+            if not buf:
+                break
+            offset = 0
+            while offset + _EVENT.size <= len(buf):
+                wd, mask, _cookie, length = _EVENT.unpack_from(buf, offset)
+                offset += _EVENT.size
+                name = buf[offset:offset + length].rstrip(b"\0")
+                offset += length
+                if mask & IN_Q_OVERFLOW:
+                    events.append((None, mask))
+                    continue
+                base = self._paths.get(wd)
+                if base is None:
+                    continue
+                if mask & IN_IGNORED:
+                    # Watch removed by the kernel (directory deleted)
+                    self._paths.pop(wd, None)
+                    self._wds.pop(base, None)
+                    continue
+                path = os.path.join(base, os.fsdecode(name)) if name else base
+                events.append((path, mask))
+        return events
+
+    def close(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+        self._paths.clear()
+        self._wds.clear()
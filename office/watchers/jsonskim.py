@@ -0,0 +1,175 @@
+"""Selective, lazy decoding of large JSON records.
+
+Transcript lines can carry megabytes of tool output that we never look
+at.  These helpers walk raw JSON bytes just far enough to reach the keys
+we care about: values that are passed over are skipped by searching for
+their closing quote or bracket (no Python objects are built for them)
+and anything after the last wanted key is never touched at all.
+
+All functions take the raw ``bytes`` and a position pointing at the
+first byte of a value; malformed input raises ``ValueError``, including
+input that ends early (a partly flushed line): the byte-at-a-time walks
+don't check bounds on every step, so running off the end is caught once
+per call instead and reported the same way (``reports_truncation`` does
+the same for callers that index the buffer themselves).
+"""
+import functools
+import json
+import re
+
+_WS = re.compile(rb"[ \t\r\n]*")
+_SCALAR = re.compile(rb"[^,:\]}\s]+")
+# Next string or bracket, for skipping nested containers
+_STRUCT = re.compile(rb'["\[\]{}]')
+
+_QUOTE = ord('"')
+_LBRACE = ord("{")
+_RBRACE = ord("}")
+_LBRACKET = ord("[")
+_RBRACKET = ord("]")
+_COMMA = ord(",")
+_COLON = ord(":")
+_BACKSLASH = ord("\\")
+
+
+def reports_truncation(func):
+    """Report running off the end of the buffer as ValueError; for code
+    that indexes raw JSON at positions these helpers return."""
+    @functools.wraps(func)
+    def wrapper(*args):
+        try:
+            return func(*args)
+        except IndexError:
+            raise ValueError("truncated JSON") from None
+    return wrapper
+
+
+def _ws(buf, pos):
+    return _WS.match(buf, pos).end()
+
+
+def _skip_string(buf, pos):
+    # memchr for each quote; only escaped quotes cost a Python iteration
+    find = buf.find
+    i = pos + 1
+    while True:
+        q = find(b'"', i)
+        if q < 0:
+            raise ValueError("unterminated string")
+        b = q - 1
+        while buf[b] == _BACKSLASH:
+            b -= 1
+        if (q - 1 - b) % 2 == 0:
+            return q + 1
+        i = q + 1
+
+
+@reports_truncation
+def skip_value(buf, pos):
+    """Return the position just past the value starting at ``pos``."""
+    c = buf[pos]
+    if c == _QUOTE:
+        return _skip_string(buf, pos)
+    if c == _LBRACE or c == _LBRACKET:
+        depth = 0
+        search = _STRUCT.search
+        while True:
+            m = search(buf, pos)
+            if m is None:
+                raise ValueError("unterminated container")
+            tok = buf[m.start()]
+            if tok == _QUOTE:
+                pos = _skip_string(buf, m.start())
+                continue
+            pos = m.end()
+            if tok == _LBRACE or tok == _LBRACKET:
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    return pos
+    m = _SCALAR.match(buf, pos)
+    if m is None:
+        raise ValueError("bad value")
+    return m.end()
+
+
+def decode_value(buf, pos):
+    """Fully decode the value starting at ``pos``."""
+    return json.loads(buf[pos:skip_value(buf, pos)])
+
+
+@reports_truncation
+def find_keys(buf, pos, keys):
+    """Map each of ``keys`` (bytes) present in the object at ``pos`` to
+    its value position.  Stops scanning once every key has been seen.
+    """
+    if buf[pos] != _LBRACE:
+        raise ValueError("not an object")
+    found = {}
+    want = len(keys)
+    pos = _ws(buf, pos + 1)
+    if buf[pos] == _RBRACE:
+        return found
+    while True:
+        if buf[pos] != _QUOTE:
+            raise ValueError("bad key")
+        end = _skip_string(buf, pos)
+        key = buf[pos + 1:end - 1]
+        pos = _ws(buf, end)
+        if buf[pos] != _COLON:
+            raise ValueError("expected ':'")
+        pos = _ws(buf, pos + 1)
+        if key in keys and key not in found:
+            found[key] = pos
+            if len(found) == want:
+                return found
+        pos = _ws(buf, skip_value(buf, pos))
+        c = buf[pos]
+        if c == _RBRACE:
+            return found
+        if c != _COMMA:
+            raise ValueError("expected ',' or '}'")
+        pos = _ws(buf, pos + 1)
+
+
+def find_key(buf, pos, key):
+    """Value position of ``key`` in the object at ``pos``, or -1."""
+    return find_keys(buf, pos, (key,)).get(key, -1)
+
+
+def iter_array(buf, pos):
+    """Yield the position of each element of the array at ``pos``."""
+    try:
+        yield from _iter_array(buf, pos)
+    except IndexError:
+        raise ValueError("truncated JSON") from None
+
+
+def _iter_array(buf, pos):
+    if buf[pos] != _LBRACKET:
+        raise ValueError("not an array")
+    pos = _ws(buf, pos + 1)
+    if buf[pos] == _RBRACKET:
+        return
+    while True:
+        yield pos
+        pos = _ws(buf, skip_value(buf, pos))
+        c = buf[pos]
+        if c == _RBRACKET:
+            return
+        if c != _COMMA:
+            raise ValueError("expected ',' or ']'")
+        pos = _ws(buf, pos + 1)
+
+
+@reports_truncation
+def string_at(buf, pos):
+    """Decode the value at ``pos`` if it is a string, else None."""
+    if pos < 0 or buf[pos] != _QUOTE:
+        return None
+    end = _skip_string(buf, pos)
+    raw = buf[pos + 1:end - 1]
+    if b"\\" not in raw:
+        return raw.decode("utf-8")
+    return json.loads(buf[pos:end])
@@ -2,6 +2,7 @@ import os
 import json
 import time
 from office.watchers import BaseWatcher
+from office.watchers.sqlite_db import ReadOnlyDatabase
 
 # Map Kiro tool names to Claude Office display names
 TOOL_NAME_MAP = {
@@ -17,6 +18,29 @@ TOOL_NAME_MAP = {
     "dummy": "Read",
 }
 
+# Newest conversation, its history length, and a fingerprint of the last
+# history entry we have already processed (to spot compaction/rewrites).
+_LATEST_SQL = (
+    "SELECT key, conversation_id, updated_at, "
+    "json_array_length(value, '$.history') AS history_len, "
+    "length(json_extract(value, :seen)) AS seen_len, "
+    "substr(json_extract(value, :seen), 1, 64) AS seen_head "
+    "FROM conversations_v2 ORDER BY updated_at DESC LIMIT 1"
+)
+_FINGERPRINT_SQL = (
+    "SELECT length(entry), substr(entry, 1, 64) FROM ("
+    "SELECT json_extract(value, ?) AS entry FROM conversations_v2 "
+    "WHERE key = ? AND conversation_id = ?)"
+)
+# Upper bound on history entries fetched per poll
+_MAX_NEW_ENTRIES = 64
+
+
+def _history_path(index):
+    if index < 0:
+        return "$.none"  # valid path that never matches
+    return f"$.history[{index}]"
+
 
 class KiroWatcher(BaseWatcher):
     """Watch Kiro CLI SQLite database for conversation activity.
@@ -27,7 +51,11 @@ class KiroWatcher(BaseWatcher):
     progresses, and ``updated_at`` changes on every write.
 
     We poll for the most-recently-updated row, compare history length
-    to detect new entries, and convert them to normalised events.
+    to detect new entries, and convert them to normalised events.  The
+    length and the new entries are read with SQLite's JSON functions, so
+    only new entries are shipped to Python and decoded; a history that
+    shrank or whose last seen entry changed (compaction) is resynced
+    without replaying it.
 
     Subagent tool calls are opaque (not visible in history), so we emit
     spawn_subagent events and let App assign IDs.  Subagent characters
@@ -42,80 +70,163 @@ class KiroWatcher(BaseWatcher):
 
     def __init__(self, db_path=None):
         self.db_path = db_path or self.DB_PATH
+        self._db = ReadOnlyDatabase(self.db_path)
         self._initialized = False
         self._last_poll = 0
         self._poll_interval = 0.5
         self._conv_key = None
         self._conv_id = None
         self._history_len = 0
+        self._history_fp = (None, None)  # (length, head) of last seen entry
         self._last_updated = 0
-
-    def _get_connection(self):
-        import sqlite3
-        if not os.path.exists(self.db_path):
-            return None
-        try:
-            conn = sqlite3.connect(
-                f"file:{self.db_path}?mode=ro", uri=True,
-                check_same_thread=False,
-            )
-            conn.row_factory = sqlite3.Row
-            return conn
-        except sqlite3.Error:
-            return None
+        self._json1 = True
+        # More new entries than one poll fetches are still waiting; they
+        # need no further commit to be read, so don't wait for one
+        self._backlog = False
 
     def poll(self):
+        import sqlite3
         now = time.monotonic()
         if now - self._last_poll < self._poll_interval:
             return []
         self._last_poll = now
 
-        conn = self._get_connection()
+        conn = self._db.connection()
         if conn is None:
             return []
+        if not self._db.changed() and not self._backlog:
+            return []
 
         events = []
         try:
             cur = conn.cursor()
-            cur.execute(
-                "SELECT key, conversation_id, updated_at, value "
-                "FROM conversations_v2 ORDER BY updated_at DESC LIMIT 1"
-            )
-            row = cur.fetchone()
-            if not row:
-                return []
-
-            key = row["key"]
-            conv_id = row["conversation_id"]
-            updated_at = row["updated_at"]
-
-            # Detect conversation switch
-            if key != self._conv_key or conv_id != self._conv_id:
-                self._conv_key = key
-                self._conv_id = conv_id
-                data = json.loads(row["value"])
-                history = data.get("history", [])
-                self._history_len = len(history)
-                self._last_updated = updated_at
-                self._initialized = True
-                return []
-
-            # No update since last poll
-            if updated_at == self._last_updated:
-                return []
+            if self._json1:
+                try:
+                    events = self._poll_incremental(cur)
+                except sqlite3.OperationalError as e:
+                    if "no such function" not in str(e):
+                        raise
+                    # SQLite built without JSON1: decode the whole blob
+                    self._json1 = False
+            if not self._json1:
+                events = self._poll_full(cur)
+        except Exception:
+            # Reconnect and re-query next time rather than miss changes
+            self._db.reset()
+        return events
 
+    def _poll_incremental(self, cur):
+        seen = _history_path(self._history_len - 1)
+        cur.execute(_LATEST_SQL, {"seen": seen})
+        row = cur.fetchone()
+        if not row:
+            return []
+
+        key = row["key"]
+        conv_id = row["conversation_id"]
+        updated_at = row["updated_at"]
+        history_len = row["history_len"] or 0
+
+        # Detect conversation switch
+        if key != self._conv_key or conv_id != self._conv_id:
+            self._conv_key = key
+            self._conv_id = conv_id
+            self._resync(cur, history_len, updated_at)
+            self._initialized = True
+            return []
+
+        # No update since last poll
+        if updated_at == self._last_updated:
+            return []
+
+        if (history_len < self._history_len
+                or (row["seen_len"], row["seen_head"]) != self._history_fp):
+            # History was rewritten (e.g. compacted): don't replay it
+            self._resync(cur, history_len, updated_at)
+            return []
+
+        start = self._history_len
+        end = min(history_len, start + _MAX_NEW_ENTRIES)
+        self._backlog = end < history_len
+        if not self._backlog:
             self._last_updated = updated_at
+        if end <= start:
+            return []
+        cols = ", ".join(f"json_extract(value, '{_history_path(i)}')"
+                         for i in range(start, end))
+        cur.execute(
+            f"SELECT {cols} FROM conversations_v2 "
+            "WHERE key = ? AND conversation_id = ?",
+            (key, conv_id),
+        )
+        entries = cur.fetchone()
+        if not entries:
+            return []
+
+        events = []
+        for text in entries:
+            if text is None:
+                break
+            self._history_len += 1
+            self._history_fp = (len(text), text[:64])
+            try:
+                entry = json.loads(text)
+            except ValueError:
+                continue
+            if isinstance(entry, dict):
+                events.extend(self._parse_entry(entry))
+        return events
+
+    def _resync(self, cur, history_len, updated_at):
+        """Treat the current history as already seen."""
+        self._history_len = history_len
+        self._last_updated = updated_at
+        self._history_fp = (None, None)
+        self._backlog = False
+        if history_len:
+            cur.execute(_FINGERPRINT_SQL, (_history_path(history_len - 1),
+                                           self._conv_key, self._conv_id))
+            row = cur.fetchone()
+            if row:
+                self._history_fp = (row[0], row[1])
+
+    def _poll_full(self, cur):
+        cur.execute(
+            "SELECT key, conversation_id, updated_at, value "
+            "FROM conversations_v2 ORDER BY updated_at DESC LIMIT 1"
+        )
+        row = cur.fetchone()
+        if not row:
+            return []
+
+        key = row["key"]
+        conv_id = row["conversation_id"]
+        updated_at = row["updated_at"]
+
+        # Detect conversation switch
+        if key != self._conv_key or conv_id != self._conv_id:
+            self._conv_key = key
+            self._conv_id = conv_id
             data = json.loads(row["value"])
             history = data.get("history", [])
-            new_entries = history[self._history_len:]
             self._history_len = len(history)
+            self._last_updated = updated_at
+            self._initialized = True
+            return []
 
-            for entry in new_entries:
-                events.extend(self._parse_entry(entry))
-        except Exception:
-            pass
-        finally:
-            conn.close()
+        # No update since last poll
+        if updated_at == self._last_updated:
+            return []
+
+        self._last_updated = updated_at
+        data = json.loads(row["value"])
+        history = data.get("history", [])
+        new_entries = history[self._history_len:]
+        self._history_len = len(history)
+
+        events = []
+        for entry in new_entries:
+            events.extend(self._parse_entry(entry))
         return events
 
     def _parse_entry(self, entry):
@@ -176,3 +287,6 @@ class KiroWatcher(BaseWatcher):
                 return f"Kiro: {self._conv_id[:12]}..."
             return "Kiro: scanning..."
         return "Kiro: DB not found"
+
+    def close(self):
+        self._db.close()
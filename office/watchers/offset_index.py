@@ -0,0 +1,275 @@
+"""Seekable sidecar index of a transcript's interesting records.
+
+One streaming pass over a session JSONL records, for every tool_use,
+tool_result, Task spawn, user prompt and turn end, its byte offset,
+timestamp and kind.  Prompts and turn ends are checkpoints: agent state
+is empty there, so replay can start reading at the checkpoint nearest a
+target time instead of at the top of a multi-GB file.
+
+The index lives in the cache directory and is tied to the transcript by
+inode, size and mtime.  When the transcript has only grown, ``update()``
+indexes just the new tail; if it was truncated or rewritten the index is
+rebuilt.  A watcher that is already tailing the transcript hands its new
+lines to ``extend()`` instead, so the live file isn't read twice; that
+only keeps an index going, it never catches up on a transcript's
+history (replay's ``--seek`` does that with ``update()``).
+
+File layout: a fixed header followed by ``count`` fixed-size entries.
+Entries are appended before the header is rewritten, so an interrupted
+update leaves a valid (shorter) index.
+"""
+import bisect
+import hashlib
+import math
+import os
+import struct
+from array import array
+from datetime import datetime
+
+from office.watchers.jsonskim import find_key, string_at
+from office.watchers.project_index import CACHE_DIR
+
+TOOL_USE = 1
+TOOL_RESULT = 2
+TASK = 3
+PROMPT = 4
+TURN_END = 5
+CHECKPOINTS = (PROMPT, TURN_END)
+
+_MAGIC = b"COIX"
+_VERSION = 1
+# magic, version, inode, indexed size, mtime, entry count
+_HEADER = struct.Struct("<4sHxxQQdQ")
+# offset, timestamp (NaN if the record has none), kind
+_ENTRY = struct.Struct("<QdB7x")
+
+_TOOL_USE_BLOCK = b'{"type":"tool_use"'
+_TASK_NAME = b'"name":"Task"'
+# extend() writes the sidecar once this many entries are pending
+_SAVE_EVERY = 256
+
+
+def _timestamp(line):
+    try:
+        stamp = string_at(line, find_key(line, 0, b"timestamp"))
+    except (ValueError, IndexError):
+        return float("nan")
+    if stamp is None:
+        return float("nan")
+    try:
+        return datetime.fromisoformat(stamp).timestamp()
+    except ValueError:
+        return float("nan")
+
+
+def classify(line):
+    """Index kind of a raw transcript line, or None if it isn't indexed."""
+    try:
+        rec_type = string_at(line, find_key(line, 0, b"type"))
+    except (ValueError, IndexError):
+        return None
+    if rec_type == "assistant":
+        pos = line.find(_TOOL_USE_BLOCK)
+        if pos < 0:
+            return None
+        return TASK if line.find(_TASK_NAME, pos) >= 0 else TOOL_USE
+    if rec_type == "user":
+        return TOOL_RESULT if b'"tool_result"' in line else PROMPT
+    if rec_type == "system" and b'"turn_duration"' in line:
+        return TURN_END
+    return None
+
+
+def index_path_for(path):
+    key = hashlib.sha1(os.path.realpath(path).encode()).hexdigest()[:16]
+    return os.path.join(CACHE_DIR, "index", f"{key}.idx")
+
+
+def indexed_size(path):
+    """Bytes of ``path`` its saved index covers (0 if it has none), read
+    from the index header alone."""
+    try:
+        with open(index_path_for(path), "rb") as f:
+            head = f.read(_HEADER.size)
+        ino = os.stat(path).st_ino
+    except OSError:
+        return 0
+    if len(head) < _HEADER.size:
+        return 0
+    magic, version, index_ino, size, _, _ = _HEADER.unpack(head)
+    if magic != _MAGIC or version != _VERSION or index_ino != ino:
+        return 0
+    return size
+
+
+class OffsetIndex:
+    """Offsets, timestamps and kinds of a transcript's indexed records."""
+
+    def __init__(self, path, index_path=None):
+        self.path = path
+        self.index_path = index_path or index_path_for(path)
+        self._clear()
+        self._ino = 0
+        self._mtime = 0.0
+        self._saved = 0    # entries already in the sidecar
+        self._load()
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def _load(self):
+        try:
+            with open(self.index_path, "rb") as f:
+                head = f.read(_HEADER.size)
+                if len(head) < _HEADER.size:
+                    return
+                magic, version, ino, size, mtime, count = _HEADER.unpack(head)
+                if magic != _MAGIC or version != _VERSION:
+                    return
+                body = f.read(count * _ENTRY.size)
+        except OSError:
+            return
+        if len(body) < count * _ENTRY.size:
+            return
+        for offset, ts, kind in _ENTRY.iter_unpack(body):
+            self._append(offset, ts, kind)
+        self._ino, self._size, self._mtime = ino, size, mtime
+        self._saved = count
+
+    @property
+    def size(self):
+        """Bytes of the transcript the index covers."""
+        return self._size
+
+    def _clear(self):
+        self.offsets = array("Q")
+        self.times = array("d")
+        self.kinds = array("B")
+        # For bisecting: the latest timestamp so far at each entry (so
+        # never decreasing, with NaNs filled in) and the entry numbers of
+        # the checkpoints
+        self._stamps = array("d")
+        self._checkpoints = array("Q")
+        self._size = 0     # bytes of the transcript covered
+
+    def _append(self, offset, ts, kind):
+        if kind in CHECKPOINTS:
+            self._checkpoints.append(len(self.offsets))
+        self.offsets.append(offset)
+        self.times.append(ts)
+        self.kinds.append(kind)
+        last = self._stamps[-1] if self._stamps else -math.inf
+        self._stamps.append(ts if ts > last else last)
+
+    def _index_line(self, line, pos):
+        kind = classify(line)
+        if kind is not None:
+            self._append(pos, _timestamp(line), kind)
+
+    def update(self):
+        """Index whatever the transcript gained since the last update.
+
+        Returns False if the transcript can't be read.
+        """
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return False
+        if (st.st_ino == self._ino and st.st_size == self._size
+                and st.st_mtime == self._mtime):
+            return True
+        if st.st_ino != self._ino or st.st_size < self._size:
+            self._clear()  # replaced or truncated: start over
+        saved = len(self.offsets)
+        start = self._size
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(start)
+                pos = start
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # record still being written
+                    self._index_line(line, pos)
+                    pos += len(line)
+        except OSError:
+            return False
+        self._ino, self._size, self._mtime = st.st_ino, pos, st.st_mtime
+        self._save(0 if start == 0 else saved)
+        return True
+
+    def extend(self, lines, end):
+        """Index complete ``lines`` (without their newlines) that a tail
+        just read, the last one ending at byte ``end``.
+
+        Returns False, indexing nothing, unless the lines continue exactly
+        where the index stops.  New entries are written out every
+        ``_SAVE_EVERY`` entries and by ``flush()``.
+        """
+        start = end - sum(len(line) + 1 for line in lines)
+        if start != self._size:
+            return False
+        if not self._ino:
+            # A new index, started with the transcript's first line
+            try:
+                self._ino = os.stat(self.path).st_ino
+            except OSError:
+                return False
+        pos = start
+        for line in lines:
+            self._index_line(line, pos)
+            pos += len(line) + 1
+        self._size = end
+        if len(self.offsets) - self._saved >= _SAVE_EVERY:
+            self.flush()
+        return True
+
+    def flush(self):
+        """Write out what ``extend()`` added since the last save."""
+        if len(self.offsets) == self._saved:
+            return
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return
+        if st.st_ino != self._ino:
+            return  # replaced under us: the entries are for the old file
+        self._mtime = st.st_mtime
+        self._save(self._saved)
+
+    def _save(self, first_new):
+        """Write entries from ``first_new`` on, then the header."""
+        header = _HEADER.pack(_MAGIC, _VERSION, self._ino, self._size,
+                              self._mtime, len(self.offsets))
+        body = b"".join(
+            _ENTRY.pack(self.offsets[i], self.times[i], self.kinds[i])
+            for i in range(first_new, len(self.offsets)))
+        self._saved = len(self.offsets)
+        try:
+            os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+            mode = "r+b" if first_new and os.path.exists(
+                self.index_path) else "wb"
+            with open(self.index_path, mode) as f:
+                f.seek(_HEADER.size + first_new * _ENTRY.size)
+                f.write(body)
+                f.truncate()
+                f.seek(0)
+                f.write(header)
+        except OSError:
+            pass
+
+    def first_time(self):
+        """Timestamp of the first timestamped record, or None."""
+        for ts in self.times:
+            if ts == ts:  # not NaN
+                return ts
+        return None
+
+    def checkpoint_before(self, when):
+        """Offset of the last checkpoint at or before ``when`` (0 if none).
+
+        Reading from there rebuilds the agent state at ``when``.
+        """
+        # Entries before the first one stamped later than ``when``
+        end = bisect.bisect_right(self._stamps, when)
+        i = bisect.bisect_left(self._checkpoints, end) - 1
+        return self.offsets[self._checkpoints[i]] if i >= 0 else 0
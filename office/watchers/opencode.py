@@ -2,6 +2,7 @@ import os
 import json
 import time
 from office.watchers import BaseWatcher
+from office.watchers.sqlite_db import ReadOnlyDatabase
 
 # Map OpenCode tool names to Claude Office display names
 TOOL_NAME_MAP = {
@@ -19,6 +20,58 @@ TOOL_NAME_MAP = {
     "invalid": "unknown",
 }
 
+# Only the scalars _parse_part looks at are extracted in SQL, so large
+# tool outputs in ``state`` never leave SQLite.  CASE short-circuits, so
+# the per-type fields are only extracted for parts of that type, and a
+# row that isn't valid JSON gets a NULL type (json_extract would raise
+# "malformed JSON" and fail the whole query).
+_PART_SQL = (
+    "SELECT rowid, type, "
+    "CASE WHEN type = 'tool' THEN json_extract(data, '$.callID') END "
+    "AS call_id, "
+    "CASE WHEN type = 'tool' THEN json_extract(data, '$.tool') END AS tool, "
+    "CASE WHEN type = 'tool' THEN json_extract(data, '$.state.status') END "
+    "AS status, "
+    "CASE WHEN type = 'step-finish' THEN json_extract(data, '$.reason') END "
+    "AS reason, "
+    "CASE WHEN type = 'tool' AND json_extract(data, '$.tool') = 'task' "
+    "THEN json_extract(data, '$.state.input.subagent_type') END "
+    "AS subagent_type, "
+    "CASE WHEN type = 'tool' AND json_extract(data, '$.tool') = 'task' "
+    "THEN json_extract(data, '$.state.input.description') END "
+    "AS description, "
+    "CASE WHEN type = 'text' THEN length(trim(coalesce("
+    "nullif(json_extract(data, '$.content'), ''), "
+    "json_extract(data, '$.text'), ''), char(32, 9, 10, 13))) > 0 END "
+    "AS has_text "
+    "FROM (SELECT rowid, data, "
+    "CASE WHEN json_valid(data) THEN json_extract(data, '$.type') END "
+    "AS type FROM part WHERE session_id = ? AND rowid > ?) ORDER BY rowid"
+)
+
+
+def _part_from_row(row):
+    """Rebuild the subset of a part's data dict that _parse_part reads."""
+    data = {"type": row["type"] or ""}
+    for key, col in (("callID", "call_id"), ("tool", "tool"),
+                     ("reason", "reason")):
+        if row[col] is not None:
+            data[key] = row[col]
+    if row["type"] == "tool":
+        state = {}
+        if row["status"] is not None:
+            state["status"] = row["status"]
+        inp = {}
+        for key in ("subagent_type", "description"):
+            if row[key] is not None:
+                inp[key] = row[key]
+        if inp:
+            state["input"] = inp
+        data["state"] = state
+    if row["has_text"]:
+        data["text"] = "..."
+    return data
+
 
 class OpenCodeWatcher(BaseWatcher):
     """Watch OpenCode SQLite database for session activity.
@@ -39,6 +92,7 @@ class OpenCodeWatcher(BaseWatcher):
 
     def __init__(self, db_path=None):
         self.db_path = db_path or self.DB_PATH
+        self._db = ReadOnlyDatabase(self.db_path)
         self._initialized = False
         self._last_poll = 0
         self._poll_interval = 0.5
@@ -52,26 +106,13 @@ class OpenCodeWatcher(BaseWatcher):
         # When OpenCode writes only a completed record (no prior pending),
         # we emit tool_start immediately and queue tool_end for next poll.
         self._deferred_ends = []  # list of {"event": "tool_end", ...}
+        self._json1 = True
         # Note: subagent child sessions are NOT tracked here.
         # Subagents are created via spawn_subagent events and given
         # default tools in App._handle_event. Tracking child sessions
         # would create duplicate characters (watcher and app use
         # separate counters for sub-N IDs).
 
-    def _get_connection(self):
-        import sqlite3
-        if not os.path.exists(self.db_path):
-            return None
-        try:
-            conn = sqlite3.connect(
-                f"file:{self.db_path}?mode=ro", uri=True,
-                check_same_thread=False,
-            )
-            conn.row_factory = sqlite3.Row
-            return conn
-        except sqlite3.Error:
-            return None
-
     def _find_latest_session(self, conn):
         """Find the most recently updated session ID."""
         now = time.monotonic()
@@ -106,10 +147,6 @@ class OpenCodeWatcher(BaseWatcher):
             return []
         self._last_poll = now
 
-        conn = self._get_connection()
-        if conn is None:
-            return []
-
         events = []
 
         # Flush any deferred tool_end events from the previous poll
@@ -117,6 +154,10 @@ class OpenCodeWatcher(BaseWatcher):
             events.extend(self._deferred_ends)
             self._deferred_ends = []
 
+        conn = self._db.connection()
+        if conn is None or not self._db.changed():
+            return events
+
         try:
             session_id = self._find_latest_session(conn)
             if not session_id:
@@ -130,28 +171,48 @@ class OpenCodeWatcher(BaseWatcher):
             # Poll main session only (subagents handled via spawn events)
             cur = conn.cursor()
             for sid, agent_id in [(session_id, "main")]:
-                last_row = self._row_ids.get(sid, 0)
-                cur.execute(
-                    "SELECT rowid, data FROM part "
-                    "WHERE session_id = ? AND rowid > ? ORDER BY rowid",
-                    (sid, last_row),
-                )
-                rows = cur.fetchall()
-                for row in rows:
-                    self._row_ids[sid] = row["rowid"]
-                    try:
-                        data = json.loads(row["data"])
-                    except (json.JSONDecodeError, TypeError):
+                for rowid, data in self._fetch_parts(cur, sid):
+                    self._row_ids[sid] = rowid
+                    if data is None:
                         continue
                     parsed = self._parse_part(data, agent_id)
                     if parsed:
                         events.extend(parsed)
         except Exception:
-            pass
-        finally:
-            conn.close()
+            # Reconnect and re-query next time rather than miss changes
+            self._db.reset()
         return events
 
+    def _fetch_parts(self, cur, session_id):
+        """Return ``(rowid, data)`` for parts newer than the high-water
+        mark; ``data`` is None for rows that can't be decoded."""
+        import sqlite3
+        last_row = self._row_ids.get(session_id, 0)
+        if self._json1:
+            try:
+                cur.execute(_PART_SQL, (session_id, last_row))
+                return [(row["rowid"], _part_from_row(row)
+                         if row["type"] is not None else None)
+                        for row in cur.fetchall()]
+            except sqlite3.OperationalError as e:
+                if "no such function" not in str(e):
+                    raise
+                # SQLite built without JSON1: decode whole rows instead
+                self._json1 = False
+        cur.execute(
+            "SELECT rowid, data FROM part "
+            "WHERE session_id = ? AND rowid > ? ORDER BY rowid",
+            (session_id, last_row),
+        )
+        parts = []
+        for row in cur.fetchall():
+            try:
+                data = json.loads(row["data"])
+            except (json.JSONDecodeError, TypeError):
+                data = None
+            parts.append((row["rowid"], data))
+        return parts
+
     def _parse_part(self, data, agent_id):
         """Parse a part row and return a list of events (usually 0 or 1)."""
         part_type = data.get("type", "")
@@ -244,3 +305,6 @@ class OpenCodeWatcher(BaseWatcher):
                 return f"OpenCode: {self._session_id[:12]}..."
             return "OpenCode: scanning..."
         return "OpenCode: DB not found"
+
+    def close(self):
+        self._db.close()
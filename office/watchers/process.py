@@ -0,0 +1,249 @@
+"""Run a watcher in a worker process.
+
+JSON decoding in busy watchers competes with curses rendering for the
+GIL.  ``ProcessWatcher`` constructs the wrapped watcher in a separate
+process; the worker polls it and writes each event as a fixed-size
+binary record into a ``multiprocessing.shared_memory`` ring buffer.  The
+UI process only unpacks records: nothing is pickled and no pipe is
+involved.
+
+The ring is single-producer/single-consumer.  The worker owns the write
+index and the consumer the read index, each on its own cache line.  When
+the ring is full the worker waits for the UI to catch up, so no event is
+lost.
+
+Python gives no memory-ordering guarantee across processes, so the write
+index alone doesn't prove a slot's payload has landed.  Each slot also
+carries a sequence number, seqlock style: odd while the worker writes
+the slot, ``2 * (index + 1)`` once it is complete.  The consumer copies
+the payload only between two matching reads of the expected value;
+anything else leaves the slot for the next poll.
+"""
+import multiprocessing
+import struct
+import time
+from multiprocessing import shared_memory
+
+from office.watchers import BaseWatcher, EVENT_TYPES
+
+# ts, type code, flags, agent id or session, tool, subagent type,
+# description or label, subagent id
+RECORD = struct.Struct("<dBB6x32s24s24s32s32s")
+_FLAG_BOOTSTRAP = 1
+
+_INDEX = struct.Struct("<Q")
+# Slot: sequence number, then the RECORD
+_SLOT_SIZE = _INDEX.size + RECORD.size
+_WRITE_AT = 0      # producer cache line: write index
+_READ_AT = 64      # consumer cache line: read index
+_STATUS_AT = 128   # producer: status string, length-prefixed
+_STATUS = struct.Struct("<H126s")
+_HEADER = 256
+
+_TYPE_CODES = {name: i for i, name in enumerate(EVENT_TYPES)}
+
+
+def _text(value, size):
+    return str(value or "").encode("utf-8")[:size]
+
+
+def encode_event(event, ts):
+    """Pack ``event`` into a RECORD, or None for unknown event types."""
+    ev_type = event.get("event")
+    code = _TYPE_CODES.get(ev_type)
+    if code is None:
+        return None
+    if ev_type in ("session_start", "session_end"):
+        who = event.get("session")
+    else:
+        who = event.get("agent_id", "main")
+    return RECORD.pack(
+        ts, code, _FLAG_BOOTSTRAP if event.get("bootstrap") else 0,
+        _text(who, 32), _text(event.get("tool"), 24),
+        _text(event.get("subagent_type"), 24),
+        _text(event.get("description") or event.get("label"), 32),
+        _text(event.get("subagent_id"), 32),
+    )
+
+
+def _str(raw):
+    return raw.rstrip(b"\0").decode("utf-8", "ignore")
+
+
+def decode_event(buf, offset=0):
+    """Rebuild the event dict packed at ``offset``."""
+    (_ts, code, flags, who, tool, sub_type, text,
+     sub_id) = RECORD.unpack_from(buf, offset)
+    ev_type = EVENT_TYPES[code]
+    if ev_type in ("session_start", "session_end"):
+        event = {"event": ev_type, "session": _str(who)}
+        if ev_type == "session_start":
+            event["label"] = _str(text)
+        return event
+    event = {"event": ev_type, "agent_id": _str(who)}
+    if ev_type in ("tool_start", "waiting"):
+        event["tool"] = _str(tool)
+    elif ev_type == "spawn_subagent":
+        event["subagent_type"] = _str(sub_type)
+        event["description"] = _str(text)
+        if tool.rstrip(b"\0"):
+            event["tool"] = _str(tool)
+        if sub_id.rstrip(b"\0"):
+            event["subagent_id"] = _str(sub_id)
+    if flags & _FLAG_BOOTSTRAP:
+        event["bootstrap"] = True
+    return event
+
+
+class EventRing:
+    """A fixed-size ring of RECORD slots in shared memory."""
+
+    def __init__(self, shm, capacity):
+        self.shm = shm
+        self.capacity = capacity
+        self.buf = shm.buf
+
+    @classmethod
+    def create(cls, capacity=4096):
+        size = _HEADER + capacity * _SLOT_SIZE
+        shm = shared_memory.SharedMemory(create=True, size=size)
+        shm.buf[:size] = bytes(size)
+        return cls(shm, capacity)
+
+    @classmethod
+    def attach(cls, name, capacity):
+        # Spawned workers share the parent's resource tracker, which
+        # unlinks the segment if the UI dies without cleaning up
+        return cls(shared_memory.SharedMemory(name=name), capacity)
+
+    def _index(self, at):
+        return _INDEX.unpack_from(self.buf, at)[0]
+
+    def _slot(self, index):
+        return _HEADER + (index % self.capacity) * _SLOT_SIZE
+
+    def free(self):
+        return self.capacity - (self._index(_WRITE_AT) - self._index(_READ_AT))
+
+    def put(self, record):
+        """Producer side: store one packed record.  Caller checks free()."""
+        write = self._index(_WRITE_AT)
+        at = self._slot(write)
+        _INDEX.pack_into(self.buf, at, 2 * write + 1)
+        self.buf[at + _INDEX.size:at + _SLOT_SIZE] = record
+        _INDEX.pack_into(self.buf, at, 2 * write + 2)
+        _INDEX.pack_into(self.buf, _WRITE_AT, write + 1)
+
+    def take(self, limit):
+        """Consumer side: decode up to ``limit`` queued events."""
+        read = self._index(_READ_AT)
+        end = min(self._index(_WRITE_AT), read + limit)
+        events = []
+        index = read
+        while index < end:
+            at = self._slot(index)
+            done = 2 * index + 2
+            if self._index(at) != done:
+                break  # payload not visible yet
+            record = bytes(self.buf[at + _INDEX.size:at + _SLOT_SIZE])
+            if self._index(at) != done:
+                break
+            events.append(decode_event(record))
+            index += 1
+        if index != read:
+            _INDEX.pack_into(self.buf, _READ_AT, index)
+        return events
+
+    def set_status(self, status):
+        raw = _text(status, 126)
+        _STATUS.pack_into(self.buf, _STATUS_AT, len(raw), raw)
+
+    def status(self):
+        length, raw = _STATUS.unpack_from(self.buf, _STATUS_AT)
+        return raw[:length].decode("utf-8", "ignore")
+
+    def close(self):
+        self.buf = None
+        self.shm.close()
+
+
+def _worker(factory, kwargs, shm_name, capacity, stop, interval):
+    ring = EventRing.attach(shm_name, capacity)
+    watcher = factory(**kwargs)
+    next_status = 0.0
+    try:
+        while not stop.is_set():
+            try:
+                events = watcher.poll()
+            except Exception:
+                events = []
+            now = time.monotonic()
+            for event in events:
+                record = encode_event(event, now)
+                if record is None:
+                    continue
+                while ring.free() <= 0 and not stop.is_set():
+                    time.sleep(0.005)
+                ring.put(record)
+            if now >= next_status:
+                try:
+                    ring.set_status(watcher.get_status())
+                except Exception:
+                    pass
+                next_status = now + 1.0
+            stop.wait(interval)
+    finally:
+        watcher.close()
+        ring.close()
+
+
+class ProcessWatcher(BaseWatcher):
+    """Run ``factory(**kwargs)`` (a watcher class) in a worker process.
+
+    ``factory`` must be importable by the worker, i.e. a module-level
+    watcher class; the worker is started with the ``spawn`` method so it
+    never inherits the UI's curses state or threads.
+    """
+
+    def __init__(self, factory, kwargs=None, capacity=4096, interval=0.05,
+                 max_events=256):
+        kwargs = kwargs or {}
+        self.SOURCE_NAME = factory.SOURCE_NAME
+        self.max_sessions = kwargs.get("max_sessions", factory.max_sessions)
+        self.max_events = max_events
+        self._ring = EventRing.create(capacity)
+        ctx = multiprocessing.get_context("spawn")
+        self._stop = ctx.Event()
+        self._proc = ctx.Process(
+            target=_worker,
+            args=(factory, kwargs, self._ring.shm.name, capacity,
+                  self._stop, interval),
+            name=f"watcher-{self.SOURCE_NAME.lower()}",
+            daemon=True,
+        )
+        self._proc.start()
+
+    def poll(self):
+        if self._ring is None:
+            return []
+        return self._ring.take(self.max_events)
+
+    def get_status(self):
+        if self._ring is None:
+            return "stopped"
+        if not self._proc.is_alive():
+            return f"worker exited ({self._proc.exitcode})"
+        return self._ring.status() or "starting..."
+
+    def close(self):
+        if self._ring is None:
+            return
+        self._stop.set()
+        self._proc.join(timeout=2.0)
+        if self._proc.is_alive():
+            self._proc.terminate()
+            self._proc.join(timeout=1.0)
+        shm = self._ring.shm
+        self._ring.close()
+        self._ring = None
+        shm.unlink()
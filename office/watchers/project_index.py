@@ -0,0 +1,175 @@
+"""Persistent index of Claude Code project directories.
+
+``~/.claude/projects`` holds one directory per project, named after the
+project path with separators replaced by ``-``.  Finding the project a
+session belongs to (or the most recently active one) used to mean globbing
+every directory and stat'ing every transcript in it.  The index remembers,
+per project directory, its mtime, its newest transcript and the real
+project path (the ``cwd`` recorded in that transcript), and is cached on
+disk between runs.
+
+Refreshing costs one stat per project directory plus one for its newest
+transcript; a directory is only re-listed when its own mtime changed
+(a session file was created, renamed or removed), and only those entries
+are rewritten.
+"""
+import json
+import os
+import re
+
+CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"),
+    "claude_office",
+)
+
+_CWD_RE = re.compile(rb'"cwd"\s*:\s*("(?:[^"\\]|\\.)*")')
+_CWD_SCAN_BYTES = 64 * 1024
+
+
+def read_cwd(path):
+    """The project path recorded near the top of a transcript, if any."""
+    try:
+        with open(path, "rb") as f:
+            head = f.read(_CWD_SCAN_BYTES)
+    except OSError:
+        return None
+    m = _CWD_RE.search(head)
+    if not m:
+        return None
+    try:
+        return json.loads(m.group(1))
+    except ValueError:
+        return None
+
+
+class ProjectIndex:
+    """Map encoded project dir names to real paths and latest activity."""
+
+    VERSION = 1
+
+    def __init__(self, projects_root, cache_path=None):
+        self.projects_root = projects_root
+        self.cache_path = cache_path or os.path.join(CACHE_DIR,
+                                                     "projects.json")
+        self.root_mtime = None
+        self.entries = {}  # dir name -> {dir_mtime, latest, newest, cwd}
+        self._dirty = False
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.cache_path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if (data.get("version") != self.VERSION
+                or data.get("root") != self.projects_root):
+            return
+        self.root_mtime = data.get("root_mtime")
+        self.entries = data.get("entries", {})
+
+    def save(self):
+        if not self._dirty:
+            return
+        data = {
+            "version": self.VERSION,
+            "root": self.projects_root,
+            "root_mtime": self.root_mtime,
+            "entries": self.entries,
+        }
+        tmp = f"{self.cache_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            with open(tmp, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp, self.cache_path)
+            self._dirty = False
+        except OSError:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+
+    def refresh(self):
+        """Bring the index up to date with the projects directory."""
+        try:
+            root_mtime = os.stat(self.projects_root).st_mtime
+        except OSError:
+            return
+        if root_mtime != self.root_mtime:
+            # Projects were added or removed: reconcile the name list
+            try:
+                names = {e.name for e in os.scandir(self.projects_root)
+                         if e.is_dir()}
+            except OSError:
+                return
+            for name in list(self.entries):
+                if name not in names:
+                    del self.entries[name]
+            for name in names - set(self.entries):
+                self.entries[name] = {"dir_mtime": None, "latest": 0,
+                                      "newest": None, "cwd": None}
+            self.root_mtime = root_mtime
+            self._dirty = True
+
+        for name, entry in self.entries.items():
+            self._refresh_entry(name, entry)
+        self.save()
+
+    def _refresh_entry(self, name, entry):
+        path = os.path.join(self.projects_root, name)
+        try:
+            dir_mtime = os.stat(path).st_mtime
+        except OSError:
+            return
+        if dir_mtime != entry["dir_mtime"]:
+            self._rescan_entry(path, entry)
+            entry["dir_mtime"] = dir_mtime
+            self._dirty = True
+            return
+        if not entry["newest"]:
+            return
+        # Same set of files: follow the newest one.  Appends to an older
+        # session are picked up the next time the directory changes.
+        try:
+            mtime = os.stat(os.path.join(path, entry["newest"])).st_mtime
+        except OSError:
+            entry["dir_mtime"] = None  # force a re-list next time
+            return
+        if mtime != entry["latest"]:
+            entry["latest"] = mtime
+            self._dirty = True
+
+    def _rescan_entry(self, path, entry):
+        newest, latest = None, 0
+        try:
+            for e in os.scandir(path):
+                if not e.name.endswith(".jsonl"):
+                    continue
+                try:
+                    mtime = e.stat().st_mtime
+                except OSError:
+                    continue
+                if mtime > latest:
+                    newest, latest = e.name, mtime
+        except OSError:
+            pass
+        if newest and (newest != entry["newest"] or not entry["cwd"]):
+            entry["cwd"] = read_cwd(os.path.join(path, newest))
+        entry["newest"] = newest
+        entry["latest"] = latest
+
+    def find_by_cwd(self, project_path):
+        """Project dir whose transcripts were recorded in ``project_path``."""
+        for name, entry in self.entries.items():
+            if entry["cwd"] == project_path:
+                return os.path.join(self.projects_root, name)
+        return None
+
+    def most_recent(self):
+        """Project dir with the most recently written transcript."""
+        best = max(self.entries.items(), key=lambda kv: kv[1]["latest"],
+                   default=None)
+        if best is None or not best[1]["newest"]:
+            return None
+        return os.path.join(self.projects_root, best[0])
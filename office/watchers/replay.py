@@ -0,0 +1,179 @@
+"""Replay a recorded Claude Code transcript at an accelerated pace.
+
+Records are streamed from the file one line at a time (transcripts can
+be gigabytes) and released once the replay clock reaches their
+``timestamp``.  ``speed`` multiplies the transcript's own pace;
+``max_gap`` shortens any idle stretch longer than that many (transcript)
+seconds, so an overnight run with long pauses plays back in minutes.
+Pacing follows ``clock`` (``time.monotonic`` unless a headless run
+passes its simulated time).
+
+``seek`` starts the replay part-way through: the transcript's offset
+index (see office.watchers.offset_index) gives the nearest turn boundary
+before the target, records from there up to the target are applied at
+once to rebuild the office's state, and pacing starts at the target.
+"""
+import time
+from datetime import datetime
+
+from office.watchers.claude import ClaudeWatcher
+from office.watchers.jsonskim import find_key, string_at
+from office.watchers.offset_index import OffsetIndex
+
+# Events released per poll when the replay falls behind
+_MAX_EVENTS = 256
+
+
+def parse_speed(value):
+    """``"20x"`` or ``"20"`` -> 20.0 (argparse type)."""
+    text = str(value).strip().lower().removesuffix("x")
+    speed = float(text)
+    if speed <= 0:
+        raise ValueError("speed must be positive")
+    return speed
+
+
+def parse_seek(value):
+    """Seconds into the transcript (``"90"``, ``"+90"``) or an ISO time."""
+    try:
+        return ("offset", float(value))
+    except ValueError:
+        pass
+    return ("time", datetime.fromisoformat(value).timestamp())
+
+
+def _epoch(stamp):
+    if not isinstance(stamp, str):
+        return None
+    try:
+        return datetime.fromisoformat(stamp).timestamp()
+    except ValueError:
+        return None
+
+
+class ReplayWatcher(ClaudeWatcher):
+    """Emit the events of a finished transcript, paced by its timestamps.
+
+    Parsing (including skimming of huge records, Task tracking and
+    tool_use dedup) is inherited from ClaudeWatcher.
+    """
+
+    SOURCE_NAME = "REPLAY"
+
+    def __init__(self, path, speed=1.0, max_gap=None, seek=None,
+                 clock=time.monotonic):
+        self.path = path
+        self.speed = speed
+        self.max_gap = max_gap
+        self.clock = clock
+        self._init_state()
+        self._target = None   # records before this are applied at once
+        start = 0
+        if seek is not None:
+            start = self._seek(parse_seek(seek))
+        self._records = self._iter_records(start)
+        self._next = None     # (replay time, events) not yet due
+        self._clock = None    # (clock() at start, replay time at start)
+        self._last = None     # replay time of the last released record
+        self._skew = 0.0      # idle time cut out by max_gap so far
+        self._done = False
+
+    def _seek(self, target):
+        """Resolve a parse_seek() target; returns the offset to start at."""
+        index = OffsetIndex(self.path)
+        if not index.update():
+            return 0
+        kind, value = target
+        if kind == "offset":
+            first = index.first_time()
+            if first is None:
+                return 0
+            value += first
+        self._target = value
+        return index.checkpoint_before(value)
+
+    def _iter_records(self, start=0):
+        """Yield ``(timestamp, events)`` per record, streaming the file."""
+        try:
+            f = open(self.path, "rb")
+        except OSError:
+            return
+        with f:
+            f.seek(start)
+            for line in f:
+                try:
+                    record = self._decode_line(line)
+                except ValueError:
+                    continue
+                if record is None:
+                    continue
+                events = self._record_events(record, "main")
+                if events:
+                    yield self._timestamp(record, line), events
+
+    def _timestamp(self, record, line):
+        stamp = record.get("timestamp")
+        if stamp is None:
+            # Skimmed records only carry the fields we act on
+            try:
+                line = line.strip()
+                stamp = string_at(line, find_key(line, 0, b"timestamp"))
+            except (ValueError, IndexError):
+                stamp = None
+        return _epoch(stamp)
+
+    def _pull(self):
+        """Load the next record and map it onto the (gap-cut) timeline."""
+        item = next(self._records, None)
+        if item is None:
+            self._done = True
+            return None
+        ts, events = item
+        if self._target is not None:
+            if ts is None or ts < self._target:
+                # Catching up to the seek target: state, not animation
+                for event in events:
+                    event["bootstrap"] = True
+                return (None, events)
+            self._target = None
+        if ts is None:
+            return (None, events)  # released as soon as it is reached
+        ts -= self._skew
+        if (self._last is not None and self.max_gap is not None
+                and ts - self._last > self.max_gap):
+            self._skew += ts - self._last - self.max_gap
+            ts = self._last + self.max_gap
+        return (ts, events)
+
+    def poll(self):
+        events = []
+        now = self.clock()
+        while not self._done and len(events) < _MAX_EVENTS:
+            if self._next is None:
+                self._next = self._pull()
+                if self._next is None:
+                    break
+            ts, pending = self._next
+            if ts is not None:
+                if self._clock is None:
+                    self._clock = (now, ts)
+                start, base = self._clock
+                if ts > base + (now - start) * self.speed:
+                    break
+                self._last = ts
+            events.extend(pending)
+            self._next = None
+        return events
+
+    def get_status(self):
+        if self._done:
+            return "Replay finished"
+        if self._last is None:
+            return f"Replay {self.speed:g}x"
+        stamp = time.strftime("%H:%M:%S",
+                              time.localtime(self._last + self._skew))
+        return f"Replay {self.speed:g}x @ {stamp}"
+
+    def close(self):
+        self._records.close()
+        super().close()
@@ -0,0 +1,94 @@
+"""Shared read-only SQLite access for database-backed watchers.
+
+Kiro and OpenCode keep their sessions in SQLite databases written by
+another process.  Rather than opening a fresh connection and re-running
+queries on every poll, ``ReadOnlyDatabase`` keeps one ``query_only``
+connection open and asks SQLite whether anything was committed since the
+last look (``PRAGMA data_version``), so an idle poll costs one pragma.
+The file's identity is re-checked every few seconds and the connection
+is transparently reopened when the database is replaced.
+"""
+import os
+import time
+
+
+class ReadOnlyDatabase:
+    """A long-lived read-only connection with cheap change detection."""
+
+    def __init__(self, path, identity_interval=2.0):
+        self.path = path
+        self._conn = None
+        self._ident = None
+        self._data_version = None
+        self._identity_interval = identity_interval
+        self._last_identity_check = 0
+
+    def _file_ident(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (st.st_dev, st.st_ino)
+
+    def _open(self):
+        import sqlite3
+        ident = self._file_ident()
+        if ident is None:
+            return None
+        try:
+            conn = sqlite3.connect(
+                f"file:{self.path}?mode=ro", uri=True,
+                check_same_thread=False,
+            )
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA query_only = ON")
+        except sqlite3.Error:
+            return None
+        self._ident = ident
+        self._data_version = None
+        return conn
+
+    def connection(self):
+        """Return the open connection, (re)connecting if needed."""
+        now = time.monotonic()
+        if (self._conn is not None
+                and now - self._last_identity_check >= self._identity_interval):
+            self._last_identity_check = now
+            if self._file_ident() != self._ident:
+                # Deleted or replaced (e.g. restored from backup)
+                self.reset()
+        if self._conn is None:
+            self._last_identity_check = now
+            self._conn = self._open()
+        return self._conn
+
+    def changed(self):
+        """True if another connection committed since the last call.
+
+        Always True right after (re)connecting.
+        """
+        import sqlite3
+        if self._conn is None:
+            return False
+        try:
+            version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+        except sqlite3.Error:
+            self.reset()
+            return False
+        if version == self._data_version:
+            return False
+        self._data_version = version
+        return True
+
+    def reset(self):
+        """Drop the connection; the next ``connection()`` reopens it."""
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except Exception:
+                pass
+        self._conn = None
+        self._ident = None
+        self._data_version = None
+
+    close = reset
@@ -0,0 +1,218 @@
+"""Incremental tailing of append-only JSONL files.
+
+Transcripts are written concurrently by the CLI we watch, so a read can
+land in the middle of a record.  ``TailFile`` keeps the descriptor open,
+reads new bytes with ``pread`` and only hands out complete lines; the
+unterminated remainder is carried over until its newline arrives.
+Truncation and replacement of the file (new inode at the same path) are
+detected and restart the tail from the top of the new contents.
+"""
+import mmap
+import os
+from collections import OrderedDict
+
+CHUNK_SIZE = 64 * 1024
+
+
+def _pread_into(fd, view, offset):
+    if hasattr(os, "preadv"):
+        return os.preadv(fd, [view], offset)
+    data = os.pread(fd, len(view), offset)
+    view[:len(data)] = data
+    return len(data)
+
+
+class TailFile:
+    """Tail one file, returning complete lines appended since last read.
+
+    With ``from_end`` the tail starts at the current end of file (we don't
+    replay history); otherwise it starts at offset 0.  An explicit
+    ``offset`` (e.g. where a backwards scan stopped) overrides both.
+    """
+
+    def __init__(self, path, from_end=True, offset=None):
+        self.path = path
+        self.offset = offset
+        self._from_end = from_end
+        self._fd = None
+        self._ident = None  # (st_dev, st_ino) of the open file
+        self._partial = b""
+        self._discard = False  # drop bytes up to the next newline
+
+    @property
+    def is_open(self):
+        return self._fd is not None
+
+    @property
+    def line_end(self):
+        """Offset just past the last complete line handed out."""
+        return self.offset - len(self._partial)
+
+    def _open(self):
+        try:
+            fd = os.open(self.path, os.O_RDONLY | getattr(os, "O_CLOEXEC", 0))
+        except OSError:
+            return False
+        st = os.fstat(fd)
+        ident = (st.st_dev, st.st_ino)
+        if self._ident is None:
+            if self.offset is not None:
+                pass
+            elif self._from_end and st.st_size:
+                self.offset = st.st_size
+                # Started mid-record: skip the fragment before the next \n
+                self._discard = os.pread(fd, 1, st.st_size - 1) != b"\n"
+            else:
+                self.offset = 0
+        elif ident != self._ident:
+            # Reopened after being closed and the file was replaced
+            self._reset()
+        self._fd = fd
+        self._ident = ident
+        return True
+
+    def _reset(self):
+        self.offset = 0
+        self._partial = b""
+        self._discard = False
+
+    def _replaced(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return False
+        return (st.st_dev, st.st_ino) != self._ident
+
+    def read_lines(self, buf):
+        """Read new data using ``buf`` (a bytearray) as scratch space."""
+        if self._fd is None and not self._open():
+            return []
+        try:
+            size = os.fstat(self._fd).st_size
+        except OSError:
+            return []
+        if size < self.offset:
+            # Truncated in place: start over
+            self._reset()
+        elif size == self.offset:
+            if not self._replaced():
+                return []
+            self.close()
+            self._reset()
+            if not self._open():
+                return []
+            size = os.fstat(self._fd).st_size
+
+        chunks = [self._partial] if self._partial else []
+        view = memoryview(buf)
+        while self.offset < size:
+            try:
+                n = _pread_into(self._fd, view, self.offset)
+            except OSError:
+                break
+            if n <= 0:
+                break
+            chunks.append(bytes(view[:n]))
+            self.offset += n
+        view.release()
+
+        data = b"".join(chunks)
+        if self._discard:
+            nl = data.find(b"\n")
+            if nl < 0:
+                self._partial = b""
+                return []
+            data = data[nl + 1:]
+            self._discard = False
+        lines = data.split(b"\n")
+        self._partial = lines.pop()
+        return lines
+
+    def close(self):
+        if self._fd is not None:
+            try:
+                os.close(self._fd)
+            except OSError:
+                pass
+            self._fd = None
+
+
+class TailPool:
+    """A set of tails sharing one read buffer and a cap on open fds.
+
+    The least recently read tails have their descriptors closed when more
+    than ``max_open`` are open; their offset and partial line are kept and
+    the file is transparently reopened on the next read.
+    """
+
+    def __init__(self, max_open=64, chunk_size=CHUNK_SIZE):
+        self.max_open = max_open
+        self._buf = bytearray(chunk_size)
+        self._tails = OrderedDict()  # path -> TailFile, LRU order
+
+    def __contains__(self, path):
+        return path in self._tails
+
+    def track(self, path, from_end=True, offset=None):
+        tail = self._tails.get(path)
+        if tail is None:
+            tail = self._tails[path] = TailFile(path, from_end, offset)
+        return tail
+
+    def read_lines(self, path):
+        tail = self.track(path)
+        self._tails.move_to_end(path)
+        lines = tail.read_lines(self._buf)
+        self._limit_open()
+        return lines
+
+    def _limit_open(self):
+        if len(self._tails) <= self.max_open:
+            return
+        open_tails = [t for t in self._tails.values() if t.is_open]
+        for tail in open_tails[:max(0, len(open_tails) - self.max_open)]:
+            tail.close()
+
+    def discard(self, path):
+        tail = self._tails.pop(path, None)
+        if tail is not None:
+            tail.close()
+
+    def close(self):
+        for tail in self._tails.values():
+            tail.close()
+        self._tails.clear()
+
+
+def reverse_lines(path, max_bytes=None):
+    """Yield ``(offset, line)`` for complete lines of ``path``, last first.
+
+    The file is memory-mapped so only the pages actually visited are read;
+    at most ``max_bytes`` before the end are scanned.  An unterminated
+    last line (a record still being written) is not yielded.  The first
+    item yielded is ``(end, None)`` where ``end`` is the offset just past
+    the last complete line, i.e. where a tail should resume.
+    """
+    try:
+        f = open(path, "rb")
+    except OSError:
+        return
+    with f:
+        size = os.fstat(f.fileno()).st_size
+        if not size:
+            yield 0, None
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            stop = max(0, size - max_bytes) if max_bytes else 0
+            end = mm.rfind(b"\n", stop) + 1
+            if end == 0:
+                # No complete line in range
+                yield (0 if stop == 0 else size), None
+                return
+            yield end, None
+            while end > stop:
+                start = mm.rfind(b"\n", stop, end - 1) + 1
+                if start == 0 and stop > 0:
+                    break  # line straddles the scan limit
+                yield start, mm[start:end - 1]
+                end = start
@@ -0,0 +1,180 @@
+"""Run a watcher's polling on a background thread.
+
+Polling can block for a long time: a locked SQLite database, a multi-MB
+transcript append, a slow network filesystem.  ``ThreadedWatcher`` moves
+the wrapped watcher's ``poll()`` onto its own thread, which pushes events
+into a bounded deque; the render loop's ``poll()`` only pops what is
+already there, so frame pacing no longer depends on watcher I/O.
+
+``deque.append`` and ``deque.popleft`` are atomic, so the handoff itself
+takes no lock.  When the queue is full the ``backpressure`` policy decides
+what happens: ``"block"`` stalls the poller until the render loop catches
+up (no events lost), ``"drop_oldest"`` lets new events push out the
+oldest ones (the display never lags behind).
+
+The thread sleeps in ``select()`` on the wrapped watcher's ``fileno()``
+(its inotify descriptor, say) when it has one, so a transcript write is
+picked up at once rather than at the next interval.  New events are
+signalled on a self-pipe, which is what ``fileno()`` returns here: the
+render loop can sleep until there is something to draw.
+"""
+import os
+import select
+import threading
+import time
+from collections import deque
+
+from office.watchers import BaseWatcher
+
+BACKPRESSURE_POLICIES = ("block", "drop_oldest")
+
+
+class Wakeup:
+    """A self-pipe: ``set()`` from any thread makes ``fileno()`` readable
+    until the next ``clear()``."""
+
+    def __init__(self):
+        self._r, self._w = os.pipe()
+        os.set_blocking(self._r, False)
+        os.set_blocking(self._w, False)
+
+    def fileno(self):
+        return self._r
+
+    def set(self):
+        try:
+            os.write(self._w, b"\0")
+        except OSError:
+            pass  # already full of wake-ups, or closed
+
+    def clear(self):
+        try:
+            while os.read(self._r, 512):
+                pass
+        except OSError:
+            pass
+
+    def close(self):
+        os.close(self._r)
+        os.close(self._w)
+
+
+class ThreadedWatcher(BaseWatcher):
+    """Poll ``inner`` every ``interval`` seconds on a daemon thread."""
+
+    def __init__(self, inner, interval=0.05, maxlen=1024,
+                 backpressure="block", max_events=256, wakeup=None):
+        if backpressure not in BACKPRESSURE_POLICIES:
+            raise ValueError(f"unknown backpressure policy: {backpressure}")
+        self.inner = inner
+        self.SOURCE_NAME = getattr(inner, "SOURCE_NAME",
+                                   BaseWatcher.SOURCE_NAME)
+        self.max_sessions = getattr(inner, "max_sessions", 0)
+        self.interval = interval
+        self.maxlen = maxlen
+        self.backpressure = backpressure
+        self.max_events = max_events  # drained per poll() call
+        self.dropped = 0
+        self._queue = deque(maxlen=maxlen if backpressure == "drop_oldest"
+                            else None)
+        self._space = threading.Event()  # set when the consumer drains
+        # Shared with the other sources of a CompositeWatcher, if given
+        self._owns_wakeup = wakeup is None
+        self.wakeup = Wakeup() if wakeup is None else wakeup
+        self._stop = threading.Event()
+        self._status = "starting..."
+        self._status_interval = 1.0
+        self._thread = threading.Thread(
+            target=self._run, name=f"watcher-{self.SOURCE_NAME.lower()}",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def _run(self):
+        next_status = 0.0
+        while not self._stop.is_set():
+            try:
+                events = self.inner.poll()
+            except Exception:
+                events = []
+            now = time.monotonic()
+            for event in events:
+                self._put((now, event))
+            if events:
+                self.wakeup.set()
+            if now >= next_status:
+                try:
+                    self._status = self.inner.get_status()
+                except Exception:
+                    pass
+                next_status = now + self._status_interval
+            self._sleep()
+
+    def _sleep(self):
+        """Wait ``interval``, or less if the inner watcher's fd fires."""
+        try:
+            fd = self.inner.fileno()
+        except Exception:
+            fd = None
+        if fd is None:
+            self._stop.wait(self.interval)
+            return
+        try:
+            select.select([fd], [], [], self.interval)
+        except (OSError, ValueError):
+            self._stop.wait(self.interval)  # closed under us
+
+    def _put(self, item):
+        q = self._queue
+        if self.backpressure == "drop_oldest":
+            if len(q) >= self.maxlen:
+                self.dropped += 1
+            q.append(item)
+            return
+        while len(q) >= self.maxlen and not self._stop.is_set():
+            self.wakeup.set()  # the consumer may be asleep
+            self._space.clear()
+            if len(q) >= self.maxlen:
+                self._space.wait(0.1)
+        q.append(item)
+
+    def drain(self):
+        """Pop up to ``max_events`` queued ``(timestamp, event)`` pairs;
+        the timestamp is the monotonic time the inner poll returned."""
+        q = self._queue
+        items = []
+        popleft = q.popleft
+        for _ in range(min(len(q), self.max_events)):
+            items.append(popleft())
+        if items:
+            self._space.set()
+        if q:
+            self.wakeup.set()  # more than max_events were waiting
+        return items
+
+    def poll(self):
+        # Clear first: anything queued from here on sets it again
+        self.wakeup.clear()
+        return [event for _, event in self.drain()]
+
+    def fileno(self):
+        return self.wakeup.fileno()
+
+    def get_status(self):
+        return self._status
+
+    def join(self, timeout=None):
+        """Stop polling and wait up to ``timeout`` for the thread to
+        finish; returns True once it has."""
+        self._stop.set()
+        self._space.set()
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
+
+    def close(self):
+        if self.join(timeout=1.0):
+            # Otherwise a poll is stuck in I/O; the daemon thread dies
+            # with the process rather than racing it here.
+            self.inner.close()
+            if self._owns_wakeup:
+                self.wakeup.close()
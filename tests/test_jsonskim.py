@@ -0,0 +1,148 @@
+"""The byte-level skimmer must agree with json.loads.
+
+Every record is fed through ClaudeWatcher both ways -- decoded in full
+and skimmed -- and the events compared.  Malformed and truncated input
+may only ever raise ValueError.
+"""
+import json
+
+import pytest
+
+from office.watchers.claude import ClaudeWatcher, _skim_record
+from office.watchers.jsonskim import (
+    find_key, find_keys, iter_array, skip_value, string_at,
+)
+
+# Bulk in front of the blocks the parser looks at, so skimming has
+# something to skip
+_BULK = '{"type":"thinking","thinking":"%s"}' % ("lorem \\\"ipsum\\\" " * 300)
+
+
+def _assistant(*blocks):
+    return {"type": "assistant", "timestamp": "2025-01-01T00:00:00Z",
+            "message": {"role": "assistant", "content": list(blocks)}}
+
+
+def _text(text):
+    return {"type": "text", "text": text}
+
+
+def _tool_use(name, tool_id="toolu_1", **inp):
+    return {"type": "tool_use", "id": tool_id, "name": name, "input": inp}
+
+
+def _user(content):
+    return {"type": "user", "timestamp": "2025-01-01T00:00:01Z",
+            "message": {"role": "user", "content": content}}
+
+
+RECORDS = [
+    _assistant(_text("Looking at the parser now.")),
+    _assistant(_text('He said "hi" \\ and left')),
+    _assistant(_text("")),
+    _assistant(_text("   ")),
+    _assistant(_text(" " * 500)),
+    _assistant(_text("\n\t\r\f " * 100)),
+    _assistant(_text(" 　" * 60)),
+    _assistant(_text(" " * 200 + "x")),
+    _assistant(_text("\n" * 100 + "\\n")),
+    _assistant(_text('"' + " " * 100)),
+    _assistant(_text(" " * 80), _text(" " * 80)),
+    _assistant(json.loads(_BULK), _text(" " * 100)),
+    _assistant(json.loads(_BULK), _text("done")),
+    _assistant(_text("Reading it"), _tool_use("Read", file_path='/a "b"')),
+    _assistant(json.loads(_BULK), _tool_use("Grep", pattern="\\s+")),
+    _assistant(_tool_use("Task", "toolu_2", subagent_type="Explore",
+                         description="find \"tests\"", prompt="x" * 5000)),
+    _user([{"type": "tool_result", "tool_use_id": "toolu_1",
+            "content": "output \"quoted\"\n" * 500}]),
+    _user([{"type": "tool_result", "tool_use_id": "toolu_2",
+            "content": [{"type": "text", "text": "y" * 5000}]}]),
+    _user("Please fix the parser"),
+    {"type": "system", "subtype": "turn_duration", "durationMs": 1234},
+    {"type": "system", "subtype": "compact_boundary"},
+    {"type": "summary", "summary": "x" * 5000},
+    {"type": "assistant", "message": {"content": " " * 100}},
+    {"type": "assistant", "message": {"content": "plain text"}},
+]
+
+
+def _watcher():
+    watcher = ClaudeWatcher.__new__(ClaudeWatcher)
+    watcher._init_state()
+    return watcher
+
+
+def _events(record):
+    if record is None:
+        return []
+    return _watcher()._record_events(record, "main")
+
+
+def _decode(buf, pos):
+    return json.loads(buf[pos:skip_value(buf, pos)])
+
+
+def _line(record):
+    return json.dumps(record, separators=(",", ":")).encode()
+
+
+@pytest.mark.parametrize("record", RECORDS)
+def test_skim_matches_json_loads(record):
+    line = _line(record)
+    assert _events(_skim_record(line)) == _events(json.loads(line))
+
+
+@pytest.mark.parametrize("record", RECORDS)
+def test_decode_line_matches_json_loads(record):
+    line = _line(record)
+    expected = _events(json.loads(line))
+    assert _events(_watcher()._decode_line(line + b"\n")) == expected
+
+
+@pytest.mark.parametrize("record", RECORDS)
+def test_truncated_record(record):
+    """A cut line is skipped (rejected, or dismissed because the markers
+    the parser keys on were cut off), or, when everything the parser
+    needs lies before the cut, skims to the same events as the whole
+    line."""
+    line = _line(record)
+    expected = _events(json.loads(line))
+    for cut in range(len(line) - 1, 0, -max(1, len(line) // 400)):
+        try:
+            skimmed = _skim_record(line[:cut])
+        except ValueError:
+            continue
+        assert skimmed is None or _events(skimmed) == expected, cut
+
+
+def test_skip_value_escaped_quotes():
+    buf = b'["a \\"b\\" c", "d\\\\", {"e": "}\\""}, 12]'
+    assert skip_value(buf, 0) == len(buf)
+    assert [_decode(buf, pos) for pos in iter_array(buf, 0)] == [
+        'a "b" c', "d\\", {"e": '}"'}, 12]
+
+
+def test_find_keys_skips_nested_values():
+    buf = b'{"a": {"type": "x"}, "b": ["type"], "type": "y\\"z", "c": 1}'
+    keys = find_keys(buf, 0, (b"type", b"c", b"missing"))
+    assert string_at(buf, keys[b"type"]) == 'y"z'
+    assert _decode(buf, keys[b"c"]) == 1
+    assert b"missing" not in keys
+    assert find_key(buf, 0, b"missing") == -1
+    assert string_at(buf, find_key(buf, 0, b"a")) is None
+
+
+def test_truncation_raises_value_error():
+    buf = b'{"type": "assistant", "message": {"content": ["a\\"b", {"c": 1}]}}'
+    array = buf.index(b"[")
+    for cut in range(len(buf)):
+        part = buf[:cut]
+        for call in (lambda: skip_value(part, 0),
+                     lambda: find_keys(part, 0, (b"zzz",)),
+                     lambda: string_at(part, 9),
+                     lambda: list(iter_array(part, array))):
+            try:
+                call()
+            except ValueError:
+                pass
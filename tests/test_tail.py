@@ -0,0 +1,110 @@
+"""Tailing append-only JSONL files that are written while we read."""
+import os
+
+import pytest
+
+from office.watchers.tail import TailFile, TailPool, reverse_lines
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "session.jsonl")
+
+
+def _append(path, data):
+    with open(path, "ab") as f:
+        f.write(data)
+
+
+def _read(tail):
+    return tail.read_lines(bytearray(16))
+
+
+def test_starts_at_end_of_file(path):
+    _append(path, b"old 1\nold 2\n")
+    tail = TailFile(path)
+    assert _read(tail) == []
+    _append(path, b"new\n")
+    assert _read(tail) == [b"new"]
+
+
+def test_from_start(path):
+    _append(path, b"a\nb\n")
+    assert _read(TailFile(path, from_end=False)) == [b"a", b"b"]
+
+
+def test_partial_line_waits_for_its_newline(path):
+    tail = TailFile(path, from_end=False)
+    _append(path, b'{"type":"user"')
+    assert _read(tail) == []
+    assert tail.line_end == 0
+    _append(path, b',"n":1}\n{"type":')
+    assert _read(tail) == [b'{"type":"user","n":1}']
+    assert tail.line_end == len(b'{"type":"user","n":1}\n')
+    _append(path, b'"x"}\n')
+    assert _read(tail) == [b'{"type":"x"}']
+
+
+def test_attach_mid_record_skips_the_fragment(path):
+    _append(path, b'done\n{"half')
+    tail = TailFile(path)
+    assert _read(tail) == []
+    _append(path, b' record"}\nnext\n')
+    assert _read(tail) == [b"next"]
+
+
+def test_reads_more_than_the_buffer(path):
+    lines = [b"x" * n for n in range(1, 60)]
+    _append(path, b"\n".join(lines) + b"\n")
+    assert _read(TailFile(path, from_end=False)) == lines
+
+
+def test_truncate_restarts_from_the_top(path):
+    _append(path, b"one\ntwo\n")
+    tail = TailFile(path, from_end=False)
+    assert _read(tail) == [b"one", b"two"]
+    _append(path, b"part")
+    _read(tail)
+    os.truncate(path, 0)
+    _append(path, b"3\n")
+    assert _read(tail) == [b"3"]
+
+
+def test_rotate_follows_the_new_file(path):
+    _append(path, b"one\n")
+    tail = TailFile(path, from_end=False)
+    assert _read(tail) == [b"one"]
+    _append(path, b"old partial")
+    _read(tail)
+    # Replaced by a new file of the same size: only the inode tells
+    new = path + ".new"
+    with open(new, "wb") as f:
+        f.write(b"fresh line abc\n")
+    assert os.path.getsize(new) == os.path.getsize(path)
+    os.replace(new, path)
+    assert _read(tail) == [b"fresh line abc"]
+    _append(path, b"more\n")
+    assert _read(tail) == [b"more"]
+
+
+def test_pool_reopens_closed_tails(path):
+    pool = TailPool(max_open=1)
+    other = path + ".2"
+    for p in (path, other):
+        _append(p, b"")
+        pool.track(p, from_end=False)
+    _append(path, b"a\n")
+    _append(other, b"b\n")
+    assert pool.read_lines(path) == [b"a"]
+    assert pool.read_lines(other) == [b"b"]
+    _append(path, b"c\n")
+    assert pool.read_lines(path) == [b"c"]
+    pool.close()
+
+
+def test_reverse_lines(path):
+    _append(path, b"a\nbb\nccc\npartial")
+    items = list(reverse_lines(path))
+    assert items[0] == (len(b"a\nbb\nccc\n"), None)
+    assert [line for _, line in items[1:]] == [b"ccc", b"bb", b"a"]
+    assert [off for off, _ in items[1:]] == [5, 2, 0]